@@ -0,0 +1,181 @@
+"""
+리뷰/뉴스 응답 JSON 디코딩 벤치마크
+
+/appreviews 페이지(100개씩)와 GetNewsForApp 응답과 같은 형태의 합성 데이터를 만들어
+JSON 백엔드별 디코딩 시간과 메모리 할당량을 비교함 (리뷰 10,000개 기준)
+
+- json: 표준 라이브러리 (전체 필드 딕셔너리)
+- orjson: 전체 필드 딕셔너리
+- msgspec: 전체 필드 딕셔너리
+- msgspec (schema): 수집기가 사용하는 필드만 Struct로 디코딩
+
+사용법:
+    python benchmarks/bench_json_decode.py [--reviews 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from util.json_decode import HAS_MSGSPEC, HAS_ORJSON, decode  # noqa: E402
+from util.review_records import ReviewBuffer  # noqa: E402
+
+WORDS = ['game', 'fun', 'balance', 'patch', 'server', 'lag', 'great', 'bad', 'update', 'character',
+         '재밌음', '밸런스', '패치', '서버', '최고', '별로', 'ゲーム', 'ранг']
+
+
+def make_review(rng, review_id):
+    created = 1_600_000_000 + review_id * 37
+    return {
+        'recommendationid': str(150_000_000 + review_id),
+        'author': {
+            'steamid': str(76561198000000000 + rng.randrange(10 ** 9)),
+            'num_games_owned': rng.randrange(0, 3000),
+            'num_reviews': rng.randrange(1, 200),
+            'playtime_forever': rng.randrange(0, 200_000),
+            'playtime_last_two_weeks': rng.randrange(0, 3000),
+            'playtime_at_review': rng.randrange(0, 100_000),
+            'deck_playtime_at_review': rng.randrange(0, 100),
+            'last_played': created + rng.randrange(10 ** 7),
+        },
+        'language': rng.choice(['english', 'koreana', 'schinese', 'russian', 'japanese']),
+        'review': ' '.join(rng.choice(WORDS) for _ in range(int(rng.expovariate(1 / 60)) + 1)),
+        'timestamp_created': created,
+        'timestamp_updated': created + rng.choice([0, 0, 0, rng.randrange(10 ** 6)]),
+        'voted_up': rng.random() < 0.7,
+        'votes_up': rng.randrange(0, 50),
+        'votes_funny': rng.randrange(0, 10),
+        'weighted_vote_score': f"{rng.random():.9f}",
+        'comment_count': rng.randrange(0, 5),
+        'steam_purchase': rng.random() < 0.8,
+        'received_for_free': rng.random() < 0.05,
+        'written_during_early_access': False,
+        'hidden_in_steam_china': True,
+        'steam_china_location': '',
+        'primarily_steam_deck': rng.random() < 0.05,
+    }
+
+
+def make_review_pages(n_reviews, page_size=100, seed=0):
+    """/appreviews 응답과 같은 형태의 페이지 본문(bytes) 리스트"""
+    rng = random.Random(seed)
+    pages = []
+    for start in range(0, n_reviews, page_size):
+        reviews = [make_review(rng, i) for i in range(start, min(start + page_size, n_reviews))]
+        pages.append(json.dumps({
+            'success': 1,
+            'query_summary': {'num_reviews': len(reviews)},
+            'reviews': reviews,
+            'cursor': f"AoJ{start:010d}",
+        }, ensure_ascii=False).encode('utf-8'))
+    return pages
+
+
+def make_news_body(n_items=100, seed=0):
+    """GetNewsForApp 응답과 같은 형태의 본문(bytes)"""
+    rng = random.Random(seed)
+    items = [{
+        'gid': str(5_000_000_000_000_000_000 + i),
+        'title': f"Patch Notes {i}",
+        'url': f"https://steamstore-a.akamaihd.net/news/externalpost/steam_community_announcements/{i}",
+        'is_external_url': True,
+        'author': 'dev',
+        'contents': '[list][*]' + '[/*][*]'.join(' '.join(rng.choice(WORDS) for _ in range(12))
+                                                 for _ in range(rng.randrange(5, 200))) + '[/list]',
+        'feedlabel': 'Community Announcements',
+        'date': 1_600_000_000 + i * 86400,
+        'feedname': 'steam_community_announcements',
+        'feed_type': 1,
+        'appid': 730,
+        'tags': ['patchnotes'],
+    } for i in range(n_items)]
+    return json.dumps({'appnews': {'appid': 730, 'newsitems': items, 'count': n_items}}).encode('utf-8')
+
+
+def measure(func, repeat):
+    """(최소 실행 시간, 할당 최대치, 결과가 유지하는 메모리) - 메모리는 tracemalloc 기준"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, peak, retained
+
+
+def run(n_reviews=10_000, repeat=5):
+    pages = make_review_pages(n_reviews)
+    news = make_news_body()
+    payload_mb = sum(len(page) for page in pages) / (1024 * 1024)
+
+    backends = [('json', 'json', None)]
+    if HAS_ORJSON:
+        backends.append(('orjson', 'orjson', None))
+    if HAS_MSGSPEC:
+        backends.append(('msgspec', 'msgspec', None))
+        backends.append(('msgspec (schema)', 'msgspec', 'schema'))
+
+    print(f"리뷰 {n_reviews:,}개 ({len(pages)}페이지, {payload_mb:.1f}MB) / 뉴스 {len(news) / 1024:.0f}KB, "
+          f"반복 {repeat}회 중 최솟값")
+    print("-" * 96)
+    print(f"{'백엔드':<18}{'리뷰 디코딩':>12}{'할당 최대':>12}{'유지 메모리':>12}"
+          f"{'디코딩+버퍼':>14}{'뉴스 디코딩':>12}{'할당 최대':>12}")
+
+    results = {}
+    for label, backend, mode in backends:
+        review_schema = 'reviews' if mode else None
+        news_schema = 'news' if mode else None
+
+        def decode_reviews():
+            return [decode(page, review_schema, backend) for page in pages]
+
+        def decode_into_buffer():
+            buffer = ReviewBuffer(capacity=n_reviews)
+            for page in pages:
+                buffer.extend(decode(page, review_schema, backend)['reviews'])
+            return buffer
+
+        def decode_news():
+            return decode(news, news_schema, backend)
+
+        review_time, review_peak, review_retained = measure(decode_reviews, repeat)
+        buffer_time, _, _ = measure(decode_into_buffer, repeat)
+        news_time, news_peak, _ = measure(decode_news, repeat)
+        results[label] = (review_time, review_peak, review_retained, buffer_time, news_time, news_peak)
+
+        print(f"{label:<18}{review_time * 1000:>10.1f}ms{review_peak / 2 ** 20:>10.1f}MB"
+              f"{review_retained / 2 ** 20:>10.1f}MB{buffer_time * 1000:>12.1f}ms"
+              f"{news_time * 1000:>10.1f}ms{news_peak / 2 ** 20:>10.1f}MB")
+
+    baseline = results['json']
+    print("-" * 96)
+    for label, values in results.items():
+        if label == 'json':
+            continue
+        print(f"{label}: 리뷰 디코딩 {baseline[0] / values[0]:.1f}배 빠름, "
+              f"할당 {(values[1] / baseline[1] - 1) * 100:+.0f}%, "
+              f"디코딩+버퍼 {baseline[3] / values[3]:.1f}배 빠름")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리뷰/뉴스 JSON 디코딩 벤치마크")
+    parser.add_argument('--reviews', type=int, default=10_000, help="리뷰 수 (기본값: 10000)")
+    parser.add_argument('--repeat', type=int, default=5, help="반복 횟수 (기본값: 5)")
+    args = parser.parse_args()
+    run(args.reviews, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,116 +1,117 @@
 """
 데이터 수집부터 시각화까지 전체 파이프라인을 실행하는 통합 스크립트
+
+사용법:
+    python generate_all_visualizations.py [all]     # 수집 → 시각화 전체 실행
+    python generate_all_visualizations.py collect   # Steam API 데이터 수집만
+    python generate_all_visualizations.py analyze   # 저장된 데이터로 패치-리뷰 상관관계/게임 비교 분석만 (차트 없음)
+    python generate_all_visualizations.py render    # 저장된 데이터로 차트만 생성
+
+    python generate_all_visualizations.py --catalog games.csv --shard 3/16 collect
+        # 카탈로그를 16개 샤드로 나눈 것 중 3번 샤드의 게임만 처리
+
+각 단계의 모듈(pandas, matplotlib 등)은 해당 명령을 실행할 때만 불러옴
+단계별 실행 시간, HTTP 요청, 처리 행 수, 최대 메모리는 JSON 실행 보고서로 저장됨 (--report, --profiler)
 """
 
-import sys
+import argparse
 import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
 
-# 기능별 모듈 임포트
-from util.collector import SteamAPIExplorer
-from util.patch_collector import PatchNoteAnalyzer
-from util.viz_reviews import visualize_game_data, create_comparison_chart
-from util.viz_patches import visualize_patch_notes
-from util.analyzer import analyze_patch_review_correlation
-
-def main():
-    """데이터 수집 → 전처리 → 시각화 전체 파이프라인 실행"""
-    
-    games = [
-        {'app_id': 1049590, 'name': 'Eternal Return'},
-        {'app_id': 1973530, 'name': 'Limbus Company'},
-        {'app_id': 730, 'name': 'Counter-Strike 2'},
-        {'app_id': 440, 'name': 'Team Fortress 2'},
-        {'app_id': 2357570, 'name': 'Overwatch 2'},
-    ]
-    
-    print("=" * 80)
-    print("전체 데이터 분석 파이프라인 시작")
-    print("=" * 80)
-    
-    # 0. 데이터 수집
-    print("\n[0/4] Steam API 데이터 수집 중...")
+from util.catalog import DEFAULT_CATALOG, load_games, parse_shard
+from util.instrument import PROFILERS, get_recorder
+
+RENDER_PROFILES = ['draft', 'web', 'print', 'vector']
+
+
+def run_collect(games, output_dir='output', impact_window_days=7, sweep=True):
+    """리뷰/히스토그램/패치노트 수집 및 패치 영향 분석 (게임/엔드포인트 동시 수집)"""
+    from util.async_collector import collect_games_concurrently, collect_patch_data_concurrently
+    from util.patch_windows import DEFAULT_SWEEP_WINDOWS
+
+    print("\n[수집] Steam API 데이터 수집 중...")
     print("-" * 80)
-    
-    # 0-1. 리뷰 및 히스토그램 데이터 수집
+
+    # 리뷰 및 히스토그램 데이터 수집
     print("\n리뷰 데이터 수집 중...")
-    explorer = SteamAPIExplorer()
-    for game in games:
-        try:
-            print(f"\n{game['name']} 데이터 수집 중...")
-            game_data = explorer.collect_game_data(game['app_id'], game['name'])
-            explorer.save_to_csv(game_data)
-        except Exception as e:
-            print(f"  ❌ {game['name']} 리뷰 데이터 수집 실패: {e}")
-    
-    # 0-2. 패치노트 데이터 수집
+    collect_games_concurrently(games, output_dir=output_dir)
+
+    # 패치노트 데이터 수집 및 패치 영향 분석
     print("\n패치노트 데이터 수집 중...")
-    patch_analyzer = PatchNoteAnalyzer()
-    for game in games:
-        try:
-            app_id = game['app_id']
-            game_name = game['name']
-            
-            # 패치노트 수집
-            patch_notes = patch_analyzer.collect_patch_notes(app_id, game_name)
-            if not patch_notes:
-                continue
-            
-            # 리뷰 히스토그램 수집
-            review_histogram = patch_analyzer.get_review_histogram(app_id)
-            if not review_histogram:
-                print(f"  ❌ {game_name}: 리뷰 데이터를 가져올 수 없습니다.")
-                continue
-            
-            # 패치 영향 분석
-            analysis_df = patch_analyzer.analyze_patch_impact(patch_notes, review_histogram, window_days=7)
-            
-            # CSV 저장
-            patch_analyzer.save_to_csv(patch_notes, analysis_df, game_name, app_id)
-            
-        except Exception as e:
-            print(f"  ❌ {game['name']} 패치노트 수집 실패: {e}")
-    
+    collect_patch_data_concurrently(games, output_dir=output_dir, window_days=impact_window_days,
+                                    sweep_windows=DEFAULT_SWEEP_WINDOWS if sweep else None)
+
     print("\n✅ 데이터 수집 완료!")
-    
-    # 1. 기본 리뷰 데이터 시각화
-    print("\n[1/3] 리뷰 데이터 시각화 생성 중...")
-    print("-" * 80)
-    for game in games:
-        try:
-            visualize_game_data(game['app_id'], game['name'])
-        except Exception as e:
-            print(f"  ❌ {game['name']} 리뷰 시각화 실패: {e}")
-    
-    # 비교 차트
-    try:
-        create_comparison_chart(games)
-    except Exception as e:
-        print(f"  ❌ 비교 차트 생성 실패: {e}")
-    
-    # 2. 패치노트 분석 시각화
-    print("\n[2/3] 패치노트 분석 시각화 생성 중...")
-    print("-" * 80)
-    for game in games:
-        try:
-            visualize_patch_notes(game['app_id'], game['name'])
-        except Exception as e:
-            print(f"  ❌ {game['name']} 패치노트 시각화 실패: {e}")
-    
-    # 3. 상관관계 분석 시각화
-    print("\n[3/3] 상관관계 분석 시각화 생성 중...")
+
+
+def run_analyze(games, output_dir='output', window_days=30, catalog=True):
+    """
+    저장된 데이터로 패치노트 길이-리뷰 반응 상관관계 분석 (차트 없이 결과 테이블만 저장)
+
+    catalog=True이면 카탈로그 전체 게임 비교 분석(공통 날짜 인덱스, 게임 쌍별 상관/시차 상관)도 실행
+    """
+    from util.analyzer import analyze_patch_review_correlation
+
+    print("\n[분석] 패치노트-리뷰 상관관계 분석 중...")
     print("-" * 80)
+    results = {}
     for game in games:
         try:
-            analyze_patch_review_correlation(game['app_id'], game['name'])
+            results[game['app_id']] = analyze_patch_review_correlation(
+                game['app_id'], game['name'], output_dir=output_dir, window_days=window_days, visualize=False
+            )
         except Exception as e:
             print(f"  ❌ {game['name']} 상관관계 분석 실패: {e}")
-    
+
+    if catalog:
+        from util.catalog_analytics import analyze_catalog
+
+        print("\n[분석] 카탈로그 전체 게임 비교 분석 중...")
+        print("-" * 80)
+        analyze_catalog(games, output_dir=output_dir, window_days=window_days)
+    return results
+
+
+def run_render(games, output_dir='output', viz_dir='visualizations', workers=None, force=False,
+               profile='print', window_days=30, comparison=True):
+    """
+    저장된 데이터로 리뷰 추이 / 비교 / 패치노트 / 상관관계 차트 생성
+    (게임, 차트 종류)별 작업을 프로세스 풀에서 병렬 렌더링
+
+    comparison=False이면 게임 비교 차트는 만들지 않음 (샤드 실행)
+    """
+    from util.dataset import GameDataset
+    from util.render_scheduler import render_charts
+
+    # 게임별 데이터셋 - 히스토그램/패치노트를 한 번만 로드하여 공유 (순차 렌더링 시)
+    datasets = {dataset.app_id: dataset for dataset in GameDataset.from_games(games, output_dir)}
+
+    print("\n[시각화] 차트 생성 중 (리뷰 추이, 게임 비교, 패치노트, 상관관계)...")
+    print("-" * 80)
+    results = render_charts(games, max_workers=workers, output_dir=output_dir, viz_dir=viz_dir,
+                            datasets=datasets, force=force, profile=profile, window_days=window_days,
+                            comparison=comparison)
+
+    failed = [result for result in results if not result['ok']]
+    skipped = [result for result in results if result['skipped']]
+    print(f"\n  렌더링 결과: 성공 {len(results) - len(failed) - len(skipped)}개 / "
+          f"변경 없음(건너뜀) {len(skipped)}개 / 실패 {len(failed)}개 "
+          f"(작업 시간 합계 {sum(result['elapsed'] for result in results):.1f}초)")
+    for result in failed:
+        target = result['game_name'] or '전체 게임'
+        print(f"  ❌ {target} [{result['kind']}] 실패: {result['error']}")
+    return results
+
+
+def print_summary(viz_dir='visualizations', output_dir='output'):
     print("\n" + "=" * 80)
     print("모든 시각화 생성 완료!")
     print("=" * 80)
     print("\n생성된 파일:")
-    print("  📁 visualizations/ - 모든 차트 이미지")
-    print("  📁 output/ - 분석 데이터 CSV")
+    print(f"  📁 {viz_dir}/ - 모든 차트 이미지")
+    print(f"  📁 {output_dir}/ - 분석 데이터")
     print("\n생성된 차트 종류:")
     print("  1. 리뷰 추이 분석 (월별 긍정/부정 리뷰, 비율, 총 리뷰 수)")
     print("  2. 게임 간 비교 차트")
@@ -119,5 +120,151 @@ def main():
     print("=" * 80)
 
 
+def default_report_path(output_dir, shard=None):
+    """{output_dir}/reports/run_{실행 시각}[_shard{i}-{n}].json"""
+    name = f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if shard:
+        name += f"_shard{shard[0]}-{shard[1]}"
+    return os.path.join(output_dir, 'reports', name + '.json')
+
+
+def print_report_summary(report, report_path):
+    print("\n[계측] 단계별 실행 요약")
+    print("-" * 80)
+    for stage in report['stages']:
+        http = stage['http']
+        rss = f"{stage['peak_rss_mb']:.0f}MB" if stage['peak_rss_mb'] is not None else '-'
+        print(f"  {stage['name']:<10} {stage['wall_time']:7.1f}초 | HTTP {http['requests']}회 "
+              f"({http['bytes_downloaded'] / (1024 * 1024):.1f}MB, 재시도 {http['retries']}회, "
+              f"캐시 {http['cache_hits'] + http['not_modified']}회) | 최대 메모리 {rss}")
+        for name, stats in list(stage['functions'].items())[:3]:
+            print(f"      - {name}: {stats['wall_time']:.1f}초 ({stats['calls']}회, {stats['rows']:,}행)")
+        if stage['profile']:
+            print(f"      📄 프로파일: {stage['profile']}")
+    print(f"  📄 실행 보고서: {report_path}")
+
+
+def _shard_arg(value):
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Steam 리뷰/패치노트 수집 및 시각화 파이프라인")
+    parser.add_argument('--output-dir', default='output', help="수집/분석 데이터 디렉토리 (기본값: output)")
+    parser.add_argument('--catalog', default=DEFAULT_CATALOG,
+                        help=f"게임 카탈로그 파일 (app_id,name CSV 또는 JSON) (기본값: {DEFAULT_CATALOG})")
+    parser.add_argument('--shard', type=_shard_arg, default=None, metavar='I/N',
+                        help="카탈로그를 N개로 나눈 것 중 I번(1부터) 샤드만 처리 - app_id 해시로 배정하므로 "
+                             "여러 프로세스/머신이 조율 없이 같은 출력 디렉토리에 나누어 실행 가능")
+    parser.add_argument('--report', default=None,
+                        help="JSON 실행 보고서 경로 (기본값: {output-dir}/reports/run_{실행 시각}.json)")
+    parser.add_argument('--profiler', choices=PROFILERS, default=None,
+                        help="단계별 프로파일 덤프 저장 (보고서 옆에 cProfile .prof 또는 pyinstrument .html)")
+
+    subparsers = parser.add_subparsers(dest='command', metavar='{collect,analyze,render,all}')
+
+    def add_collect_options(sub):
+        sub.add_argument('--impact-window', type=int, default=7, help="수집 시 패치 영향 분석 기간(일) (기본값: 7)")
+        sub.add_argument('--no-sweep', action='store_true', help="여러 분석 기간 스윕 결과를 저장하지 않음")
+
+    def add_render_options(sub):
+        sub.add_argument('--viz-dir', default='visualizations', help="차트 저장 디렉토리 (기본값: visualizations)")
+        sub.add_argument('--workers', type=int, default=None, help="렌더링 프로세스 수 (기본값: CPU 코어 수, 1이면 순차)")
+        sub.add_argument('--force', action='store_true', help="입력이 바뀌지 않은 차트도 다시 렌더링")
+        sub.add_argument('--profile', choices=RENDER_PROFILES, default='print',
+                         help="렌더 프로필 (draft: 빠른 미리보기, web: WebP, print: 300 dpi PNG, vector: SVG) - "
+                              "print 외의 프로필은 파일 이름에 _{프로필} 접미사가 붙음")
+
+    def add_window_option(sub):
+        sub.add_argument('--window-days', type=int, default=30, help="상관관계 분석의 패치 전후 기간(일) (기본값: 30)")
+
+    add_collect_options(subparsers.add_parser('collect', help="Steam API 데이터 수집"))
+
+    add_window_option(subparsers.add_parser('analyze', help="패치노트-리뷰 상관관계 분석 (차트 없음)"))
+
+    render = subparsers.add_parser('render', help="저장된 데이터로 차트 생성")
+    add_render_options(render)
+    add_window_option(render)
+
+    run_all = subparsers.add_parser('all', help="수집 → 시각화 전체 실행 (기본 명령)")
+    add_collect_options(run_all)
+    add_render_options(run_all)
+    add_window_option(run_all)
+
+    return parser
+
+
+def main(argv=None):
+    """데이터 수집 → 전처리 → 시각화 파이프라인 실행 (명령을 생략하면 all)"""
+    parser = build_parser()
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not any(arg in ('collect', 'analyze', 'render', 'all') for arg in argv) and not {'-h', '--help'} & set(argv):
+        argv.append('all')
+    args = parser.parse_args(argv)
+    games = load_games(args.catalog, shard=args.shard)
+
+    recorder = get_recorder()
+    recorder.metadata.update({
+        'command': args.command,
+        'argv': argv,
+        'catalog': args.catalog,
+        'shard': '/'.join(str(part) for part in args.shard) if args.shard else None,
+        'games': len(games),
+    })
+    report_path = args.report or default_report_path(args.output_dir, args.shard)
+    profile_base = os.path.splitext(report_path)[0]
+
+    @contextmanager
+    def stage(name):
+        with recorder.stage(name, profiler=args.profiler, profile_path=f"{profile_base}_{name}"):
+            try:
+                yield
+            except BaseException:
+                # 실패한 단계 기록 (예외는 그대로 전달)
+                recorder.metadata.setdefault('failed_stage', name)
+                raise
+
+    print("=" * 80)
+    print("전체 데이터 분석 파이프라인 시작" if args.command == 'all' else f"파이프라인: {args.command}")
+    if args.shard:
+        print(f"샤드 {args.shard[0]}/{args.shard[1]}: {args.catalog}에서 {len(games)}개 게임")
+    else:
+        print(f"카탈로그 {args.catalog}: {len(games)}개 게임")
+    print("=" * 80)
+
+    # 중간 단계가 실패하거나 중단되어도 그때까지의 계측 결과와 실패 원인을 보고서로 남김
+    recorder.metadata['status'] = 'running'
+    try:
+        if args.command in ('collect', 'all'):
+            with stage('collect'):
+                run_collect(games, output_dir=args.output_dir, impact_window_days=args.impact_window,
+                            sweep=not args.no_sweep)
+
+        if args.command == 'analyze':
+            with stage('analyze'):
+                # 게임 비교 분석은 전체 게임이 필요하므로 샤드 실행에서는 생략
+                run_analyze(games, output_dir=args.output_dir, window_days=args.window_days,
+                            catalog=args.shard is None)
+
+        if args.command in ('render', 'all'):
+            with stage('render'):
+                run_render(games, output_dir=args.output_dir, viz_dir=args.viz_dir, workers=args.workers,
+                           force=args.force, profile=args.profile, window_days=args.window_days,
+                           # 비교 차트는 전체 게임이 필요하므로 샤드 실행에서는 생략 (샤드 없이 render로 생성)
+                           comparison=args.shard is None)
+            print_summary(args.viz_dir, args.output_dir)
+    except BaseException as e:
+        recorder.metadata['status'] = 'interrupted' if isinstance(e, KeyboardInterrupt) else 'failed'
+        recorder.metadata['error'] = f"{type(e).__name__}: {e}"
+        raise
+    else:
+        recorder.metadata['status'] = 'completed'
+    finally:
+        recorder.write_report(report_path)
+        print_report_summary(recorder.report(), report_path)
+
 if __name__ == "__main__":
     main()
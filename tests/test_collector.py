@@ -0,0 +1,64 @@
+from util.collector import SteamAPIExplorer
+from util.histogram import HistogramRepository
+
+
+class FakeReviewClient:
+    """filter=recent 리뷰 API 흉내 - 작성 시각 내림차순 페이지, cursor는 다음 페이지 시작 위치"""
+
+    def __init__(self, reviews, page_size=20):
+        self.reviews = reviews
+        self.page_size = page_size
+        self.requests = 0
+
+    def add(self, reviews):
+        self.reviews = reviews + self.reviews
+
+    def get_json(self, url, params=None, schema=None):
+        self.requests += 1
+        cursor = params.get('cursor', '*')
+        start = 0 if cursor == '*' else int(cursor)
+        page = self.reviews[start:start + self.page_size]
+        return {'success': 1, 'reviews': page, 'cursor': str(start + len(page))}
+
+
+def _reviews(first_id, count, newest):
+    return [{'recommendationid': str(first_id + i), 'voted_up': True,
+             'timestamp_created': newest - i * 60, 'author': {'playtime_at_review': 60}}
+            for i in range(count)]
+
+
+def _explorer(client):
+    return SteamAPIExplorer(client=client, histograms=HistogramRepository(client), storage_format='csv')
+
+
+def _crawl(explorer, output_dir, **kwargs):
+    return explorer.crawl_all_reviews(730, 'Test', output_dir=str(output_dir), **kwargs)
+
+
+def test_finished_crawl_fetches_only_new_reviews(tmp_path):
+    client = FakeReviewClient(_reviews(1000, 50, newest=1_700_000_000))
+    explorer = _explorer(client)
+    assert _crawl(explorer, tmp_path) == 50
+
+    # 새 리뷰가 없으면 저장된 가장 최근 리뷰보다 오래된 리뷰만 있는 첫 페이지(두 번째 페이지)에서 멈춤
+    client.requests = 0
+    _crawl(explorer, tmp_path)
+    assert client.requests == 2
+
+    # 새 리뷰 25개 - 새 리뷰가 끝나는 페이지까지만 수집하고, 저장소는 delta만 기록
+    client.add(_reviews(2000, 25, newest=1_700_100_000))
+    client.requests = 0
+    _crawl(explorer, tmp_path)
+    assert client.requests == 3
+    store = explorer.get_review_store(str(tmp_path))
+    assert len(store.read(730)) == 75
+    assert store.newest_created(730) == 1_700_100_000
+
+
+def test_resume_false_recrawls_full_history(tmp_path):
+    client = FakeReviewClient(_reviews(1000, 50, newest=1_700_000_000))
+    explorer = _explorer(client)
+    _crawl(explorer, tmp_path)
+    client.requests = 0
+    assert _crawl(explorer, tmp_path, resume=False) == 50
+    assert client.requests == 4
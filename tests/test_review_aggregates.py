@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from util.review_aggregates import ColumnMean
+
+
+def _chunks(values, up, n_chunks):
+    return [pd.DataFrame({'x': v, 'voted_up': u})
+            for v, u in zip(np.array_split(values, n_chunks), np.array_split(up, n_chunks))]
+
+
+def test_column_mean_large_offset_small_variance():
+    rng = np.random.default_rng(0)
+    values = 1e9 + rng.normal(0, 1, 20000)
+    up = rng.random(len(values)) < 0.6
+
+    # 청크별로 나누어 두 집계에 넣은 뒤 합침
+    left, right = ColumnMean('x'), ColumnMean('x')
+    for i, chunk in enumerate(_chunks(values, up, 9)):
+        (left if i % 2 else right).update(chunk)
+    result = left.merge(right).result()
+
+    assert result['all']['count'] == len(values)
+    assert np.isclose(result['all']['mean'], values.mean(), rtol=0, atol=1e-6)
+    assert np.isclose(result['all']['std'], values.std(), rtol=1e-9)
+    assert np.isclose(result['positive']['std'], values[up].std(), rtol=1e-9)
+    assert np.isclose(result['negative']['std'], values[~up].std(), rtol=1e-9)
+
+
+def test_column_mean_skips_missing_values():
+    chunk = pd.DataFrame({'x': pd.array([1, None, 3, 5], dtype='Int32'),
+                          'voted_up': [True, True, False, False]})
+    aggregate = ColumnMean('x')
+    aggregate.update(chunk)
+    aggregate.update(chunk.iloc[:0])
+    result = aggregate.result()
+    assert result['all'] == {'count': 3, 'mean': 3.0, 'std': np.std([1, 3, 5])}
+    assert result['positive'] == {'count': 1, 'mean': 1.0, 'std': 0.0}
+    assert ColumnMean('x').result()['all'] == {'count': 0, 'mean': None, 'std': None}
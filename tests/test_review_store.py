@@ -0,0 +1,77 @@
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from util.review_store import ReviewStore
+
+
+def _review(recommendationid, created, updated=None, voted_up=True):
+    timestamp = int(pd.Timestamp(created).timestamp())
+    return {
+        'recommendationid': recommendationid,
+        'voted_up': voted_up,
+        'timestamp_created': timestamp,
+        'timestamp_updated': int(pd.Timestamp(updated).timestamp()) if updated else timestamp,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ReviewStore(str(tmp_path / 'reviews'), format='csv')
+    store.append(730, [
+        _review(1, '2024-03-30 23:59:59'),
+        _review(2, '2024-03-31 00:00:00'),
+        _review(3, '2024-03-31 12:30:00'),
+        _review(4, '2024-03-31 23:59:59'),
+        _review(5, '2024-04-01 00:00:00'),
+    ])
+    return store
+
+
+def _ids(df):
+    return sorted(df['recommendationid'].tolist())
+
+
+@pytest.mark.parametrize('end', ['2024-03-31', date(2024, 3, 31)])
+def test_date_only_end_includes_whole_day(store, end):
+    assert _ids(store.read(730, start='2024-03-31', end=end)) == [2, 3, 4]
+
+
+@pytest.mark.parametrize('end', ['2024-03-31 12:30:00', datetime(2024, 3, 31, 12, 30)])
+def test_end_with_time_is_inclusive(store, end):
+    assert _ids(store.read(730, end=end)) == [1, 2, 3]
+
+
+def test_midnight_datetime_end_is_not_extended(store):
+    assert _ids(store.read(730, end=datetime(2024, 3, 31))) == [1, 2]
+    assert _ids(store.read(730, end='2024-03-31 00:00')) == [1, 2]
+
+
+def test_read_keeps_latest_version(store):
+    store.append(730, [_review(3, '2024-03-31 12:30:00', updated='2024-04-02', voted_up=False)])
+    df = store.read(730, columns=['recommendationid', 'voted_up'])
+    assert _ids(df) == [1, 2, 3, 4, 5]
+    assert not df.set_index('recommendationid').loc[3, 'voted_up']
+
+
+def test_append_empty_input(tmp_path):
+    store = ReviewStore(str(tmp_path / 'reviews'), format='csv')
+    assert store.append(730, []) == 0
+    assert store.append(730, pd.DataFrame()) == 0
+    assert store.months(730) == []
+    empty = ReviewStore.normalize([])
+    assert len(empty) == 0
+    assert str(empty['timestamp_updated'].dtype) == 'int64'
+
+
+def test_append_without_timestamp_updated(tmp_path):
+    store = ReviewStore(str(tmp_path / 'reviews'), format='csv')
+    created = int(pd.Timestamp('2024-03-31 12:00').timestamp())
+    records = [{'recommendationid': 1, 'voted_up': True, 'timestamp_created': created},
+               {'recommendationid': 2, 'voted_up': False, 'timestamp_created': created + 60}]
+    assert store.append(730, records) == 2
+    df = store.read(730)
+    assert df['timestamp_updated'].tolist() == [created, created + 60]
+    # 같은 리뷰를 다시 추가해도 새로 기록되지 않음
+    assert store.append(730, records) == 0
@@ -0,0 +1,49 @@
+import re
+
+import pytest
+
+from util.text_clean import TextCleaner, is_bbcode
+
+bs4 = pytest.importorskip('bs4')
+
+
+def clean_html_bs4(html_text):
+    """TextCleaner 도입 전 PatchNoteAnalyzer.clean_html (BeautifulSoup get_text + 공백 정리)"""
+    if not html_text:
+        return ""
+    text = bs4.BeautifulSoup(html_text, 'html.parser').get_text()
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+HTML_SAMPLES = [
+    '<p>Fixed bug in [P] mode and list[i] [code] [s]</p>',
+    '<h2>Patch 1.2 [Hotfix]</h2><ul><li>[B] site bomb timer fixed</li><li>arr[0] &amp; arr[1]</li></ul>',
+    '<div>Weapon [url] tag text [/url] stays</div><!-- comment -->',
+    '<p>Ranked [Season 3] &lt;beta&gt; &nbsp; [b]bold?[/b]</p><script>var a = "[b]";</script>',
+    'Plain text with [P] mode &amp; entities',
+    'No markup at all [x]',
+]
+
+
+@pytest.mark.parametrize('html_text', HTML_SAMPLES)
+@pytest.mark.parametrize('parser', ['fast', 'bs4'])
+def test_html_matches_bs4_output(html_text, parser):
+    assert TextCleaner(parser=parser).clean(html_text) == clean_html_bs4(html_text)
+
+
+def test_bbcode_body_is_stripped():
+    body = ('[h1]Patch 1.2[/h1][list][*]Fixed [b]crash[/b] in [P] mode[*]Balance[/list]'
+            '[img]{STEAM_CLAN_IMAGE}/1/a.png[/img][url=https://example.com]notes[/url]')
+    assert is_bbcode(body)
+    assert TextCleaner().clean(body) == 'Patch 1.2 Fixed crash in [P] mode Balance notes'
+
+
+def test_bbcode_body_keeps_unpaired_brackets():
+    # [i]/[s]는 닫는 태그가 없으므로 태그가 아닌 본문 텍스트
+    body = '[p]Fixed list[i] out of range in [s] rank[/p][p][b]Ranked[/b] [B] site[/p]'
+    assert TextCleaner().clean(body) == 'Fixed list[i] out of range in [s] rank Ranked [B] site'
+
+
+def test_unpaired_brackets_are_not_bbcode():
+    assert not is_bbcode('Fixed bug in [P] mode and list[i] [code] [s]')
+    assert not is_bbcode('<p>[b]bold[/b]</p>')
@@ -1,97 +1,53 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-from scipy import stats
 import os
 
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+from util.instrument import instrumented
+from util.patch_windows import compute_patch_windows
+from util.dataset import GameDataset
+from util.catalog import load_catalog
+from util.render_profile import get_profile, new_figure, save_figure
 
-def analyze_patch_review_correlation(game_id, game_name, output_dir='output', viz_dir='visualizations'):
+@instrumented
+def analyze_patch_review_correlation(game_id, game_name, output_dir='output', viz_dir='visualizations', window_days=30,
+                                     dataset=None, profile=None, visualize=True):
     """
     패치노트 길이와 스팀 리뷰 반응 간의 상관관계 분석
+    
+    Parameters:
+    - window_days: 패치 전후 분석 기간 (일)
+    - dataset: 미리 만든 GameDataset (None이면 output_dir에서 로드)
+    - profile: 차트 렌더 프로필 ('draft', 'web', 'print' 또는 RenderProfile, None이면 'print')
+    - visualize: False이면 차트 없이 분석 결과만 저장 (matplotlib을 불러오지 않음)
     """
     
-    os.makedirs(viz_dir, exist_ok=True)
+    if visualize:
+        os.makedirs(viz_dir, exist_ok=True)
     
     game_name_safe = game_name.replace(':', '').replace('/', '-')
-    patch_file = os.path.join(output_dir, f"{game_id}_{game_name_safe}_patch_notes.csv")
-    histogram_file = os.path.join(output_dir, f"{game_id}_{game_name_safe}_daily_histogram.csv")
+    dataset = dataset or GameDataset(game_id, game_name, output_dir)
     
-    if not os.path.exists(patch_file) or not os.path.exists(histogram_file):
+    if not dataset.has_patches or not dataset.has_histogram:
         print(f"❌ {game_name}: 필요한 파일을 찾을 수 없습니다.")
         return None
     
-    # 데이터 로드
-    patch_df = pd.read_csv(patch_file)
-    review_df = pd.read_csv(histogram_file)
-    
-    patch_df['date'] = pd.to_datetime(patch_df['date'])
-    review_df['date'] = pd.to_datetime(review_df['date'])
-    review_df = review_df.sort_values('date')
-    
-    # 리뷰 지표 계산
-    review_df['total_reviews'] = review_df['recommendations_up'] + review_df['recommendations_down']
-    review_df['positive_ratio'] = (review_df['recommendations_up'] / review_df['total_reviews'] * 100).fillna(0)
+    patch_df = dataset.patches
+    review_df = dataset.histogram
     
     print(f"\n{game_name} 상관관계 분석 중...")
     
-    # 패치 전후 리뷰 변화 분석
-    window_days = 30  # 패치 전후 30일
-    analysis_results = []
-    
-    for idx, patch in patch_df.iterrows():
-        patch_date = pd.to_datetime(patch['date'])
-        
-        # 패치 전 기간
-        before_start = patch_date - pd.Timedelta(days=window_days)
-        before_end = patch_date - pd.Timedelta(days=1)
-        
-        # 패치 후 기간
-        after_start = patch_date
-        after_end = patch_date + pd.Timedelta(days=window_days)
-        
-        # 해당 기간의 리뷰 데이터
-        before_reviews = review_df[
-            (review_df['date'] >= before_start) & 
-            (review_df['date'] <= before_end)
-        ]
-        
-        after_reviews = review_df[
-            (review_df['date'] >= after_start) & 
-            (review_df['date'] <= after_end)
-        ]
-        
-        if len(before_reviews) > 0 and len(after_reviews) > 0:
-            # 지표 계산
-            before_avg_reviews = before_reviews['total_reviews'].mean()
-            after_avg_reviews = after_reviews['total_reviews'].mean()
-            before_positive_ratio = before_reviews['positive_ratio'].mean()
-            after_positive_ratio = after_reviews['positive_ratio'].mean()
-            
-            # 변화율
-            review_change_pct = ((after_avg_reviews - before_avg_reviews) / before_avg_reviews * 100) if before_avg_reviews > 0 else 0
-            ratio_change = after_positive_ratio - before_positive_ratio
-            
-            analysis_results.append({
-                'patch_date': patch_date,
-                'patch_title': patch['title'],
-                'patch_length': patch['contents_length'],
-                'before_avg_reviews': before_avg_reviews,
-                'after_avg_reviews': after_avg_reviews,
-                'review_change_pct': review_change_pct,
-                'before_positive_ratio': before_positive_ratio,
-                'after_positive_ratio': after_positive_ratio,
-                'positive_ratio_change': ratio_change,
-                'engagement_score': after_avg_reviews / before_avg_reviews if before_avg_reviews > 0 else 1,
-            })
-    
-    if not analysis_results:
+    # 패치 전후 리뷰 변화 분석 (모든 패치를 한 번에 계산)
+    patches = pd.DataFrame({
+        'patch_date': patch_df['date'],
+        'patch_title': patch_df['title'],
+        'patch_length': patch_df['contents_length'],
+    })
+    analysis_df = compute_patch_windows(review_df, patches, window_days=window_days)
+    
+    if len(analysis_df) == 0:
         print(f"  ❌ 분석할 데이터가 충분하지 않습니다.")
         return None
     
-    analysis_df = pd.DataFrame(analysis_results)
-    
     # 상관계수 계산
     corr_length_reviews = analysis_df[['patch_length', 'review_change_pct']].corr().iloc[0, 1]
     corr_length_ratio = analysis_df[['patch_length', 'positive_ratio_change']].corr().iloc[0, 1]
@@ -103,32 +59,43 @@ def analyze_patch_review_correlation(game_id, game_name, output_dir='output', vi
     print(f"     - 패치 길이 vs 참여도 점수: {corr_length_engagement:.3f}")
     
     # 시각화
-    create_correlation_visualization(game_id, game_name, analysis_df, 
-                                    corr_length_reviews, corr_length_ratio, 
-                                    corr_length_engagement, viz_dir)
-    
-    # CSV 저장
-    output_file = os.path.join(output_dir, f"{game_id}_{game_name_safe}_patch_impact.csv")
-    analysis_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+    if visualize:
+        create_correlation_visualization(game_id, game_name, analysis_df, 
+                                        corr_length_reviews, corr_length_ratio, 
+                                        corr_length_engagement, viz_dir, profile=profile)
+    
+    # 분석 결과 저장 - 수집 단계의 analyze_patch_impact(_patch_impact, 7일 기간)와 컬럼/기간이 다르므로
+    # 별도 이름으로 저장 (차트가 최신이라 렌더링이 생략되어도 _patch_impact 테이블은 바뀌지 않음)
+    output_file = dataset.store.save(analysis_df, f"{game_id}_{game_name_safe}_patch_correlation")
     print(f"  ✓ 분석 결과 저장: {output_file}")
     
     return analysis_df
 
 
+def _build_correlation_axes(fig):
+    gs = fig.add_gridspec(2, 3, hspace=0.35, wspace=0.3)
+    return [fig.add_subplot(gs[row, col]) for row in range(2) for col in range(3)]
+
+
+@instrumented
 def create_correlation_visualization(game_id, game_name, analysis_df, 
-                                     corr_reviews, corr_ratio, corr_engagement, viz_dir):
-    """패치 길이와 유저 반응 상관관계 시각화"""
+                                     corr_reviews, corr_ratio, corr_engagement, viz_dir, profile=None):
+    """
+    패치 길이와 유저 반응 상관관계 시각화
     
+    Parameters:
+    - profile: 렌더 프로필 ('draft', 'web', 'print' 또는 RenderProfile, None이면 'print')
+    """
+    
+    profile = get_profile(profile)
     game_name_safe = game_name.replace(':', '').replace('/', '-')
     
-    fig = plt.figure(figsize=(16, 10))
-    gs = fig.add_gridspec(2, 3, hspace=0.35, wspace=0.3)
+    fig, (ax1, ax2, ax3, ax4, ax5, ax6) = new_figure('correlation', (16, 10), _build_correlation_axes, profile)
     
     fig.suptitle(f'{game_name} - 패치노트 길이와 유저 반응 상관관계 분석', 
                  fontsize=16, fontweight='bold', y=0.98)
     
     # 1. 패치 길이 vs 리뷰 증가율
-    ax1 = fig.add_subplot(gs[0, 0])
     scatter1 = ax1.scatter(analysis_df['patch_length'], analysis_df['review_change_pct'],
                           alpha=0.6, s=80, c=analysis_df['positive_ratio_change'],
                           cmap='RdYlGn', edgecolor='black', linewidth=0.5)
@@ -146,10 +113,9 @@ def create_correlation_visualization(game_id, game_name, analysis_df,
                   fontsize=11, fontweight='bold')
     ax1.grid(True, alpha=0.3)
     ax1.legend()
-    plt.colorbar(scatter1, ax=ax1, label='긍정 비율 변화 (%p)')
+    fig.colorbar(scatter1, ax=ax1, label='긍정 비율 변화 (%p)')
     
     # 2. 패치 길이 vs 긍정 비율 변화
-    ax2 = fig.add_subplot(gs[0, 1])
     scatter2 = ax2.scatter(analysis_df['patch_length'], analysis_df['positive_ratio_change'],
                           alpha=0.6, s=80, c=analysis_df['review_change_pct'],
                           cmap='coolwarm', edgecolor='black', linewidth=0.5)
@@ -166,10 +132,9 @@ def create_correlation_visualization(game_id, game_name, analysis_df,
                   fontsize=11, fontweight='bold')
     ax2.grid(True, alpha=0.3)
     ax2.legend()
-    plt.colorbar(scatter2, ax=ax2, label='리뷰 증가율 (%)')
+    fig.colorbar(scatter2, ax=ax2, label='리뷰 증가율 (%)')
     
     # 3. 패치 길이 vs 참여도 점수
-    ax3 = fig.add_subplot(gs[0, 2])
     scatter3 = ax3.scatter(analysis_df['patch_length'], analysis_df['engagement_score'],
                           alpha=0.6, s=80, c=analysis_df['positive_ratio_change'],
                           cmap='RdYlGn', edgecolor='black', linewidth=0.5)
@@ -186,14 +151,13 @@ def create_correlation_visualization(game_id, game_name, analysis_df,
                   fontsize=11, fontweight='bold')
     ax3.grid(True, alpha=0.3)
     ax3.legend()
-    plt.colorbar(scatter3, ax=ax3, label='긍정 비율 변화 (%p)')
+    fig.colorbar(scatter3, ax=ax3, label='긍정 비율 변화 (%p)')
     
     # 4. 길이 구간별 평균 반응
     analysis_df['length_category'] = pd.cut(analysis_df['patch_length'], 
                                             bins=[0, 500, 1000, 2000, 5000, float('inf')],
                                             labels=['~500자', '500-1K', '1K-2K', '2K-5K', '5K+'])
     
-    ax4 = fig.add_subplot(gs[1, 0])
     category_stats = analysis_df.groupby('length_category', observed=True).agg({
         'review_change_pct': 'mean',
         'patch_length': 'count'
@@ -216,7 +180,6 @@ def create_correlation_visualization(game_id, game_name, analysis_df,
                 ha='center', va='bottom' if val > 0 else 'top', fontsize=8, fontweight='bold')
     
     # 5. 길이 구간별 긍정 비율 변화
-    ax5 = fig.add_subplot(gs[1, 1])
     category_stats2 = analysis_df.groupby('length_category', observed=True).agg({
         'positive_ratio_change': 'mean',
         'patch_length': 'count'
@@ -239,7 +202,6 @@ def create_correlation_visualization(game_id, game_name, analysis_df,
                 ha='center', va='bottom' if val > 0 else 'top', fontsize=8, fontweight='bold')
     
     # 6. 주요 인사이트
-    ax6 = fig.add_subplot(gs[1, 2])
     ax6.axis('off')
     
     # 상관관계 해석
@@ -281,23 +243,19 @@ def create_correlation_visualization(game_id, game_name, analysis_df,
              fontsize=10, verticalalignment='top', family='monospace',
              bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8))
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    output_file = os.path.join(viz_dir, f"{game_id}_{game_name_safe}_correlation.png")
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    output_file = os.path.join(viz_dir, profile.file_name(f"{game_id}_{game_name_safe}_correlation"))
+    save_figure(fig, output_file, profile)
     print(f"  ✓ 상관관계 차트 저장: {output_file}")
-    plt.close()
+    
+    return output_file
 
 
 def main():
     """메인 실행 함수"""
     
-    games = [
-        {'app_id': 1049590, 'name': 'Eternal Return'},
-        {'app_id': 1973530, 'name': 'Limbus Company'},
-        {'app_id': 730, 'name': 'Counter-Strike 2'},
-        {'app_id': 440, 'name': 'Team Fortress 2'},
-    ]
+    games = load_catalog()
     
     print("=" * 80)
     print("패치노트 길이와 유저 반응 상관관계 분석")
@@ -0,0 +1,137 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from util.collector import SteamAPIExplorer
+from util.instrument import instrumented
+from util.patch_collector import PatchNoteAnalyzer
+
+
+class CollectionRunner:
+    """
+    여러 게임과 엔드포인트를 동시에 수집하는 asyncio 실행기
+
+    실제 HTTP 호출은 공용 SteamClient를 통해 스레드 풀에서 실행되며,
+    - 전역 동시 실행 수는 세마포어(max_concurrency)로,
+    - 전역 요청 속도는 SteamClient의 토큰 버킷으로 제한됨
+    """
+
+    def __init__(self, max_concurrency=8):
+        self.max_concurrency = max_concurrency
+        self.semaphore = None
+        self.executor = None
+
+    async def __aenter__(self):
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.executor.shutdown(wait=True)
+
+    async def run(self, func, *args, **kwargs):
+        """블로킹 함수를 동시 실행 예산 안에서 실행"""
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+
+async def _collect_game(runner, explorer, game, output_dir):
+    app_id = game['app_id']
+    game_name = game['name']
+
+    # 한 게임의 4개 엔드포인트를 동시에 요청
+    reviews_data, histogram, app_details, recent_reviews = await asyncio.gather(
+        runner.run(explorer.get_app_reviews, app_id),
+        runner.run(explorer.get_review_histogram, app_id),
+        runner.run(explorer.get_app_details, app_id),
+        runner.run(explorer.get_app_reviews, app_id, {'day_range': 30}),
+    )
+
+    game_data = explorer.build_game_data(app_id, game_name, reviews_data, histogram,
+                                         app_details, recent_reviews)
+    await runner.run(explorer.save_to_csv, game_data, output_dir)
+    print(f"✓ {game_name} 데이터 수집 완료")
+    return game_data
+
+
+async def _collect_patches(runner, analyzer, game, output_dir, window_days, sweep_windows):
+    app_id = game['app_id']
+    game_name = game['name']
+
+    patch_notes, review_histogram = await asyncio.gather(
+        runner.run(analyzer.collect_patch_notes, app_id, game_name, output_dir),
+        runner.run(analyzer.get_review_histogram, app_id),
+    )
+
+    if not patch_notes:
+        return None
+    if not review_histogram:
+        print(f"  ❌ {game_name}: 리뷰 데이터를 가져올 수 없습니다.")
+        return None
+
+    analysis_df = analyzer.analyze_patch_impact(patch_notes, review_histogram, window_days=window_days)
+    sweep_df = None
+    if sweep_windows:
+        sweep_df = analyzer.analyze_patch_impact_sweep(patch_notes, review_histogram, windows=sweep_windows)
+    await runner.run(analyzer.save_to_csv, patch_notes, analysis_df, game_name, app_id, output_dir, sweep_df)
+    return analysis_df
+
+
+async def collect_games_async(games, explorer=None, max_concurrency=8, output_dir='output'):
+    """
+    여러 게임의 리뷰/히스토그램/상세 정보를 동시에 수집하여 CSV로 저장
+
+    Returns:
+    - {app_id: game_data 또는 Exception}
+    """
+    explorer = explorer or SteamAPIExplorer()
+
+    async with CollectionRunner(max_concurrency) as runner:
+        results = await asyncio.gather(
+            *[_collect_game(runner, explorer, game, output_dir) for game in games],
+            return_exceptions=True
+        )
+
+    for game, result in zip(games, results):
+        if isinstance(result, Exception):
+            print(f"  ❌ {game['name']} 리뷰 데이터 수집 실패: {result}")
+
+    return {game['app_id']: result for game, result in zip(games, results)}
+
+
+async def collect_patch_data_async(games, analyzer=None, max_concurrency=8, output_dir='output', window_days=7,
+                                   sweep_windows=None):
+    """
+    여러 게임의 패치노트 수집과 패치 영향 분석을 동시에 실행
+
+    sweep_windows(예: [1, 3, 7, 14, 30, 60, 90])를 지정하면 기간별 분석 결과도 함께 저장
+
+    Returns:
+    - {app_id: 패치 영향 분석 DataFrame, None 또는 Exception}
+    """
+    analyzer = analyzer or PatchNoteAnalyzer()
+
+    async with CollectionRunner(max_concurrency) as runner:
+        results = await asyncio.gather(
+            *[_collect_patches(runner, analyzer, game, output_dir, window_days, sweep_windows) for game in games],
+            return_exceptions=True
+        )
+
+    for game, result in zip(games, results):
+        if isinstance(result, Exception):
+            print(f"  ❌ {game['name']} 패치노트 수집 실패: {result}")
+
+    return {game['app_id']: result for game, result in zip(games, results)}
+
+
+@instrumented
+def collect_games_concurrently(games, **kwargs):
+    """collect_games_async의 동기 실행 래퍼"""
+    return asyncio.run(collect_games_async(games, **kwargs))
+
+
+@instrumented
+def collect_patch_data_concurrently(games, **kwargs):
+    """collect_patch_data_async의 동기 실행 래퍼"""
+    return asyncio.run(collect_patch_data_async(games, **kwargs))
@@ -0,0 +1,89 @@
+import csv
+import hashlib
+import json
+import os
+
+# 저장소 루트의 기본 게임 카탈로그
+DEFAULT_CATALOG = 'games.csv'
+
+
+def _read_rows(path):
+    if os.path.splitext(path)[1].lower() == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def load_catalog(path=DEFAULT_CATALOG):
+    """
+    게임 카탈로그 파일 로드
+
+    CSV는 app_id, name 헤더를 가진 파일, JSON은 [{'app_id': ..., 'name': ...}] 형식의 리스트.
+    app_id가 비어 있는 행은 건너뛰고, 같은 app_id가 여러 번 나오면 처음 행만 사용
+
+    Parameters:
+    - path: 카탈로그 파일 경로 (.csv 또는 .json)
+
+    Returns:
+    - [{'app_id': int, 'name': str}] 형식의 게임 목록 (파일 순서 유지)
+    """
+    games = []
+    seen = set()
+    for row in _read_rows(path):
+        app_id = str(row.get('app_id') or '').strip()
+        if not app_id:
+            continue
+        app_id = int(app_id)
+        if app_id in seen:
+            continue
+        seen.add(app_id)
+        name = str(row.get('name') or '').strip() or str(app_id)
+        games.append({'app_id': app_id, 'name': name})
+    return games
+
+
+def parse_shard(spec):
+    """
+    '3/16' 형식의 샤드 지정을 (샤드 번호, 전체 샤드 수)로 변환 (샤드 번호는 1부터 시작)
+    """
+    try:
+        index, count = (int(part) for part in str(spec).split('/'))
+    except ValueError:
+        raise ValueError(f"샤드는 'i/n' 형식이어야 합니다: {spec}")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"샤드 번호는 1 이상 {max(count, 1)} 이하여야 합니다: {spec}")
+    return index, count
+
+
+def shard_of(app_id, count):
+    """
+    app_id가 속한 샤드 번호 (1 ~ count)
+
+    app_id의 blake2b 해시로 정하므로 실행 환경(프로세스, 머신, PYTHONHASHSEED)이 달라도 결과가 같고,
+    카탈로그 순서가 바뀌거나 게임이 추가되어도 기존 게임의 샤드는 바뀌지 않음
+    """
+    digest = hashlib.blake2b(str(int(app_id)).encode('ascii'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count + 1
+
+
+def select_shard(games, index, count):
+    """게임 목록 중 index번 샤드(전체 count개)에 속한 게임만 반환"""
+    return [game for game in games if shard_of(game['app_id'], count) == index]
+
+
+def load_games(path=DEFAULT_CATALOG, shard=None):
+    """
+    카탈로그를 로드하고 샤드에 속한 게임만 반환
+
+    Parameters:
+    - path: 카탈로그 파일 경로
+    - shard: '3/16' 또는 (3, 16) 형식의 샤드 (None이면 전체 게임)
+    """
+    games = load_catalog(path)
+    if shard is None:
+        return games
+    if not isinstance(shard, str):
+        shard = '/'.join(str(part) for part in shard)
+    index, count = parse_shard(shard)
+    return select_shard(games, index, count)
@@ -0,0 +1,366 @@
+import numpy as np
+import pandas as pd
+
+from util.dataset import GameDataset
+from util.instrument import instrumented
+from util.patch_windows import compute_patch_windows
+
+# 공통 날짜 인덱스 구간 단위 -> numpy datetime64 단위
+# (Valve 히스토그램은 오래된 게임이면 월 단위 rollup이므로 기본값은 월)
+FREQUENCIES = {'D': 'D', 'M': 'M'}
+
+METRICS = ['positive_ratio', 'total_reviews', 'review_share', 'relative_positive_ratio']
+
+
+def _center(x):
+    """행별 평균을 빼서 (결측 제외) 큰 값끼리 곱할 때의 자릿수 손실을 줄임"""
+    with np.errstate(invalid='ignore'):
+        count = np.sum(~np.isnan(x), axis=1, keepdims=True)
+        mean = np.where(count > 0, np.nansum(x, axis=1, keepdims=True) / np.maximum(count, 1), 0.0)
+    return x - mean
+
+
+def pairwise_correlation(x, y=None, min_periods=3):
+    """
+    x의 각 행과 y의 각 행 사이의 Pearson 상관계수 행렬 (결측값은 쌍별로 제외)
+
+    두 행이 함께 관측된 구간만 사용하며, 모든 쌍을 행렬 곱 5번으로 한 번에 계산함
+
+    Parameters:
+    - x: (n, T) 배열 (결측은 NaN)
+    - y: (m, T) 배열 (None이면 x)
+    - min_periods: 함께 관측된 구간이 이보다 적은 쌍은 NaN
+
+    Returns:
+    - (상관계수 (n, m), 함께 관측된 구간 수 (n, m))
+    """
+    x = _center(np.asarray(x, dtype=np.float64))
+    y = x if y is None else _center(np.asarray(y, dtype=np.float64))
+
+    mask_x = ~np.isnan(x)
+    mask_y = ~np.isnan(y)
+    x0 = np.where(mask_x, x, 0.0)
+    y0 = np.where(mask_y, y, 0.0)
+    mx = mask_x.astype(np.float64)
+    my = mask_y.astype(np.float64)
+
+    n = mx @ my.T
+    sum_x = x0 @ my.T
+    sum_y = mx @ y0.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = x0 @ y0.T - sum_x * sum_y / n
+        var_x = (x0 * x0) @ my.T - sum_x * sum_x / n
+        var_y = mx @ (y0 * y0).T - sum_y * sum_y / n
+        r = cov / np.sqrt(var_x * var_y)
+    r[(n < min_periods) | (var_x <= 1e-12) | (var_y <= 1e-12)] = np.nan
+    return np.clip(r, -1.0, 1.0), n.astype(np.int64)
+
+
+def grouped_pearson(groups, x, y, min_count=3):
+    """
+    그룹별 x-y Pearson 상관계수를 그룹 반복 없이 한 번에 계산 (bincount 기반 2-pass)
+
+    Returns:
+    - 그룹별 상관계수 Series (관측 수가 min_count보다 적거나 분산이 0이면 NaN)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    codes, uniques = pd.factorize(pd.Series(groups), sort=True)
+    valid = ~(np.isnan(x) | np.isnan(y)) & (codes >= 0)
+    codes, x, y = codes[valid], x[valid], y[valid]
+    size = len(uniques)
+
+    count = np.bincount(codes, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dx = x - (np.bincount(codes, weights=x, minlength=size) / count)[codes]
+        dy = y - (np.bincount(codes, weights=y, minlength=size) / count)[codes]
+        sxy = np.bincount(codes, weights=dx * dy, minlength=size)
+        sxx = np.bincount(codes, weights=dx * dx, minlength=size)
+        syy = np.bincount(codes, weights=dy * dy, minlength=size)
+        r = sxy / np.sqrt(sxx * syy)
+    r[(count < min_count) | (sxx <= 1e-12) | (syy <= 1e-12)] = np.nan
+    return pd.Series(np.clip(r, -1.0, 1.0), index=uniques)
+
+
+class CatalogMatrix:
+    """
+    카탈로그 전체 게임의 히스토그램을 하나의 공통 날짜 인덱스에 맞춘 (게임 x 구간) 2차원 배열
+
+    모든 게임의 히스토그램 행을 (게임 번호 * 구간 수 + 구간 번호)로 바꾸어 bincount 한 번으로
+    채우므로 게임 수가 수백 개여도 게임별 pandas 반복이 없음
+
+    - up, down, total: (게임 수, 구간 수) 긍정/부정/전체 리뷰 수
+    - observed: 해당 구간에 히스토그램 행이 있었는지 (없으면 리뷰 수 0과 구분하여 결측으로 처리)
+    - dates: 구간 시작 날짜 (datetime64)
+    """
+
+    def __init__(self, app_ids, names, dates, up, down, observed, freq='M'):
+        self.app_ids = list(app_ids)
+        self.names = list(names)
+        self.dates = dates
+        self.up = up
+        self.down = down
+        self.total = up + down
+        self.observed = observed
+        self.freq = freq
+
+    @classmethod
+    def from_histograms(cls, histograms, freq='M'):
+        """
+        Parameters:
+        - histograms: [(app_id, 게임 이름, 히스토그램 DataFrame)] - DataFrame은 date,
+          recommendations_up, recommendations_down 컬럼 (같은 구간의 여러 행은 합산)
+        - freq: 'D'(일) 또는 'M'(월)
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"지원하지 않는 구간 단위입니다: {freq} (가능한 값: {', '.join(FREQUENCIES)})")
+        unit = FREQUENCIES[freq]
+        histograms = [(app_id, name, df) for app_id, name, df in histograms if len(df) > 0]
+        app_ids = [app_id for app_id, _, _ in histograms]
+        names = [name for _, name, _ in histograms]
+        if not histograms:
+            empty = np.zeros((0, 0))
+            return cls([], [], np.array([], dtype=f"datetime64[{unit}]"), empty, empty, empty.astype(bool), freq)
+
+        periods = np.concatenate([
+            pd.to_datetime(df['date']).to_numpy(dtype='datetime64[ns]').astype(f"datetime64[{unit}]").astype(np.int64)
+            for _, _, df in histograms
+        ])
+        rows = np.repeat(np.arange(len(histograms)), [len(df) for _, _, df in histograms])
+        up = np.concatenate([df['recommendations_up'].to_numpy(dtype=np.float64) for _, _, df in histograms])
+        down = np.concatenate([df['recommendations_down'].to_numpy(dtype=np.float64) for _, _, df in histograms])
+
+        first = periods.min()
+        width = int(periods.max() - first + 1)
+        shape = (len(histograms), width)
+        cell = rows * width + (periods - first)
+        size = shape[0] * shape[1]
+        return cls(
+            app_ids, names,
+            (np.arange(width) + first).astype(f"datetime64[{unit}]"),
+            np.bincount(cell, weights=up, minlength=size).reshape(shape),
+            np.bincount(cell, weights=down, minlength=size).reshape(shape),
+            np.bincount(cell, minlength=size).reshape(shape) > 0,
+            freq,
+        )
+
+    @classmethod
+    @instrumented
+    def from_datasets(cls, datasets, freq='M'):
+        """GameDataset 리스트로 생성 (히스토그램이 없는 게임은 제외)"""
+        return cls.from_histograms(
+            [(dataset.app_id, dataset.game_name, dataset.histogram) for dataset in datasets if dataset.has_histogram],
+            freq=freq,
+        )
+
+    @classmethod
+    def from_games(cls, games, output_dir='output', freq='M'):
+        """[{'app_id': ..., 'name': ...}] 형식의 게임 목록으로 생성"""
+        return cls.from_datasets(GameDataset.from_games(games, output_dir), freq=freq)
+
+    def __len__(self):
+        return len(self.app_ids)
+
+    @property
+    def shape(self):
+        return self.total.shape
+
+    @property
+    def positive_ratio(self):
+        """(게임 x 구간) 긍정 비율 (%) - 리뷰가 없는 구간은 NaN"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.total > 0, self.up / self.total * 100, np.nan)
+
+    @property
+    def review_share(self):
+        """(게임 x 구간) 구간별 카탈로그 전체 리뷰 중 각 게임의 비중 (%)"""
+        catalog_total = self.total.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = np.where(catalog_total > 0, self.total / catalog_total * 100, np.nan)
+        return np.where(self.observed, share, np.nan)
+
+    @property
+    def catalog_positive_ratio(self):
+        """구간별 카탈로그 전체 긍정 비율 (%) - 리뷰 수 가중"""
+        catalog_total = self.total.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(catalog_total > 0, self.up.sum(axis=0) / catalog_total * 100, np.nan)
+
+    @property
+    def relative_positive_ratio(self):
+        """(게임 x 구간) 긍정 비율 - 같은 구간의 카탈로그 전체 긍정 비율 (%p)"""
+        return self.positive_ratio - self.catalog_positive_ratio
+
+    def values(self, metric='positive_ratio'):
+        """지표의 (게임 x 구간) 배열 (결측은 NaN)"""
+        if metric not in METRICS:
+            raise ValueError(f"지원하지 않는 지표입니다: {metric} (가능한 값: {', '.join(METRICS)})")
+        if metric == 'total_reviews':
+            return np.where(self.observed, self.total, np.nan)
+        return getattr(self, metric)
+
+    def correlation(self, metric='positive_ratio', min_periods=3):
+        """
+        게임 쌍별 상관계수 (게임 수 x 게임 수)
+
+        Returns:
+        - (상관계수 행렬, 함께 관측된 구간 수 행렬)
+        """
+        return pairwise_correlation(self.values(metric), min_periods=min_periods)
+
+    def lagged_correlation(self, metric='positive_ratio', max_lag=6, min_periods=3):
+        """
+        시차 상관계수 corr(게임 i의 t 구간, 게임 j의 t + lag 구간)
+
+        lag > 0이면 게임 j가 게임 i보다 lag 구간 늦게 움직이는 관계. 음수 시차는
+        R[-k] = R[k].T 관계로 양수 시차 결과를 전치하여 만듦
+
+        Returns:
+        - (lags 배열 (-max_lag..max_lag), 상관계수 (시차 수 x 게임 수 x 게임 수))
+        """
+        x = self.values(metric)
+        max_lag = max(0, min(max_lag, x.shape[1] - 1))
+        positive = [pairwise_correlation(x[:, :x.shape[1] - lag], x[:, lag:], min_periods=min_periods)[0]
+                    for lag in range(max_lag + 1)]
+        stacked = [matrix.T for matrix in positive[:0:-1]] + positive
+        return np.arange(-max_lag, max_lag + 1), np.stack(stacked)
+
+    def best_lags(self, metric='positive_ratio', max_lag=6, min_periods=3):
+        """
+        게임 쌍별로 |상관계수|가 가장 큰 시차
+
+        Returns:
+        - (시차 행렬, 해당 시차의 상관계수 행렬) - 모든 시차가 NaN인 쌍은 시차 0, 상관계수 NaN
+        """
+        lags, stacked = self.lagged_correlation(metric, max_lag=max_lag, min_periods=min_periods)
+        magnitude = np.where(np.isnan(stacked), -1.0, np.abs(stacked))
+        best = magnitude.argmax(axis=0)
+        correlation = np.take_along_axis(stacked, best[np.newaxis], axis=0)[0]
+        return np.where(np.isnan(correlation), 0, lags[best]), correlation
+
+    def volume_ratio(self):
+        """
+        게임 쌍별 리뷰 수 비율 (게임 i 평균 / 게임 j 평균, 두 게임이 모두 관측된 구간 기준)
+
+        Returns:
+        - (게임 수 x 게임 수) 배열 (공통 구간이 없거나 게임 j의 평균이 0이면 NaN)
+        """
+        observed = self.observed.astype(np.float64)
+        total = np.where(self.observed, self.total, 0.0)
+        sum_i = total @ observed.T
+        sum_j = observed @ total.T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(sum_j > 0, sum_i / sum_j, np.nan)
+
+    def to_frame(self, metric='positive_ratio'):
+        """지표를 date 컬럼 + 게임별(app_id) 컬럼의 wide DataFrame으로 반환"""
+        df = pd.DataFrame(self.values(metric).T, columns=[str(app_id) for app_id in self.app_ids])
+        df.insert(0, 'date', pd.to_datetime(self.dates))
+        return df
+
+    def pairs_frame(self, metric='positive_ratio', max_lag=6, min_periods=3):
+        """
+        게임 쌍(i < j)별 상관계수, 공통 구간 수, 최대 시차 상관, 리뷰 수 비율을 long 포맷 DataFrame으로 반환
+        """
+        correlation, periods = self.correlation(metric, min_periods=min_periods)
+        lags, lag_correlation = self.best_lags(metric, max_lag=max_lag, min_periods=min_periods)
+        ratio = self.volume_ratio()
+        i, j = np.triu_indices(len(self), k=1)
+        app_ids = np.asarray(self.app_ids)
+        names = np.asarray(self.names, dtype=object)
+        return pd.DataFrame({
+            'app_id_a': app_ids[i],
+            'game_a': names[i],
+            'app_id_b': app_ids[j],
+            'game_b': names[j],
+            'periods': periods[i, j],
+            'correlation': correlation[i, j],
+            'best_lag': lags[i, j],
+            'lag_correlation': lag_correlation[i, j],
+            'volume_ratio': ratio[i, j],
+        })
+
+
+@instrumented
+def catalog_patch_correlations(datasets, window_days=30):
+    """
+    게임별 패치 길이-리뷰 반응 상관계수를 한 번에 계산
+
+    게임별 패치 전후 지표(compute_patch_windows)를 이어 붙인 뒤 grouped_pearson으로
+    모든 게임의 상관계수를 함께 계산함 (analyze_patch_review_correlation의 상관계수와 같은 값)
+
+    Returns:
+    - app_id, game_name, patches, corr_length_reviews, corr_length_ratio, corr_length_engagement DataFrame
+    """
+    frames = []
+    for dataset in datasets:
+        if not dataset.has_patches or not dataset.has_histogram:
+            continue
+        patch_df = dataset.patches
+        analysis = compute_patch_windows(dataset.histogram, pd.DataFrame({
+            'patch_date': patch_df['date'],
+            'patch_title': patch_df['title'],
+            'patch_length': patch_df['contents_length'],
+        }), window_days=window_days)
+        if len(analysis) > 0:
+            frames.append(analysis[['patch_length', 'review_change_pct', 'positive_ratio_change',
+                                    'engagement_score']].assign(app_id=dataset.app_id))
+
+    columns = ['app_id', 'game_name', 'patches', 'corr_length_reviews', 'corr_length_ratio', 'corr_length_engagement']
+    if not frames:
+        return pd.DataFrame(columns=columns)
+
+    windows = pd.concat(frames, ignore_index=True)
+    names = {dataset.app_id: dataset.game_name for dataset in datasets}
+    # pandas corr()와 같이 관측이 2개 이상이면 계산
+    result = pd.DataFrame({
+        'corr_length_reviews': grouped_pearson(windows['app_id'], windows['patch_length'],
+                                               windows['review_change_pct'], min_count=2),
+        'corr_length_ratio': grouped_pearson(windows['app_id'], windows['patch_length'],
+                                             windows['positive_ratio_change'], min_count=2),
+        'corr_length_engagement': grouped_pearson(windows['app_id'], windows['patch_length'],
+                                                  windows['engagement_score'], min_count=2),
+    })
+    result['patches'] = windows.groupby('app_id').size()
+    result['app_id'] = result.index
+    result['game_name'] = result['app_id'].map(names)
+    return result[columns].reset_index(drop=True)
+
+
+@instrumented
+def analyze_catalog(games, output_dir='output', freq='M', metric='positive_ratio', max_lag=6,
+                    min_periods=3, window_days=30):
+    """
+    카탈로그 전체 게임 비교 분석
+
+    - catalog_{freq}_{metric}: 공통 날짜 인덱스의 게임별 지표 (wide)
+    - catalog_{freq}_pairs: 게임 쌍별 상관계수, 최대 시차 상관, 리뷰 수 비율
+    - catalog_patch_correlation: 게임별 패치 길이-리뷰 반응 상관계수
+
+    Returns:
+    - CatalogMatrix
+    """
+    datasets = GameDataset.from_games(games, output_dir)
+    matrix = CatalogMatrix.from_datasets(datasets, freq=freq)
+    if len(matrix) < 2:
+        print("❌ 카탈로그 분석에는 히스토그램이 있는 게임이 2개 이상 필요합니다.")
+        return matrix
+
+    print(f"\n카탈로그 분석 중... ({len(matrix)}개 게임 x {matrix.shape[1]}개 구간)")
+    store = datasets[0].store
+    store.save(matrix.to_frame(metric), f"catalog_{freq}_{metric}")
+
+    pairs = matrix.pairs_frame(metric, max_lag=max_lag, min_periods=min_periods)
+    pairs_file = store.save(pairs, f"catalog_{freq}_pairs")
+    print(f"  ✓ 게임 쌍별 분석 저장: {pairs_file} ({len(pairs):,}쌍)")
+
+    top = pairs.dropna(subset=['correlation']).sort_values('correlation', ascending=False).head(5)
+    for row in top.itertuples():
+        print(f"     - {row.game_a} ↔ {row.game_b}: r={row.correlation:.3f} "
+              f"(최대 시차 상관 {row.lag_correlation:.3f} @ {row.best_lag:+d}, 공통 {row.periods}구간)")
+
+    patch_corr = catalog_patch_correlations(datasets, window_days=window_days)
+    if len(patch_corr) > 0:
+        patch_file = store.save(patch_corr, 'catalog_patch_correlation')
+        print(f"  ✓ 게임별 패치-리뷰 상관계수 저장: {patch_file}")
+    return matrix
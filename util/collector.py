@@ -1,19 +1,34 @@
-import requests
 import json
-from datetime import datetime, timedelta
-import time
-import csv
-import pandas as pd
 import os
 
+from util.catalog import load_catalog
+from util.histogram import get_default_repository
+from util.instrument import instrumented, returned_count
+from util.steam_client import get_default_client
+from util.review_records import REVIEW_FLUSH_ROWS, ReviewBuffer
+from util.review_store import ReviewStore
+from util.storage import TableStore
+
 class SteamAPIExplorer:
     """
     Steam API 탐색 도구 - 리뷰 데이터 및 지표 수집
     """
     
-    def __init__(self):
+    def __init__(self, client=None, histograms=None, storage_format=None, csv_export=False):
+        """
+        Parameters:
+        - client: SteamClient (None이면 공용 클라이언트)
+        - histograms: HistogramRepository (None이면 client별 공용 저장소)
+        - storage_format: 출력 저장 형식 ('auto', 'parquet', 'feather', 'csv')
+        - csv_export: True이면 기본 형식과 함께 CSV도 저장
+        """
         self.base_url = "https://store.steampowered.com"
+        self.histograms = histograms or get_default_repository(client)
+        self.client = client or get_default_client()
+        self.storage_format = storage_format
+        self.csv_export = csv_export
         
+    @instrumented
     def get_app_reviews(self, app_id, params=None):
         """
         특정 게임의 리뷰 데이터 가져오기
@@ -35,28 +50,23 @@ class SteamAPIExplorer:
             default_params.update(params)
             
         try:
-            response = requests.get(url, params=default_params)
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_json(url, params=default_params, schema='reviews')
         except Exception as e:
             print(f"Error fetching reviews: {e}")
             return None
     
+    @instrumented
     def get_review_histogram(self, app_id):
         """
         날짜별 리뷰 히스토그램 데이터 가져오기
         이 API는 시간에 따른 긍정/부정 리뷰 수를 제공
-        """
-        url = f"{self.base_url}/appreviewhistogram/{app_id}"
         
-        try:
-            response = requests.get(url, params={'l': 'english'})
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"Error fetching histogram: {e}")
-            return None
+        패치 분석 단계와 공유하는 HistogramRepository를 통해 실행당 한 번만 요청하며,
+        ReviewHistogram(컬럼 단위 배열)을 반환
+        """
+        return self.histograms.get(app_id)
     
+    @instrumented
     def get_app_details(self, app_id):
         """
         게임의 상세 정보 가져오기 (전체 리뷰 점수 포함)
@@ -64,30 +74,160 @@ class SteamAPIExplorer:
         url = f"{self.base_url}/api/appdetails"
         
         try:
-            response = requests.get(url, params={'appids': app_id})
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_json(url, params={'appids': app_id})
         except Exception as e:
             print(f"Error fetching app details: {e}")
             return None
     
+    def get_review_store(self, output_dir='output'):
+        """output_dir 아래의 append-only 리뷰 저장소 반환"""
+        return ReviewStore(os.path.join(output_dir, 'reviews'), format=self.storage_format)
+    
+    def iter_review_pages(self, app_id, game_name, output_dir='output', num_per_page=100, resume=True,
+                          flush_rows=REVIEW_FLUSH_ROWS):
+        """
+        cursor 파라미터를 따라가며 전체 리뷰를 가져오는 제너레이터
+        
+        각 페이지는 타입이 고정된 컬럼 버퍼(ReviewBuffer)에 바로 기록하고, flush_rows개가 모일 때마다
+        리뷰 저장소(ReviewStore)에 한 번에 추가한 뒤 마지막 cursor를 체크포인트 파일에 저장하므로
+        중단된 크롤링을 마지막으로 저장된 청크부터 이어서 진행할 수 있음
+        
+        이전 크롤링이 끝까지 완료된 경우에는 첫 페이지('*')부터 다시 시작하여, 페이지의 리뷰가 모두
+        저장소의 가장 최근 리뷰보다 오래되면 멈춤 (filter=recent는 작성 시각 내림차순이므로 새 리뷰만 수집)
+        
+        Parameters:
+        - app_id: Steam 게임 ID
+        - game_name: 게임 이름 (파일명에 사용)
+        - output_dir: 리뷰 저장소와 체크포인트를 저장할 디렉토리
+        - num_per_page: 페이지당 리뷰 수 (최대 100)
+        - resume: True이면 저장된 cursor부터 이어서 수집 (완료된 경우 새 리뷰만), False이면 전체 이력을 다시 수집
+        - flush_rows: 저장소에 한 번에 기록하는 리뷰 수
+        
+        Yields:
+        - 저장된 리뷰 청크 DataFrame (버퍼 메모리를 그대로 사용하므로 다음 청크를 받기 전까지만 유효)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        
+        game_name_safe = game_name.replace('/', '_').replace('\\', '_').replace(':', '_')
+        state_file = os.path.join(output_dir, f"{app_id}_{game_name_safe}_reviews_crawl.json")
+        review_store = self.get_review_store(output_dir)
+        
+        # stop_before: 이 시각보다 오래된 리뷰만 있는 페이지에서 멈춤 (None이면 끝까지)
+        state = {'cursor': '*', 'pages': 0, 'reviews': 0, 'done': False, 'stop_before': None}
+        if resume and os.path.exists(state_file):
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state.update(json.load(f))
+            if state['done']:
+                # 완료된 크롤링 - 처음부터 저장된 가장 최근 리뷰까지만 다시 수집
+                # (중단 후 이어서 할 때도 같은 기준을 쓰도록 체크포인트에 함께 저장)
+                state = {'cursor': '*', 'pages': 0, 'reviews': 0, 'done': False,
+                         'stop_before': review_store.newest_created(app_id)}
+        
+        buffer = ReviewBuffer(capacity=flush_rows)
+        
+        def flush():
+            chunk = buffer.to_frame()
+            if len(chunk) > 0:
+                # 이미 저장된 리뷰는 저장소에서 중복 제거되므로 재시작 시 겹쳐도 안전함
+                review_store.append(app_id, chunk)
+            
+            # 저장소에 기록된 페이지까지만 원자적으로 체크포인트 갱신
+            tmp_file = state_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_file, state_file)
+            return chunk
+        
+        while True:
+            page = self.get_app_reviews(app_id, {
+                'filter': 'recent',
+                'num_per_page': num_per_page,
+                'cursor': state['cursor'],
+            })
+            if not page or page.get('success') != 1:
+                # 실패한 경우 모아 둔 리뷰와 체크포인트를 남겨두고 종료 (다음 실행에서 이어서 수집)
+                print(f"  ❌ 리뷰 페이지 수집 실패 (cursor: {state['cursor']})")
+                if len(buffer) > 0:
+                    yield flush()
+                return
+            
+            reviews = page.get('reviews', [])
+            added = buffer.extend(reviews)
+            next_cursor = page.get('cursor')
+            
+            state['pages'] += 1
+            state['reviews'] += added
+            state['done'] = not reviews or not next_cursor or next_cursor == state['cursor']
+            if state['stop_before'] is not None and added > 0:
+                created = buffer.columns['timestamp_created'][len(buffer) - added:len(buffer)]
+                state['done'] = state['done'] or bool(created.max() < state['stop_before'])
+            if next_cursor:
+                state['cursor'] = next_cursor
+            
+            if state['done'] or len(buffer) >= flush_rows:
+                chunk = flush()
+                if len(chunk) > 0:
+                    yield chunk
+                buffer.clear()
+            
+            if state['done']:
+                return
+    
+    @instrumented(rows=returned_count)
+    def crawl_all_reviews(self, app_id, game_name, output_dir='output', resume=True, timeline=None):
+        """
+        전체 리뷰를 끝까지 수집하여 리뷰 저장소에 저장 (메모리에는 한 청크만 유지)
+        
+        이미 완료된 게임은 마지막 수집 이후의 새 리뷰만 가져옴 (resume=False이면 전체 이력을 다시 수집)
+        
+        timeline(util.sentiment_timeline.SentimentTimeline)을 주면 저장된 청크마다 바로 반영함
+        """
+        print(f"전체 리뷰 크롤링 중: {game_name} (App ID: {app_id})")
+        
+        total = 0
+        for chunk in self.iter_review_pages(app_id, game_name, output_dir=output_dir, resume=resume):
+            total += len(chunk)
+            if timeline is not None:
+                timeline.update(chunk)
+            print(f"  ... {total:,}개 리뷰 저장", end='\r')
+        
+        print(f"\n✓ {game_name} 리뷰 크롤링 완료 (이번 실행: {total:,}개)")
+        return total
+    
+    @instrumented
     def collect_game_data(self, app_id, game_name):
         """
         게임 데이터를 수집하여 구조화된 형태로 반환
         """
         print(f"데이터 수집 중: {game_name} (App ID: {app_id})")
         
+        reviews_data = self.get_app_reviews(app_id)
+        histogram = self.get_review_histogram(app_id)
+        app_details = self.get_app_details(app_id)
+        recent_reviews = self.get_app_reviews(app_id, {'day_range': 30})
+        
+        game_data = self.build_game_data(app_id, game_name, reviews_data, histogram,
+                                         app_details, recent_reviews)
+        
+        print(f"✓ {game_name} 데이터 수집 완료")
+        return game_data
+    
+    @instrumented
+    def build_game_data(self, app_id, game_name, reviews_data, histogram, app_details, recent_reviews):
+        """
+        API 응답들을 구조화된 게임 데이터로 변환
+        (순차 수집과 동시 수집 모두에서 사용)
+        """
         game_data = {
             'app_id': app_id,
             'game_name': game_name,
-            'reviews': [],
+            'reviews': ReviewBuffer(capacity=0).to_frame(),
             'histogram_daily': [],
             'histogram_monthly': [],
             'game_info': {},
             'summary': {}
         }
         
-        reviews_data = self.get_app_reviews(app_id)
         if reviews_data and reviews_data.get('success') == 1:
             query_summary = reviews_data.get('query_summary', {})
             game_data['summary'] = {
@@ -98,44 +238,12 @@ class SteamAPIExplorer:
                 'review_score_desc': query_summary.get('review_score_desc', 'N/A')
             }
             
-            reviews = reviews_data.get('reviews', [])
-            for review in reviews:
-                author = review.get('author', {})
-                game_data['reviews'].append({
-                    'recommendationid': review.get('recommendationid'),
-                    'voted_up': review.get('voted_up'),
-                    'votes_up': review.get('votes_up'),
-                    'votes_funny': review.get('votes_funny'),
-                    'weighted_vote_score': review.get('weighted_vote_score'),
-                    'comment_count': review.get('comment_count'),
-                    'timestamp_created': review.get('timestamp_created'),
-                    'timestamp_updated': review.get('timestamp_updated'),
-                    'review_length': len(review.get('review', '')),
-                    'playtime_forever': author.get('playtime_forever'),
-                    'playtime_at_review': author.get('playtime_at_review'),
-                    'num_games_owned': author.get('num_games_owned'),
-                    'num_reviews': author.get('num_reviews')
-                })
-        
-        time.sleep(1)
-        
-        histogram_data = self.get_review_histogram(app_id)
-        if histogram_data and histogram_data.get('success') == 1:
-            results = histogram_data.get('results', {})
-            if isinstance(results, dict) and 'rollups' in results:
-                rollups = results['rollups']
-                for rollup in rollups:
-                    if isinstance(rollup, dict):
-                        date = datetime.fromtimestamp(rollup.get('date', 0))
-                        game_data['histogram_daily'].append({
-                            'date': date.strftime('%Y-%m-%d'),
-                            'recommendations_up': rollup.get('recommendations_up', 0),
-                            'recommendations_down': rollup.get('recommendations_down', 0)
-                        })
-        
-        time.sleep(1)
+            # 리뷰는 타입이 고정된 컬럼 배열로 바로 변환 (리뷰별 딕셔너리를 만들지 않음)
+            game_data['reviews'] = ReviewBuffer.from_reviews(reviews_data.get('reviews', [])).to_frame()
+        
+        if histogram:
+            game_data['histogram_daily'] = histogram
         
-        app_details = self.get_app_details(app_id)
         if app_details and str(app_id) in app_details:
             data = app_details[str(app_id)].get('data', {})
             if data:
@@ -147,7 +255,6 @@ class SteamAPIExplorer:
                     'metacritic_score': data.get('metacritic', {}).get('score', 'N/A')
                 }
         
-        recent_reviews = self.get_app_reviews(app_id, {'day_range': 30})
         if recent_reviews and recent_reviews.get('success') == 1:
             summary = recent_reviews.get('query_summary', {})
             game_data['summary']['recent_30days'] = {
@@ -157,28 +264,29 @@ class SteamAPIExplorer:
                 'review_score_desc': summary.get('review_score_desc', 'N/A')
             }
         
-        print(f"✓ {game_name} 데이터 수집 완료")
         return game_data
     
+    @instrumented
     def save_to_csv(self, game_data, output_dir='output'):
         """
-        수집된 게임 데이터를 CSV 파일로 저장
+        수집된 게임 데이터를 저장 (기본 Parquet, pyarrow가 없으면 CSV)
         """
-        os.makedirs(output_dir, exist_ok=True)
+        import pandas as pd
+        store = TableStore(output_dir, format=self.storage_format, csv_export=self.csv_export)
         
         game_name_safe = game_data['game_name'].replace('/', '_').replace('\\', '_').replace(':', '_')
         app_id = game_data['app_id']
         
-        if game_data['reviews']:
-            reviews_df = pd.DataFrame(game_data['reviews'])
-            reviews_file = os.path.join(output_dir, f"{app_id}_{game_name_safe}_reviews.csv")
-            reviews_df.to_csv(reviews_file, index=False, encoding='utf-8-sig')
-            print(f"  ✓ 리뷰 데이터 저장: {reviews_file}")
+        if len(game_data['reviews']) > 0:
+            # 리뷰는 덮어쓰지 않고 신규/수정된 리뷰만 저장소에 추가
+            review_store = self.get_review_store(output_dir)
+            written = review_store.append(app_id, game_data['reviews'])
+            print(f"  ✓ 리뷰 데이터 저장: {review_store.root} (신규/수정 {written}개)")
         
         if game_data['histogram_daily']:
-            daily_df = pd.DataFrame(game_data['histogram_daily'])
-            daily_file = os.path.join(output_dir, f"{app_id}_{game_name_safe}_daily_histogram.csv")
-            daily_df.to_csv(daily_file, index=False, encoding='utf-8-sig')
+            daily_df = game_data['histogram_daily'].to_frame()
+            daily_df['date'] = daily_df['date'].dt.normalize()  # 날짜 단위로 저장
+            daily_file = store.save(daily_df, f"{app_id}_{game_name_safe}_daily_histogram")
             print(f"  ✓ 일별 히스토그램 저장: {daily_file}")
         
         summary_data = [{
@@ -205,9 +313,9 @@ class SteamAPIExplorer:
                 'recent_30days_score_desc': recent.get('review_score_desc', 'N/A')
             })
         
-        summary_df = pd.DataFrame(summary_data)
-        summary_file = os.path.join(output_dir, f"{app_id}_{game_name_safe}_summary.csv")
-        summary_df.to_csv(summary_file, index=False, encoding='utf-8-sig')
+        # metacritic_score는 점수 또는 'N/A'이므로 문자열로 통일
+        summary_df = pd.DataFrame(summary_data).astype({'metacritic_score': str})
+        summary_file = store.save(summary_df, f"{app_id}_{game_name_safe}_summary")
         print(f"  ✓ 요약 정보 저장: {summary_file}")
 
 
@@ -217,22 +325,16 @@ def main():
     """
     explorer = SteamAPIExplorer()
     
-    games = [
-        (1049590, "Eternal Return"),
-        (1973530, "Limbus Company"),
-        (730, "Counter-Strike 2"),
-        (440, "Team Fortress 2"),
-    ]
+    games = load_catalog()
     
     print("\n" + "="*80)
     print(f"Steam 게임 데이터 수집 시작 - 총 {len(games)}개 게임")
     print("="*80 + "\n")
     
-    for app_id, game_name in games:
-        game_data = explorer.collect_game_data(app_id, game_name)
+    for game in games:
+        game_data = explorer.collect_game_data(game['app_id'], game['name'])
         explorer.save_to_csv(game_data)
         print()
-        time.sleep(2)
     
     print("="*80)
     print("모든 게임 데이터 수집 및 CSV 저장 완료")
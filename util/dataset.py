@@ -0,0 +1,190 @@
+import os
+import threading
+from collections import OrderedDict
+
+from util.instrument import instrumented
+from util.review_store import ReviewStore
+from util.sentiment_timeline import SentimentTimeline
+from util.storage import TableStore
+
+HISTOGRAM_COLUMNS = ['date', 'recommendations_up', 'recommendations_down']
+PATCH_COLUMNS = ['date', 'title', 'contents_length']
+
+
+class _TableCache:
+    """
+    (파일 경로, 컬럼) 단위 로드 결과 메모이제이션
+
+    파일의 수정 시각(mtime)과 크기가 그대로이면 다시 읽지 않고 캐시된 DataFrame을 반환하며,
+    최대 max_entries개까지 LRU로 유지
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, store, stem, columns=None):
+        path, backend = store.find(stem)
+        if path is None:
+            raise FileNotFoundError(os.path.join(store.output_dir, stem))
+
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        key = (os.path.abspath(path), tuple(columns) if columns is not None else None)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        df = backend.read(path, columns=columns, parse_dates=('date',))
+
+        with self._lock:
+            self._entries[key] = (version, df)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return df
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_table_cache = _TableCache()
+
+
+@instrumented
+def load_table(store, stem, columns=None):
+    """
+    TableStore의 테이블을 mtime 기준 메모이제이션하여 로드
+
+    반환된 DataFrame은 다른 호출과 공유되므로 수정하지 말고 읽기 전용으로 사용
+    """
+    return _table_cache.load(store, stem, columns=columns)
+
+
+def clear_table_cache():
+    """로드 캐시 비우기"""
+    _table_cache.clear()
+
+
+def safe_name(game_name):
+    """수집기(collector)가 히스토그램/요약 파일 이름에 사용하는 게임 이름"""
+    return game_name.replace('/', '_').replace('\\', '_').replace(':', '_')
+
+
+def patch_safe_name(game_name):
+    """패치노트 수집기가 파일 이름에 사용하는 게임 이름"""
+    return game_name.replace(':', '').replace('/', '-')
+
+
+class GameDataset:
+    """
+    게임 하나의 분석용 데이터 묶음 (히스토그램, 패치노트, 리뷰)
+
+    각 데이터는 처음 사용할 때 한 번만 로드되고, 히스토그램의 파생 컬럼
+    (total_reviews, positive_ratio, negative_ratio)도 한 번만 계산되어
+    리뷰 시각화, 비교 차트, 패치노트 시각화, 상관관계 분석 단계에서 함께 사용됨
+
+    속성으로 반환되는 DataFrame은 단계 간에 공유되므로 수정하지 말 것
+    """
+
+    def __init__(self, app_id, game_name, output_dir='output', format=None):
+        """
+        Parameters:
+        - app_id: Steam 게임 ID
+        - game_name: 게임 이름
+        - output_dir: 수집 데이터 디렉토리
+        - format: 'auto', 'parquet', 'feather', 'csv' (None이면 기본 형식)
+        """
+        self.app_id = app_id
+        self.game_name = game_name
+        self.output_dir = output_dir
+        self.store = TableStore(output_dir, format=format)
+        self.review_store = ReviewStore(os.path.join(output_dir, 'reviews'), format=format)
+
+        self.histogram_stem = f"{app_id}_{safe_name(game_name)}_daily_histogram"
+        self.patch_stem = f"{app_id}_{patch_safe_name(game_name)}_patch_notes"
+
+        self._histogram = None
+        self._patches = None
+        self._reviews = None
+        self._timelines = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_games(cls, games, output_dir='output', format=None):
+        """[{'app_id': ..., 'name': ...}] 형식의 게임 목록으로 데이터셋 리스트 생성"""
+        return [cls(game['app_id'], game['name'], output_dir=output_dir, format=format) for game in games]
+
+    @property
+    def has_histogram(self):
+        return self._histogram is not None or self.store.exists(self.histogram_stem)
+
+    @property
+    def has_patches(self):
+        return self._patches is not None or self.store.exists(self.patch_stem)
+
+    @property
+    def histogram(self):
+        """날짜순 정렬 + 파생 컬럼이 계산된 히스토그램 DataFrame"""
+        with self._lock:
+            if self._histogram is None:
+                df = load_table(self.store, self.histogram_stem, columns=HISTOGRAM_COLUMNS)
+                df = df.sort_values('date').reset_index(drop=True)
+                df['total_reviews'] = df['recommendations_up'] + df['recommendations_down']
+                df['positive_ratio'] = (df['recommendations_up'] / df['total_reviews'] * 100).fillna(0)
+                df['negative_ratio'] = (df['recommendations_down'] / df['total_reviews'] * 100).fillna(0)
+                self._histogram = df
+            return self._histogram
+
+    @property
+    def patches(self):
+        """패치노트 DataFrame (date, title, contents_length)"""
+        with self._lock:
+            if self._patches is None:
+                self._patches = load_table(self.store, self.patch_stem, columns=PATCH_COLUMNS)
+            return self._patches
+
+    @property
+    def reviews(self):
+        """리뷰 저장소에 저장된 리뷰 전체 (recommendationid별 최신 버전)"""
+        with self._lock:
+            if self._reviews is None:
+                self._reviews = self.review_store.read(self.app_id)
+            return self._reviews
+
+    def timeline_path(self, freq='D', utc_offset=0):
+        """리뷰 타임라인 상태 파일 경로"""
+        suffix = f"_utc{utc_offset:+g}" if utc_offset else ''
+        return os.path.join(self.output_dir, 'timelines', f"{self.app_id}_{freq}{suffix}.npz")
+
+    def sentiment_timeline(self, freq='D', utc_offset=0):
+        """
+        리뷰 단위 긍정/부정 타임라인 (util.sentiment_timeline.SentimentTimeline)
+
+        저장된 상태를 불러와 리뷰 저장소에 새로 추가된 part만 반영한 뒤 다시 저장하므로,
+        수집이 반복되어도 전체 리뷰를 다시 집계하지 않음
+        """
+        key = (freq, utc_offset)
+        with self._lock:
+            timeline = self._timelines.get(key)
+            path = self.timeline_path(freq, utc_offset)
+            if timeline is None:
+                timeline = SentimentTimeline.load(path, freq, utc_offset)
+                self._timelines[key] = timeline
+            applied = set(timeline.applied_parts)
+            timeline.refresh(self.review_store, self.app_id)
+            if timeline.applied_parts != applied:
+                timeline.save(path)
+            return timeline
+
+    def invalidate(self):
+        """로드된 데이터를 버리고 다음 사용 시 다시 로드 (수집 직후 등)"""
+        with self._lock:
+            self._histogram = None
+            self._patches = None
+            self._reviews = None
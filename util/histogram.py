@@ -0,0 +1,140 @@
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from util.instrument import instrumented
+from util.steam_client import get_default_client
+
+
+class ReviewHistogram:
+    """
+    게임 하나의 리뷰 히스토그램 (컬럼 단위 numpy 배열)
+
+    /appreviewhistogram 응답을 한 번만 파싱하여 수집 단계(CSV 저장)와
+    패치 영향 분석 단계에서 함께 사용
+    """
+
+    def __init__(self, app_id, dates, recommendations_up, recommendations_down):
+        """
+        Parameters:
+        - app_id: Steam 게임 ID
+        - dates: datetime64[s] 배열 (로컬 시간 기준, 기존 datetime.fromtimestamp와 동일)
+        - recommendations_up: 긍정 리뷰 수 (int64 배열)
+        - recommendations_down: 부정 리뷰 수 (int64 배열)
+        """
+        self.app_id = app_id
+        self.dates = np.asarray(dates, dtype='datetime64[s]')
+        self.recommendations_up = np.asarray(recommendations_up, dtype=np.int64)
+        self.recommendations_down = np.asarray(recommendations_down, dtype=np.int64)
+
+    @classmethod
+    def from_response(cls, app_id, data):
+        """API 응답을 파싱 (rollup이 없으면 None 반환)"""
+        if not data or data.get('success') != 1:
+            return None
+
+        results = data.get('results', {})
+        if not isinstance(results, dict) or 'rollups' not in results:
+            return None
+
+        rollups = [rollup for rollup in results['rollups'] if isinstance(rollup, dict)]
+        return cls(
+            app_id,
+            [datetime.fromtimestamp(rollup.get('date', 0)) for rollup in rollups],
+            [rollup.get('recommendations_up', 0) for rollup in rollups],
+            [rollup.get('recommendations_down', 0) for rollup in rollups],
+        )
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def total_reviews(self):
+        return self.recommendations_up + self.recommendations_down
+
+    def to_frame(self, date_format=None):
+        """
+        DataFrame으로 변환
+
+        Parameters:
+        - date_format: 지정하면 date 컬럼을 해당 형식의 문자열로 변환 (CSV 저장용)
+        """
+        import pandas as pd
+        dates = pd.to_datetime(self.dates)
+        return pd.DataFrame({
+            'date': dates.strftime(date_format) if date_format else dates,
+            'recommendations_up': self.recommendations_up,
+            'recommendations_down': self.recommendations_down,
+        })
+
+
+class HistogramRepository:
+    """
+    실행 단위로 게임별 히스토그램을 한 번만 가져와 메모리에 보관
+
+    여러 스레드에서 같은 게임을 동시에 요청해도 실제 요청은 한 번만 발생함
+    """
+
+    def __init__(self, client=None):
+        self.store_url = "https://store.steampowered.com"
+        self.client = client
+        self._histograms = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _app_lock(self, app_id):
+        with self._lock:
+            if app_id not in self._locks:
+                self._locks[app_id] = threading.Lock()
+            return self._locks[app_id]
+
+    @instrumented
+    def get(self, app_id):
+        """
+        게임의 리뷰 히스토그램 반환 (처음 요청할 때만 API 호출)
+
+        Returns:
+        - ReviewHistogram 또는 None (가져오지 못한 경우, 다음 요청에서 다시 시도)
+        """
+        with self._app_lock(app_id):
+            if app_id in self._histograms:
+                return self._histograms[app_id]
+
+            url = f"{self.store_url}/appreviewhistogram/{app_id}"
+            client = self.client or get_default_client()
+            try:
+                data = client.get_json(url, params={'l': 'english'})
+            except Exception as e:
+                print(f"Error fetching histogram: {e}")
+                return None
+
+            histogram = ReviewHistogram.from_response(app_id, data)
+            if histogram is not None:
+                self._histograms[app_id] = histogram
+            return histogram
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+_default_repository = HistogramRepository()
+_repositories_lock = threading.Lock()
+
+
+def get_default_repository(client=None):
+    """
+    수집기와 패치 분석기가 함께 사용하는 기본 HistogramRepository 반환
+
+    Parameters:
+    - client: SteamClient (None이면 공용 클라이언트를 쓰는 저장소, 지정하면 해당 클라이언트 전용 저장소)
+      클라이언트 전용 저장소는 클라이언트 객체에 보관하므로 클라이언트와 함께 정리됨
+    """
+    if client is None:
+        return _default_repository
+    with _repositories_lock:
+        repository = getattr(client, '_histogram_repository', None)
+        if repository is None:
+            repository = client._histogram_repository = HistogramRepository(client)
+        return repository
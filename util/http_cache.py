@@ -0,0 +1,137 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+
+# 엔드포인트별 캐시 유효 시간 (초), URL 경로에 포함된 문자열로 매칭
+DEFAULT_TTLS = {
+    '/appreviewhistogram/': 6 * 60 * 60,
+    '/ISteamNews/GetNewsForApp/': 60 * 60,
+    '/api/appdetails': 24 * 60 * 60,
+    '/appreviews/': 15 * 60,
+}
+
+
+class CacheMissError(Exception):
+    """오프라인 모드에서 캐시에 응답이 없는 경우"""
+
+
+class ResponseCache:
+    """
+    URL + 파라미터 기준의 디스크 HTTP 응답 캐시 (SQLite)
+
+    - 엔드포인트별 TTL
+    - 전체 크기 제한을 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+    - ETag / Last-Modified 값을 저장해 만료 후 조건부 재검증에 사용
+    """
+
+    def __init__(self, path=os.path.join('.cache', 'steam_http.sqlite'), ttls=None,
+                 default_ttl=60 * 60, max_bytes=512 * 1024 * 1024):
+        """
+        Parameters:
+        - path: 캐시 DB 파일 경로
+        - ttls: {URL 경로 문자열: TTL(초)} - 기본값 DEFAULT_TTLS
+        - default_ttl: 매칭되는 엔드포인트가 없을 때의 TTL (초)
+        - max_bytes: 캐시 전체 최대 크기 (바이트)
+        """
+        self.path = path
+        self.ttls = ttls if ttls is not None else DEFAULT_TTLS
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses (accessed_at)")
+        self.conn.commit()
+
+    def make_key(self, url, params=None):
+        """URL과 정렬된 파라미터로 캐시 키 생성"""
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+    def ttl_for(self, url):
+        for pattern, ttl in self.ttls.items():
+            if pattern in url:
+                return ttl
+        return self.default_ttl
+
+    def get(self, key):
+        """
+        캐시 항목 조회
+
+        Returns:
+        - {'body', 'etag', 'last_modified', 'fetched_at'} 또는 None
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+
+        return {'body': row[0], 'etag': row[1], 'last_modified': row[2], 'fetched_at': row[3]}
+
+    def is_fresh(self, entry, url):
+        return time.time() - entry['fetched_at'] < self.ttl_for(url)
+
+    def put(self, key, url, body, etag=None, last_modified=None):
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, body, etag, last_modified, now, now, len(body))
+            )
+            self._evict()
+            self.conn.commit()
+
+    def touch(self, key):
+        """조건부 재검증(304) 성공 시 유효 시간을 갱신"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+            )
+            self.conn.commit()
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        freed = 0
+        victims = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            victims.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
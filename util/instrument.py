@@ -0,0 +1,331 @@
+import functools
+import json
+import os
+import platform
+import re
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+PROFILERS = ['cprofile', 'pyinstrument']
+
+# 단계 밖에서 호출된 함수/요청이 기록되는 단계 이름
+UNSTAGED = 'unstaged'
+
+
+def peak_rss_mb(children=False):
+    """
+    현재 프로세스(children=True이면 종료된 자식 프로세스 중 최대)의 최대 메모리 사용량 (MB)
+
+    resource 모듈이 없는 환경(Windows)에서는 psutil이 있으면 사용하고, 없으면 None
+    """
+    if HAS_RESOURCE:
+        who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+        maxrss = resource.getrusage(who).ru_maxrss
+        # macOS는 바이트, Linux는 KB 단위
+        return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+    if children:
+        return None
+    try:
+        import psutil
+    except ImportError:
+        return None
+    memory = psutil.Process().memory_info()
+    return getattr(memory, 'peak_wset', memory.rss) / (1024 * 1024)
+
+
+def endpoint_name(url):
+    """요청 URL을 엔드포인트 이름으로 변환 (경로의 app_id 등 숫자는 {id}로 치환)"""
+    parsed = urlparse(url)
+    path = re.sub(r'/\d+(?=/|$)', '/{id}', parsed.path.rstrip('/'))
+    return parsed.netloc + path
+
+
+def _count_rows(result):
+    """함수 결과의 행 수 (DataFrame, 리스트, ReviewHistogram 등 길이가 있는 결과만)"""
+    if result is None or isinstance(result, (str, bytes, dict, tuple)):
+        return None
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def returned_count(result):
+    """정수(처리한 항목 수)를 반환하는 함수용 rows 함수 (예: ReviewStore.append)"""
+    return result if isinstance(result, int) and not isinstance(result, bool) else None
+
+
+def _empty_function_stats():
+    return {'calls': 0, 'errors': 0, 'wall_time': 0.0, 'max_time': 0.0, 'rows': 0}
+
+
+def _empty_stage(name):
+    return {
+        'name': name,
+        'wall_time': 0.0,
+        'cpu_time': 0.0,
+        'peak_rss_mb': None,
+        'peak_rss_children_mb': None,
+        'http': {
+            'requests': 0,
+            'bytes_downloaded': 0,
+            'retries': 0,
+            'errors': 0,
+            'cache_hits': 0,
+            'not_modified': 0,
+            'endpoints': {},
+        },
+        'functions': {},
+        'profile': None,
+    }
+
+
+class RunRecorder:
+    """
+    실행 단위 계측 기록기
+
+    - 단계(stage)별 실행 시간, CPU 시간, 최대 메모리(RSS)
+    - HTTP 요청 수(엔드포인트별), 응답 크기, 재시도, 캐시 적중 (SteamClient가 기록)
+    - instrumented 함수별 호출 수, 실행 시간, 처리 행 수
+    - 단계별 cProfile/pyinstrument 덤프 (선택)
+
+    여러 스레드에서 동시에 기록해도 안전하며, 결과는 report()/write_report()로 JSON 보고서가 됨
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self._start = time.perf_counter()
+            self.metadata = {}
+            self.stages = {}
+            self._current = UNSTAGED
+
+    def _stage(self, name=None):
+        name = name or self._current
+        if name not in self.stages:
+            self.stages[name] = _empty_stage(name)
+        return self.stages[name]
+
+    @contextmanager
+    def stage(self, name, profiler=None, profile_path=None):
+        """
+        파이프라인 단계 계측 (단계는 순차 실행을 가정하며, 안에서 실행된 스레드의 기록도 이 단계에 포함)
+
+        Parameters:
+        - name: 단계 이름 ('collect', 'analyze', 'render' 등)
+        - profiler: 'cprofile' 또는 'pyinstrument' (None이면 프로파일링하지 않음)
+        - profile_path: 프로파일 덤프 경로 (확장자 제외, cProfile은 .prof, pyinstrument는 .html)
+        """
+        with self._lock:
+            previous = self._current
+            self._current = name
+            self._stage(name)
+
+        session = _start_profiler(profiler) if profiler else None
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield self
+        finally:
+            wall_time = time.perf_counter() - start
+            cpu_time = time.process_time() - cpu_start
+            dump = _stop_profiler(profiler, session, profile_path or name) if session else None
+            with self._lock:
+                stage = self._stage(name)
+                stage['wall_time'] += wall_time
+                stage['cpu_time'] += cpu_time
+                stage['peak_rss_mb'] = peak_rss_mb()
+                stage['peak_rss_children_mb'] = peak_rss_mb(children=True)
+                if dump:
+                    stage['profile'] = dump
+                self._current = previous
+
+    def record_request(self, url, status=None, nbytes=0, retry=False, error=False):
+        """HTTP 요청 한 번(재시도 포함 각 시도)의 결과 기록"""
+        endpoint = endpoint_name(url)
+        with self._lock:
+            http = self._stage()['http']
+            http['requests'] += 1
+            http['bytes_downloaded'] += nbytes
+            http['retries'] += int(retry)
+            http['errors'] += int(error)
+            counts = http['endpoints'].setdefault(endpoint, {'requests': 0, 'bytes': 0, 'statuses': {}})
+            counts['requests'] += 1
+            counts['bytes'] += nbytes
+            key = str(status) if status is not None else 'error'
+            counts['statuses'][key] = counts['statuses'].get(key, 0) + 1
+
+    def record_cache(self, url, not_modified=False):
+        """네트워크 없이 캐시로 응답한 요청 (not_modified=True이면 304 재검증) 기록"""
+        with self._lock:
+            http = self._stage()['http']
+            if not_modified:
+                http['not_modified'] += 1
+            else:
+                http['cache_hits'] += 1
+
+    def record_call(self, name, elapsed, rows=None, error=False):
+        """instrumented 함수 호출 한 번 기록"""
+        with self._lock:
+            stats = self._stage()['functions'].setdefault(name, _empty_function_stats())
+            stats['calls'] += 1
+            stats['errors'] += int(error)
+            stats['wall_time'] += elapsed
+            stats['max_time'] = max(stats['max_time'], elapsed)
+            stats['rows'] += rows or 0
+
+    def take_functions(self):
+        """
+        지금까지 기록된 함수 통계를 꺼내고 비움
+
+        렌더링 워커 프로세스의 기록을 부모 프로세스로 옮길 때 사용 (merge_functions와 짝)
+        """
+        with self._lock:
+            functions = {}
+            for stage in self.stages.values():
+                for name, stats in stage['functions'].items():
+                    merged = functions.setdefault(name, _empty_function_stats())
+                    _merge_function_stats(merged, stats)
+                stage['functions'] = {}
+            return functions
+
+    def merge_functions(self, functions):
+        """다른 프로세스에서 가져온 함수 통계를 현재 단계에 합침"""
+        with self._lock:
+            target = self._stage()['functions']
+            for name, stats in (functions or {}).items():
+                _merge_function_stats(target.setdefault(name, _empty_function_stats()), stats)
+
+    def report(self):
+        """JSON으로 저장할 수 있는 실행 보고서 딕셔너리"""
+        with self._lock:
+            stages = json.loads(json.dumps(list(self.stages.values())))
+            metadata = dict(self.metadata)
+        for stage in stages:
+            # 실행 시간이 긴 함수부터 정렬
+            stage['functions'] = dict(sorted(stage['functions'].items(),
+                                             key=lambda item: item[1]['wall_time'], reverse=True))
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'wall_time': time.perf_counter() - self._start,
+            'host': socket.gethostname(),
+            'pid': os.getpid(),
+            'python': platform.python_version(),
+            'peak_rss_mb': peak_rss_mb(),
+            'peak_rss_children_mb': peak_rss_mb(children=True),
+            'metadata': metadata,
+            'stages': stages,
+        }
+
+    def write_report(self, path):
+        """실행 보고서를 JSON 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+
+def _merge_function_stats(target, stats):
+    target['calls'] += stats['calls']
+    target['errors'] += stats['errors']
+    target['wall_time'] += stats['wall_time']
+    target['max_time'] = max(target['max_time'], stats['max_time'])
+    target['rows'] += stats['rows']
+
+
+def _start_profiler(profiler):
+    """
+    단계 프로파일러 시작
+
+    두 프로파일러 모두 단계를 실행하는 스레드만 기록하므로, 수집 단계의 스레드 풀 작업이나
+    렌더링 워커 프로세스 안의 시간은 함수별 통계(functions)로 확인
+    """
+    if profiler == 'cprofile':
+        import cProfile
+        session = cProfile.Profile()
+        session.enable()
+        return session
+    if profiler == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️ pyinstrument가 설치되어 있지 않아 단계 프로파일링을 건너뜁니다. (pip install pyinstrument)")
+            return None
+        session = Profiler()
+        session.start()
+        return session
+    raise ValueError(f"지원하지 않는 프로파일러입니다: {profiler} (가능한 값: {', '.join(PROFILERS)})")
+
+
+def _stop_profiler(profiler, session, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if profiler == 'cprofile':
+        session.disable()
+        output_path = path + '.prof'
+        session.dump_stats(output_path)
+    else:
+        session.stop()
+        output_path = path + '.html'
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(session.output_html())
+    return output_path
+
+
+_recorder = RunRecorder()
+
+
+def get_recorder():
+    """모든 모듈이 함께 사용하는 기본 RunRecorder 반환"""
+    return _recorder
+
+
+def instrumented(func=None, *, name=None, rows=_count_rows):
+    """
+    함수 호출 시간과 처리 행 수를 기본 RunRecorder에 기록하는 데코레이터
+
+    Parameters:
+    - name: 기록 이름 (None이면 '모듈.함수' 형식, 예: 'storage.TableStore.save')
+    - rows: rows(결과) -> 처리 행 수 (기본값은 DataFrame/리스트 결과의 길이)
+
+    사용법:
+        @instrumented
+        def compute_patch_windows(...): ...
+    """
+    if func is None:
+        return functools.partial(instrumented, name=name, rows=rows)
+
+    label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            _recorder.record_call(label, time.perf_counter() - start, error=True)
+            raise
+        _recorder.record_call(label, time.perf_counter() - start, rows=rows(result))
+        return result
+
+    return wrapper
@@ -0,0 +1,146 @@
+import json
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+JSON_BACKENDS = ['auto', 'msgspec', 'orjson', 'json']
+
+_default_backend = 'auto'
+
+
+def set_json_backend(backend):
+    """
+    응답 JSON 디코딩 방식 변경
+
+    - 'auto': msgspec이 있으면 스키마 디코딩, 없으면 orjson, 둘 다 없으면 표준 json
+    - 'msgspec' / 'orjson' / 'json': 해당 라이브러리 사용 (설치되어 있지 않으면 ValueError)
+    """
+    global _default_backend
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"지원하지 않는 JSON 백엔드입니다: {backend} (가능한 값: {', '.join(JSON_BACKENDS)})")
+    if backend == 'msgspec' and not HAS_MSGSPEC or backend == 'orjson' and not HAS_ORJSON:
+        raise ValueError(f"{backend}가 설치되어 있지 않습니다. (pip install {backend})")
+    _default_backend = backend
+
+
+def resolve_backend(backend=None):
+    backend = backend or _default_backend
+    if backend == 'auto':
+        if HAS_MSGSPEC:
+            return 'msgspec'
+        return 'orjson' if HAS_ORJSON else 'json'
+    return backend
+
+
+def loads(body, backend=None):
+    """JSON 전체를 딕셔너리/리스트로 디코딩 (body는 bytes 또는 str)"""
+    backend = resolve_backend(backend)
+    if backend == 'orjson':
+        return orjson.loads(body)
+    if backend == 'msgspec':
+        return msgspec.json.decode(body)
+    return json.loads(body)
+
+
+if HAS_MSGSPEC:
+    class _Record(msgspec.Struct):
+        """
+        스키마 디코딩 결과의 공통 부모
+
+        필요한 필드만 디코딩한 Struct이지만 딕셔너리처럼 .get(), [], in으로 읽을 수 있어서
+        수집기 코드는 표준 json 결과와 같은 방식으로 사용함
+        """
+
+        def get(self, name, default=None):
+            value = getattr(self, name, None)
+            return default if value is None else value
+
+        def __getitem__(self, name):
+            if name not in self.__struct_fields__:
+                raise KeyError(name)
+            return getattr(self, name)
+
+        def __contains__(self, name):
+            return name in self.__struct_fields__ and getattr(self, name) is not None
+
+    class ReviewAuthor(_Record):
+        playtime_forever: Optional[int] = None
+        playtime_at_review: Optional[int] = None
+        num_games_owned: Optional[int] = None
+        num_reviews: Optional[int] = None
+
+    class Review(_Record):
+        recommendationid: Union[str, int, None] = None
+        voted_up: Optional[bool] = None
+        votes_up: Optional[int] = None
+        votes_funny: Optional[int] = None
+        weighted_vote_score: Union[str, int, float, None] = None
+        comment_count: Optional[int] = None
+        timestamp_created: Optional[int] = None
+        timestamp_updated: Optional[int] = None
+        review: Optional[str] = None
+        author: Optional[ReviewAuthor] = None
+
+    class ReviewPage(_Record):
+        success: Optional[int] = None
+        cursor: Optional[str] = None
+        query_summary: Optional[Dict[str, Any]] = None
+        reviews: List[Review] = msgspec.field(default_factory=list)
+
+    class NewsItem(_Record):
+        gid: Optional[str] = None
+        title: Optional[str] = None
+        url: Optional[str] = None
+        author: Optional[str] = None
+        contents: Optional[str] = None
+        date: Optional[int] = None
+        feedlabel: Optional[str] = None
+        feed_type: Optional[int] = None
+
+    class AppNews(_Record):
+        newsitems: List[NewsItem] = msgspec.field(default_factory=list)
+
+    class NewsResponse(_Record):
+        appnews: Optional[AppNews] = None
+
+    _DECODERS = {
+        'reviews': msgspec.json.Decoder(ReviewPage),
+        'news': msgspec.json.Decoder(NewsResponse),
+    }
+else:
+    _DECODERS = {}
+
+SCHEMAS = ['reviews', 'news']
+
+
+def decode(body, schema=None, backend=None):
+    """
+    응답 본문 디코딩
+
+    Parameters:
+    - body: 응답 본문 (bytes 또는 str)
+    - schema: 'reviews'(/appreviews 페이지) 또는 'news'(GetNewsForApp) - msgspec 백엔드에서는
+      수집기가 사용하는 필드만 Struct로 디코딩하고 나머지 필드는 건너뜀 (None이면 전체 디코딩)
+    - backend: JSON 백엔드 (None이면 기본값)
+
+    스키마와 맞지 않는 응답(예: 필드 타입이 다른 오류 응답)은 전체 디코딩으로 처리
+    """
+    backend = resolve_backend(backend)
+    if schema is not None and backend == 'msgspec':
+        if schema not in _DECODERS:
+            raise ValueError(f"알 수 없는 스키마입니다: {schema} (가능한 값: {', '.join(SCHEMAS)})")
+        try:
+            return _DECODERS[schema].decode(body)
+        except msgspec.ValidationError:
+            pass
+    return loads(body, backend)
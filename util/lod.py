@@ -0,0 +1,111 @@
+import numpy as np
+
+# 막대 하나가 이 픽셀 수보다 좁아지면 개별 막대 대신 envelope로 그림
+MIN_PIXELS_PER_BAR = 2
+
+
+def axis_pixel_width(ax, dpi):
+    """저장 해상도(dpi) 기준 axes의 가로 픽셀 수"""
+    return ax.get_position().width * ax.figure.get_figwidth() * dpi
+
+
+def max_bins(ax, dpi, min_pixels=MIN_PIXELS_PER_BAR):
+    """axes 폭에서 구분해 그릴 수 있는 최대 구간 수"""
+    return max(int(axis_pixel_width(ax, dpi) // min_pixels), 1)
+
+
+def _as_datetime64(dates):
+    return np.asarray(dates, dtype='datetime64[ns]')
+
+
+def peak_envelope(dates, values, n_bins):
+    """
+    시간축을 n_bins개의 같은 폭 구간으로 나누고 구간별로 0에서 가장 먼 값(최댓값 또는 최솟값)을 남김
+
+    막대는 0을 기준으로 그려지므로 구간 안의 최고점/최저점을 그대로 유지하면
+    데이터를 줄여도 피크가 사라지지 않음
+
+    Returns:
+    - (구간 경계 n_bins+1개의 datetime64 배열, 구간별 값 n_bins개 배열 - 빈 구간은 0)
+    """
+    stamps = _as_datetime64(dates).astype(np.int64)
+    values = np.asarray(values, dtype=np.float64)
+
+    start, end = stamps.min(), stamps.max()
+    edges = np.linspace(start, end + 1, n_bins + 1)
+    bins = np.clip(np.searchsorted(edges, stamps, side='right') - 1, 0, n_bins - 1)
+
+    highs = np.zeros(n_bins)
+    lows = np.zeros(n_bins)
+    np.maximum.at(highs, bins, values)
+    np.minimum.at(lows, bins, values)
+    peaks = np.where(-lows > highs, lows, highs)
+
+    return edges.astype(np.int64).astype('datetime64[ns]'), peaks
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링 - 선 그래프의 모양(피크 포함)을 유지하며 n_out개 점 선택
+
+    Returns:
+    - 선택된 점의 인덱스 배열 (첫 점과 마지막 점 포함)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    bucket_edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bucket_edges[i], bucket_edges[i + 1]
+        # 다음 구간의 평균점 (마지막 구간은 마지막 점)
+        next_lo, next_hi = hi, bucket_edges[i + 2] if i + 2 < len(bucket_edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def draw_bars(ax, dates, values, dpi, width=20, **kwargs):
+    """
+    날짜별 막대 그리기 (level of detail 자동 선택)
+
+    행 수가 axes 폭에 구분해 그릴 수 있는 구간 수 이하이면 기존처럼 ax.bar로 막대를 그리고,
+    넘으면 peak_envelope로 줄인 값을 fill_between(step) 하나(PolyCollection)로 그림
+
+    Parameters:
+    - dates, values: 날짜와 막대 높이 (음수 막대 가능)
+    - dpi: 저장 해상도 (axes 픽셀 폭 계산용)
+    - width: 개별 막대로 그릴 때의 막대 폭
+    - kwargs: color, alpha, label, rasterized 등 (edgecolor는 막대에만 적용)
+    """
+    n_bins = max_bins(ax, dpi)
+    if len(values) <= n_bins:
+        return ax.bar(dates, values, width=width, **kwargs)
+
+    kwargs.pop('edgecolor', None)
+    edges, peaks = peak_envelope(dates, values, n_bins)
+    return ax.fill_between(edges, 0, np.append(peaks, peaks[-1]), step='post', linewidth=0, **kwargs)
+
+
+def draw_line(ax, dates, values, dpi, **kwargs):
+    """
+    날짜별 선 그래프 그리기 - 점 수가 axes 픽셀 폭보다 많으면 LTTB로 줄여서 그림
+    """
+    dates = _as_datetime64(dates)
+    values = np.asarray(values, dtype=np.float64)
+    n_out = max_bins(ax, dpi, min_pixels=1)
+    if len(values) > n_out:
+        keep = lttb(dates.astype(np.int64), values, n_out)
+        dates, values = dates[keep], values[keep]
+    return ax.plot(dates, values, **kwargs)
@@ -0,0 +1,78 @@
+import json
+import os
+
+from util.instrument import instrumented
+
+
+class NewsStore:
+    """
+    게임별 뉴스 동기화 결과를 저장하는 로컬 저장소
+
+    - {app_id}_news.jsonl: 처리된 뉴스 항목 (HTML 정리된 본문, 분류 결과와 분류기 버전 포함)
+    - {app_id}_news_state.json: 동기화 상태 (최신/최초 항목 날짜, 전체 이력 수집 여부)
+    """
+
+    def __init__(self, news_dir=os.path.join('output', 'news')):
+        self.news_dir = news_dir
+
+    def _items_file(self, app_id):
+        return os.path.join(self.news_dir, f"{app_id}_news.jsonl")
+
+    def _state_file(self, app_id):
+        return os.path.join(self.news_dir, f"{app_id}_news_state.json")
+
+    def load_state(self, app_id):
+        """
+        동기화 상태 반환
+
+        - latest_gid / latest_date: 가장 최근에 저장된 뉴스 (high-water mark)
+        - oldest_date: 가장 오래된 저장 뉴스의 날짜
+        - history_complete: 과거 이력을 끝까지 수집했는지 여부
+        """
+        state = {'latest_gid': None, 'latest_date': None, 'oldest_date': None, 'history_complete': False}
+        state_file = self._state_file(app_id)
+        if os.path.exists(state_file):
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state.update(json.load(f))
+        return state
+
+    def save_state(self, app_id, state):
+        os.makedirs(self.news_dir, exist_ok=True)
+        state_file = self._state_file(app_id)
+        tmp_file = state_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_file, state_file)
+
+    @instrumented
+    def load_items(self, app_id):
+        """저장된 모든 뉴스 항목 반환 (date는 유닉스 타임스탬프)"""
+        items_file = self._items_file(app_id)
+        if not os.path.exists(items_file):
+            return []
+        with open(items_file, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def known_gids(self, app_id):
+        return {item['gid'] for item in self.load_items(app_id)}
+
+    @instrumented
+    def append_items(self, app_id, items):
+        """처리된 뉴스 항목 추가 저장"""
+        if not items:
+            return
+        os.makedirs(self.news_dir, exist_ok=True)
+        with open(self._items_file(app_id), 'a', encoding='utf-8') as f:
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False) + '\n')
+
+    @instrumented
+    def replace_items(self, app_id, items):
+        """저장된 뉴스 항목 전체를 교체 (재분류 결과 반영용, 임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(self.news_dir, exist_ok=True)
+        items_file = self._items_file(app_id)
+        tmp_file = items_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False) + '\n')
+        os.replace(tmp_file, items_file)
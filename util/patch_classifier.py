@@ -0,0 +1,128 @@
+import hashlib
+import json
+import re
+
+
+from util.instrument import instrumented
+
+
+# 카테고리별 키워드 패턴 - 영문은 단어 경계(\b)로 감싸 'prefix' 속 'fix' 같은 오탐을 막음
+# 한글은 조사가 붙으므로 경계 없이 매칭
+CATEGORY_PATTERNS = {
+    'hotfix': [
+        r'\bhot\s?fix(?:es|ed)?\b', r'\bbug\s?fix(?:es)?\b', r'\bfix(?:es|ed)?\b', r'\bcrash(?:es)?\b',
+        '핫픽스', '버그', '수정',
+    ],
+    'balance': [
+        r'\bbalanc(?:e|es|ed|ing)\b', r'\bnerf(?:s|ed)?\b', r'\bbuff(?:s|ed)?\b',
+        '밸런스', '너프', '버프',
+    ],
+    'content_update': [
+        r'\bupdate[sd]?\b', r'\bnew (?:maps?|heroes|hero|characters?|modes?|items?|weapons?)\b',
+        r'\bseason\s?\d+\b', '업데이트', '신규', '시즌',
+    ],
+    'patch': [
+        r'\bpatch(?:es|ed)?\b', r'\bpatch notes?\b', r'\bchangelog\b', r'\brelease notes?\b',
+        r'\bversion\s?\d', r'\bv\.?\s?\d+(?:\.\d+)*\b', '패치',
+    ],
+}
+
+TITLE_WEIGHT = 3.0
+BODY_WEIGHT = 1.0
+# 본문이 길수록 키워드가 우연히 반복되므로 본문 점수는 상한을 둠
+BODY_HIT_CAP = 5
+DEFAULT_THRESHOLD = 2.0
+
+
+def classifier_version(patterns, threshold):
+    """키워드, 가중치, 기준 점수가 같으면 같은 값이 되는 분류기 버전 문자열"""
+    config = [patterns, threshold, TITLE_WEIGHT, BODY_WEIGHT, BODY_HIT_CAP]
+    return hashlib.blake2b(json.dumps(config, sort_keys=True).encode('utf-8'), digest_size=6).hexdigest()
+
+
+def _compile(patterns):
+    groups = [f"(?P<{category}>{'|'.join(keywords)})" for category, keywords in patterns.items()]
+    return re.compile('|'.join(groups), re.IGNORECASE)
+
+
+class PatchClassifier:
+    """
+    뉴스 항목이 패치노트인지 점수로 판별하는 분류기
+
+    모든 키워드를 하나의 정규식(카테고리별 named group)으로 컴파일하여 텍스트를 한 번만 스캔하고,
+    제목 매칭은 본문 매칭보다 높은 가중치를 받음
+
+    version은 키워드/가중치/기준 점수로 만든 값으로, 저장된 분류 결과가 다른 버전이면
+    다시 분류해야 함 (PatchNoteAnalyzer.reclassify_items)
+    """
+
+    def __init__(self, patterns=None, threshold=DEFAULT_THRESHOLD):
+        """
+        Parameters:
+        - patterns: {카테고리: [정규식 키워드]} - 기본값 CATEGORY_PATTERNS
+        - threshold: 이 점수 이상이면 패치노트로 판정
+        """
+        self.patterns = patterns or CATEGORY_PATTERNS
+        self.categories = list(self.patterns)
+        self.threshold = threshold
+        self.regex = _compile(self.patterns)
+        self.version = classifier_version(self.patterns, threshold)
+
+    def _count(self, text):
+        counts = dict.fromkeys(self.categories, 0)
+        for match in self.regex.finditer(text or ''):
+            counts[match.lastgroup] += 1
+        return counts
+
+    def _result(self, title_counts, body_counts):
+        title_hits = sum(title_counts.values())
+        body_hits = sum(body_counts.values())
+        score = TITLE_WEIGHT * title_hits + BODY_WEIGHT * min(body_hits, BODY_HIT_CAP)
+        categories = [c for c in self.categories if title_counts[c] or body_counts[c]]
+        return {
+            'score': score,
+            'categories': categories,
+            'is_patch_note': score >= self.threshold,
+        }
+
+    def classify(self, title, contents):
+        """
+        뉴스 항목 하나를 분류
+
+        Returns:
+        - {'score': 점수, 'categories': 매칭된 카테고리 리스트, 'is_patch_note': 판정 결과}
+        """
+        return self._result(self._count(title), self._count(contents))
+
+    def _count_series(self, texts):
+        """pandas 문자열 연산으로 텍스트 시리즈 전체의 카테고리별 매칭 수 계산"""
+        import pandas as pd
+        texts = pd.Series(texts, dtype='object').fillna('').astype(str).reset_index(drop=True)
+        matches = texts.str.extractall(self.regex)
+        counts = matches.notna().groupby(level=0).sum() if len(matches) else pd.DataFrame()
+        return counts.reindex(index=range(len(texts)), columns=self.categories, fill_value=0).fillna(0).astype(int)
+
+    @instrumented
+    def classify_many(self, titles, contents):
+        """
+        피드 전체를 한 번에 분류 (벡터화 배치 모드)
+
+        Returns:
+        - 각 항목의 분류 결과 리스트 (classify와 같은 형식)
+        """
+        title_counts = self._count_series(titles)
+        body_counts = self._count_series(contents)
+
+        title_hits = title_counts.sum(axis=1)
+        body_hits = body_counts.sum(axis=1).clip(upper=BODY_HIT_CAP)
+        scores = (TITLE_WEIGHT * title_hits + BODY_WEIGHT * body_hits).to_numpy()
+        matched = ((title_counts + body_counts) > 0).to_numpy()
+
+        return [
+            {
+                'score': float(score),
+                'categories': [c for c, hit in zip(self.categories, row) if hit],
+                'is_patch_note': bool(score >= self.threshold),
+            }
+            for score, row in zip(scores, matched)
+        ]
@@ -1,10 +1,15 @@
-import requests
-import json
-from datetime import datetime, timedelta
-import pandas as pd
+from datetime import datetime
 import os
-from bs4 import BeautifulSoup
-import re
+
+from util.catalog import load_catalog
+from util.histogram import ReviewHistogram, get_default_repository
+from util.instrument import instrumented, returned_count
+from util.news_store import NewsStore
+from util.patch_classifier import PatchClassifier
+from util.patch_windows import DEFAULT_SWEEP_WINDOWS, compute_patch_windows, sweep_patch_windows
+from util.steam_client import get_default_client
+from util.storage import TableStore
+from util.text_clean import TextCleaner
 
 class PatchNoteAnalyzer:
     """
@@ -12,11 +17,24 @@ class PatchNoteAnalyzer:
     Steam News API를 사용하여 패치노트를 수집하고 리뷰 데이터와 연관 분석
     """
     
-    def __init__(self):
+    def __init__(self, client=None, histograms=None, news_store=None, html_parser='fast',
+                 storage_format=None, csv_export=False):
         self.base_url = "https://api.steampowered.com"
         self.store_url = "https://store.steampowered.com"
+        self.histograms = histograms or get_default_repository(client)
+        self.client = client or get_default_client()
+        self.news_store = news_store
+        self.text_cleaner = TextCleaner(parser=html_parser)
+        self.classifier = PatchClassifier()
+        self.storage_format = storage_format
+        self.csv_export = csv_export
         
-    def get_app_news(self, app_id, count=100, max_length=None):
+    def get_news_store(self, output_dir='output'):
+        """뉴스 저장소 반환 (생성 시 주입한 저장소가 없으면 output_dir 아래의 news 디렉토리)"""
+        return self.news_store or NewsStore(os.path.join(output_dir, 'news'))
+    
+    @instrumented
+    def get_app_news(self, app_id, count=100, max_length=None, enddate=None):
         """
         게임의 뉴스/패치노트 가져오기
         
@@ -24,6 +42,7 @@ class PatchNoteAnalyzer:
         - app_id: Steam 게임 ID
         - count: 가져올 뉴스 개수 (최대 100)
         - max_length: 뉴스 내용 최대 길이
+        - enddate: 이 시각(유닉스 타임스탬프) 이전의 뉴스만 가져오기 (과거 페이지 조회용)
         """
         url = f"{self.base_url}/ISteamNews/GetNewsForApp/v0002/"
         
@@ -35,188 +54,328 @@ class PatchNoteAnalyzer:
         
         if max_length:
             params['maxlength'] = max_length
+        
+        if enddate:
+            params['enddate'] = enddate
             
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_json(url, params=params, schema='news')
         except Exception as e:
             print(f"Error fetching news: {e}")
             return None
     
     def clean_html(self, html_text):
-        """HTML 태그 제거하고 순수 텍스트만 추출"""
-        if not html_text:
-            return ""
-        soup = BeautifulSoup(html_text, 'html.parser')
-        text = soup.get_text()
-        # 여러 공백을 하나로
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        """HTML/BBCode 태그 제거하고 순수 텍스트만 추출"""
+        return self.text_cleaner.clean(html_text)
+    
+    def classify_patch_note(self, title, contents):
+        """
+        패치노트 분류 (제목 매칭에 더 높은 가중치를 주는 키워드 점수)
+        
+        Returns:
+        - {'score': 점수, 'categories': ['hotfix', 'balance', 'content_update', 'patch' 중 매칭된 것],
+           'is_patch_note': 판정 결과}
+        """
+        return self.classifier.classify(title, contents)
     
     def is_patch_note(self, title, contents):
         """
         패치노트인지 판별 (제목이나 내용에 패치 관련 키워드 포함)
         """
-        patch_keywords = [
-            'patch', 'update', 'hotfix', 'fix', 'balance', 
-            '패치', '업데이트', '수정', '밸런스', '버그',
-            'version', 'v.', 'v1', 'v2', 'changelog'
-        ]
-        
-        combined_text = (title + ' ' + contents).lower()
-        return any(keyword in combined_text for keyword in patch_keywords)
+        return self.classify_patch_note(title, contents)['is_patch_note']
+    
+    def _fetch_news_pages(self, app_id, enddate=None, stop_date=None, known_gids=(), count=100):
+        """
+        enddate부터 과거 방향으로 뉴스를 페이지 단위로 가져오기
+        
+        Parameters:
+        - enddate: 시작 시점 (None이면 최신 뉴스부터)
+        - stop_date: 이 날짜보다 오래된 뉴스가 나오면 중단 (이미 동기화된 구간)
+        - known_gids: 이미 저장된 뉴스 gid (중복 제외)
+        
+        Returns:
+        - (새 뉴스 리스트, 더 이상 가져올 뉴스가 없는지 여부, 요청 성공 여부)
+        """
+        seen = set(known_gids)
+        new_items = []
+        
+        while True:
+            news_data = self.get_app_news(app_id, count=count, enddate=enddate)
+            if not news_data or 'appnews' not in news_data:
+                return new_items, False, False
+            
+            newsitems = news_data['appnews'].get('newsitems', [])
+            for item in newsitems:
+                gid = item.get('gid', '')
+                if gid in seen:
+                    continue
+                if stop_date is not None and item.get('date', 0) < stop_date:
+                    continue
+                seen.add(gid)
+                new_items.append(item)
+            
+            if len(newsitems) < count:
+                return new_items, True, True
+            
+            oldest = min(item.get('date', 0) for item in newsitems)
+            if stop_date is not None and oldest < stop_date:
+                return new_items, True, True
+            if enddate is not None and oldest >= enddate:
+                # 같은 시각의 뉴스가 한 페이지를 넘어 더 이상 진행할 수 없음
+                return new_items, True, True
+            enddate = oldest
+    
+    def _process_news_items(self, items):
+        """
+        뉴스 항목들을 저장 형식으로 변환 (모든 항목의 HTML을 정리한 뒤 피드 단위로 분류)
+        
+        패치노트가 아닌 항목도 정리된 본문을 저장하므로, 분류기가 바뀌면 저장된 이력을
+        다시 동기화하지 않고 재분류할 수 있음 (reclassify_items)
+        """
+        contents = self.text_cleaner.clean_many([item.get('contents', '') for item in items])
+        classifications = self.classifier.classify_many(
+            [item.get('title', '') for item in items], contents
+        )
+        
+        records = []
+        for item, clean_contents, result in zip(items, contents, classifications):
+            records.append({
+                'gid': item.get('gid', ''),
+                'title': item.get('title', ''),
+                'url': item.get('url', ''),
+                'author': item.get('author', ''),
+                'contents': clean_contents,
+                'contents_length': len(clean_contents),
+                'date': item.get('date', 0),
+                'feedlabel': item.get('feedlabel', ''),
+                'feed_type': item.get('feed_type', 0),
+                'is_patch_note': result['is_patch_note'],
+                'patch_score': result['score'],
+                'patch_categories': ','.join(result['categories']),
+                'classifier_version': self.classifier.version,
+            })
+        return records
+    
+    def reclassify_items(self, items):
+        """
+        현재 분류기와 버전이 다른 저장 항목을 정리된 본문으로 다시 분류 (items를 직접 수정)
+        
+        본문 없이 저장된 이전 형식의 비패치 항목은 제목만으로 분류됨
+        
+        Returns:
+        - 다시 분류한 항목 수
+        """
+        stale = [item for item in items if item.get('classifier_version') != self.classifier.version]
+        if not stale:
+            return 0
+        classifications = self.classifier.classify_many(
+            [item.get('title', '') for item in stale],
+            [item.get('contents', '') for item in stale]
+        )
+        for item, result in zip(stale, classifications):
+            item['is_patch_note'] = result['is_patch_note']
+            item['patch_score'] = result['score']
+            item['patch_categories'] = ','.join(result['categories'])
+            item['classifier_version'] = self.classifier.version
+        return len(stale)
+    
+    @instrumented(rows=returned_count)
+    def sync_news(self, app_id, output_dir='output'):
+        """
+        뉴스 증분 동기화
+        
+        1. 최신 뉴스부터 마지막 동기화 시점(high-water mark)까지 새 뉴스만 가져오기
+        2. 과거 이력을 아직 끝까지 수집하지 않았다면 enddate로 과거 페이지를 이어서 수집
+        
+        GetNewsForApp의 100개 제한을 넘는 전체 이력을 모으며, 이미 정리된 뉴스 본문은
+        저장소에서 재사용하므로 다시 파싱하지 않음
+        
+        Parameters:
+        - output_dir: 뉴스 저장소({output_dir}/news)의 기준 디렉토리 (생성 시 news_store를 주입했으면 무시)
+        
+        Returns:
+        - 이번에 새로 저장된 뉴스 수 (요청 실패 시 None)
+        """
+        news_store = self.get_news_store(output_dir)
+        state = news_store.load_state(app_id)
+        known = news_store.known_gids(app_id)
+        first_sync = state['latest_date'] is None
+        
+        # 1. 최신 구간
+        fetched, reached_end, ok = self._fetch_news_pages(
+            app_id, stop_date=state['latest_date'], known_gids=known
+        )
+        if not ok and not first_sync:
+            # 최신 구간 중간에서 실패하면 저장 구간에 공백이 생기므로 버림
+            return None
+        if first_sync:
+            state['history_complete'] = ok and reached_end
+        
+        # 2. 과거 구간 보충
+        dates = [item.get('date', 0) for item in fetched]
+        if state['oldest_date'] is not None:
+            dates.append(state['oldest_date'])
+        if ok and not state['history_complete'] and dates:
+            older, reached_end, ok = self._fetch_news_pages(
+                app_id, enddate=min(dates),
+                known_gids=known | {item.get('gid', '') for item in fetched}
+            )
+            fetched.extend(older)
+            state['history_complete'] = ok and reached_end
+        
+        records = self._process_news_items(fetched)
+        news_store.append_items(app_id, records)
+        
+        if records:
+            latest = max(records, key=lambda record: record['date'])
+            if state['latest_date'] is None or latest['date'] >= state['latest_date']:
+                state['latest_gid'] = latest['gid']
+                state['latest_date'] = latest['date']
+            oldest_date = min(record['date'] for record in records)
+            if state['oldest_date'] is None or oldest_date < state['oldest_date']:
+                state['oldest_date'] = oldest_date
+        news_store.save_state(app_id, state)
+        
+        return len(records)
     
-    def collect_patch_notes(self, app_id, game_name):
+    @instrumented
+    def collect_patch_notes(self, app_id, game_name, output_dir='output'):
         """
-        패치노트 수집 및 분석
+        패치노트 수집 및 분석 (뉴스 증분 동기화 후 저장소에서 패치노트 로드)
         """
         print(f"\n패치노트 수집 중: {game_name} (App ID: {app_id})")
         
-        news_data = self.get_app_news(app_id, count=100)
+        new_count = self.sync_news(app_id, output_dir)
+        news_store = self.get_news_store(output_dir)
+        newsitems = news_store.load_items(app_id)
         
-        if not news_data or 'appnews' not in news_data:
+        if not newsitems:
             print(f"  ❌ 뉴스 데이터를 가져올 수 없습니다.")
             return None
+        if new_count is None:
+            print(f"  ⚠️ 새 뉴스를 가져오지 못해 저장된 데이터만 사용합니다.")
         
-        newsitems = news_data['appnews'].get('newsitems', [])
+        # 분류기(키워드, 기준 점수)가 바뀌었으면 저장된 이력을 다시 분류하여 저장
+        reclassified = self.reclassify_items(newsitems)
+        if reclassified:
+            news_store.replace_items(app_id, newsitems)
+            print(f"  🔄 분류기 변경으로 저장된 뉴스 {reclassified}개를 다시 분류했습니다.")
         
         patch_notes = []
-        for item in newsitems:
-            title = item.get('title', '')
-            contents = item.get('contents', '')
+        for item in sorted(newsitems, key=lambda item: item['date'], reverse=True):
+            if not item['is_patch_note']:
+                continue
             
-            # 패치노트인지 확인
-            if self.is_patch_note(title, contents):
-                clean_contents = self.clean_html(contents)
-                
-                patch_notes.append({
-                    'gid': item.get('gid', ''),
-                    'title': title,
-                    'url': item.get('url', ''),
-                    'author': item.get('author', ''),
-                    'contents': clean_contents,
-                    'contents_length': len(clean_contents),
-                    'date': datetime.fromtimestamp(item.get('date', 0)),
-                    'feedlabel': item.get('feedlabel', ''),
-                    'feed_type': item.get('feed_type', 0)
-                })
-        
-        print(f"  ✓ 총 {len(newsitems)}개 뉴스 중 {len(patch_notes)}개 패치노트 발견")
+            patch_notes.append({
+                'gid': item['gid'],
+                'title': item['title'],
+                'url': item['url'],
+                'author': item['author'],
+                'contents': item['contents'],
+                'contents_length': item['contents_length'],
+                'date': datetime.fromtimestamp(item['date']),
+                'feedlabel': item['feedlabel'],
+                'feed_type': item['feed_type'],
+                'patch_score': item.get('patch_score'),
+                'patch_categories': item.get('patch_categories', '')
+            })
+        
+        print(f"  ✓ 총 {len(newsitems)}개 뉴스 중 {len(patch_notes)}개 패치노트 발견 (신규 뉴스 {new_count or 0}개)")
         return patch_notes
     
     def get_review_histogram(self, app_id):
-        """날짜별 리뷰 히스토그램 데이터 가져오기"""
-        url = f"{self.store_url}/appreviewhistogram/{app_id}"
+        """
+        날짜별 리뷰 히스토그램 데이터 가져오기
         
-        try:
-            response = requests.get(url, params={'l': 'english'})
-            response.raise_for_status()
-            data = response.json()
-            
-            if data and data.get('success') == 1:
-                results = data.get('results', {})
-                if isinstance(results, dict) and 'rollups' in results:
-                    rollups = results['rollups']
-                    histogram = []
-                    for rollup in rollups:
-                        if isinstance(rollup, dict):
-                            date = datetime.fromtimestamp(rollup.get('date', 0))
-                            histogram.append({
-                                'date': date,
-                                'recommendations_up': rollup.get('recommendations_up', 0),
-                                'recommendations_down': rollup.get('recommendations_down', 0)
-                            })
-                    return histogram
-            return None
-        except Exception as e:
-            print(f"Error fetching histogram: {e}")
-            return None
+        리뷰 수집 단계와 공유하는 HistogramRepository를 사용하므로 이미 수집된 게임은
+        다시 요청하지 않음 (ReviewHistogram 반환)
+        """
+        return self.histograms.get(app_id)
     
+    def _prepare_impact_inputs(self, patch_notes, review_histogram):
+        """패치 영향 분석에 필요한 히스토그램/패치 DataFrame 생성"""
+        # 리뷰 데이터를 DataFrame으로 변환
+        import pandas as pd
+        if isinstance(review_histogram, ReviewHistogram):
+            review_df = review_histogram.to_frame()
+        else:
+            review_df = pd.DataFrame(review_histogram)
+            review_df['date'] = pd.to_datetime(review_df['date'])
+        review_df['total_reviews'] = review_df['recommendations_up'] + review_df['recommendations_down']
+        review_df['positive_ratio'] = (review_df['recommendations_up'] / review_df['total_reviews'] * 100).fillna(0)
+        
+        patches = pd.DataFrame({
+            'patch_date': pd.to_datetime([patch['date'] for patch in patch_notes]),
+            'patch_title': [patch['title'] for patch in patch_notes],
+            'patch_length': [patch['contents_length'] for patch in patch_notes],
+        })
+        return review_df, patches
+    
+    @instrumented
     def analyze_patch_impact(self, patch_notes, review_histogram, window_days=7):
         """
         패치노트 발표 전후의 리뷰 변화 분석
         
         Parameters:
         - patch_notes: 패치노트 리스트
-        - review_histogram: 리뷰 히스토그램 데이터
+        - review_histogram: 리뷰 히스토그램 (ReviewHistogram 또는 딕셔너리 리스트)
         - window_days: 패치 전후 분석 기간 (일)
         """
         if not patch_notes or not review_histogram:
             return None
         
-        # 리뷰 데이터를 DataFrame으로 변환
-        review_df = pd.DataFrame(review_histogram)
-        review_df['date'] = pd.to_datetime(review_df['date'])
-        review_df['total_reviews'] = review_df['recommendations_up'] + review_df['recommendations_down']
-        review_df['positive_ratio'] = (review_df['recommendations_up'] / review_df['total_reviews'] * 100).fillna(0)
+        review_df, patches = self._prepare_impact_inputs(patch_notes, review_histogram)
         
-        analysis_results = []
+        # 모든 패치의 전후 기간을 한 번에 계산
+        analysis_df = compute_patch_windows(review_df, patches, window_days=window_days)
         
-        for patch in patch_notes:
-            patch_date = pd.to_datetime(patch['date'])
-            
-            # 패치 전후 기간 설정
-            before_start = patch_date - timedelta(days=window_days)
-            before_end = patch_date - timedelta(days=1)
-            after_start = patch_date
-            after_end = patch_date + timedelta(days=window_days)
-            
-            # 패치 전 리뷰 데이터
-            before_reviews = review_df[
-                (review_df['date'] >= before_start) & 
-                (review_df['date'] <= before_end)
-            ]
-            
-            # 패치 후 리뷰 데이터
-            after_reviews = review_df[
-                (review_df['date'] >= after_start) & 
-                (review_df['date'] <= after_end)
-            ]
-            
-            if len(before_reviews) > 0 and len(after_reviews) > 0:
-                # 지표 계산
-                before_avg_reviews = before_reviews['total_reviews'].mean()
-                after_avg_reviews = after_reviews['total_reviews'].mean()
-                before_positive_ratio = before_reviews['positive_ratio'].mean()
-                after_positive_ratio = after_reviews['positive_ratio'].mean()
-                
-                # 변화율 계산
-                review_count_change = ((after_avg_reviews - before_avg_reviews) / before_avg_reviews * 100) if before_avg_reviews > 0 else 0
-                positive_ratio_change = after_positive_ratio - before_positive_ratio
-                
-                analysis_results.append({
-                    'patch_date': patch_date,
-                    'patch_title': patch['title'],
-                    'patch_length': patch['contents_length'],
-                    'before_avg_reviews': before_avg_reviews,
-                    'after_avg_reviews': after_avg_reviews,
-                    'review_count_change_pct': review_count_change,
-                    'before_positive_ratio': before_positive_ratio,
-                    'after_positive_ratio': after_positive_ratio,
-                    'positive_ratio_change': positive_ratio_change,
-                    'user_engagement_score': after_avg_reviews / before_avg_reviews if before_avg_reviews > 0 else 1,
-                })
-        
-        return pd.DataFrame(analysis_results)
+        return analysis_df.rename(columns={
+            'review_change_pct': 'review_count_change_pct',
+            'engagement_score': 'user_engagement_score',
+        })
     
-    def save_to_csv(self, patch_notes, analysis_df, game_name, app_id, output_dir='output'):
-        """분석 결과를 CSV로 저장"""
-        os.makedirs(output_dir, exist_ok=True)
+    @instrumented
+    def analyze_patch_impact_sweep(self, patch_notes, review_histogram, windows=DEFAULT_SWEEP_WINDOWS):
+        """
+        여러 분석 기간(예: 1, 3, 7, 14, 30, 60, 90일)의 패치 영향을 한 번에 분석
+        
+        Returns:
+        - (patch_index, window_days)별 한 행씩의 long 포맷 DataFrame
+          (컬럼 이름은 analyze_patch_impact와 동일)
+        """
+        if not patch_notes or not review_histogram:
+            return None
+        
+        review_df, patches = self._prepare_impact_inputs(patch_notes, review_histogram)
+        sweep_df = sweep_patch_windows(review_df, patches, windows=windows)
+        
+        return sweep_df.rename(columns={
+            'review_change_pct': 'review_count_change_pct',
+            'engagement_score': 'user_engagement_score',
+        })
+    
+    @instrumented
+    def save_to_csv(self, patch_notes, analysis_df, game_name, app_id, output_dir='output', sweep_df=None):
+        """분석 결과를 저장 (기본 Parquet, pyarrow가 없으면 CSV)"""
+        import pandas as pd
+        store = TableStore(output_dir, format=self.storage_format, csv_export=self.csv_export)
         
         game_name_safe = game_name.replace(':', '').replace('/', '-')
         
+        # 윈도우 스윕 결과 저장
+        if sweep_df is not None and len(sweep_df) > 0:
+            sweep_file = store.save(sweep_df, f"{app_id}_{game_name_safe}_patch_impact_sweep")
+            print(f"  ✓ 기간별 패치 영향 분석 저장: {sweep_file}")
+        
         # 패치노트 원본 저장
         if patch_notes:
             patch_df = pd.DataFrame(patch_notes)
-            patch_file = os.path.join(output_dir, f"{app_id}_{game_name_safe}_patch_notes.csv")
-            patch_df.to_csv(patch_file, index=False, encoding='utf-8-sig')
+            patch_file = store.save(patch_df, f"{app_id}_{game_name_safe}_patch_notes")
             print(f"  ✓ 패치노트 저장: {patch_file}")
         
         # 분석 결과 저장
         if analysis_df is not None and len(analysis_df) > 0:
-            analysis_file = os.path.join(output_dir, f"{app_id}_{game_name_safe}_patch_impact.csv")
-            analysis_df.to_csv(analysis_file, index=False, encoding='utf-8-sig')
+            analysis_file = store.save(analysis_df, f"{app_id}_{game_name_safe}_patch_impact")
             print(f"  ✓ 패치 영향 분석 저장: {analysis_file}")
             
             return patch_file, analysis_file
@@ -229,12 +388,7 @@ def main():
     analyzer = PatchNoteAnalyzer()
     
     # 분석할 게임 목록
-    games = [
-        {'app_id': 1049590, 'name': 'Eternal Return'},
-        {'app_id': 1973530, 'name': 'Limbus Company'},
-        {'app_id': 730, 'name': 'Counter-Strike 2'},
-        {'app_id': 440, 'name': 'Team Fortress 2'},
-    ]
+    games = load_catalog()
     
     print("=" * 80)
     print("패치노트 글자 수와 유저 반응 분석 시작")
@@ -0,0 +1,150 @@
+import numpy as np
+
+from util.instrument import instrumented
+
+
+DEFAULT_SWEEP_WINDOWS = [1, 3, 7, 14, 30, 60, 90]
+
+WINDOW_COLUMNS = [
+    'before_avg_reviews', 'after_avg_reviews', 'review_change_pct',
+    'before_positive_ratio', 'after_positive_ratio', 'positive_ratio_change',
+    'engagement_score',
+]
+
+
+class PatchWindowIndex:
+    """
+    패치 전후 기간 집계를 위한 정렬된 날짜 인덱스 + 누적합
+
+    히스토그램을 한 번만 정렬하고 누적합을 만들어 두면, 어떤 기간의 평균이든
+    searchsorted로 찾은 경계 두 개의 누적합 차이로 O(log n)에 계산할 수 있음
+    """
+
+    def __init__(self, review_df):
+        """
+        Parameters:
+        - review_df: 'date', 'total_reviews', 'positive_ratio' 컬럼을 가진 히스토그램 DataFrame
+        """
+        import pandas as pd
+        dates = pd.to_datetime(review_df['date']).to_numpy(dtype='datetime64[ns]')
+        order = np.argsort(dates, kind='stable')
+        self.dates = dates[order]
+
+        total = review_df['total_reviews'].to_numpy()[order]
+        ratio = review_df['positive_ratio'].to_numpy(dtype=np.float64)[order]
+        self.total_cumsum = np.concatenate([[0], np.cumsum(total)])
+        self.ratio_cumsum = np.concatenate([[0.0], np.cumsum(ratio)])
+
+    def window_means(self, starts, ends):
+        """
+        [start, end] 기간(양 끝 포함)별 행 수와 total_reviews/positive_ratio 평균
+
+        Returns:
+        - (행 수, 평균 리뷰 수, 평균 긍정 비율) - 빈 기간의 평균은 NaN
+        """
+        lo = np.searchsorted(self.dates, starts, side='left')
+        hi = np.searchsorted(self.dates, ends, side='right')
+        count = np.maximum(hi - lo, 0)
+        lo = np.minimum(lo, hi)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_total = (self.total_cumsum[hi] - self.total_cumsum[lo]) / count
+            avg_ratio = (self.ratio_cumsum[hi] - self.ratio_cumsum[lo]) / count
+        return count, avg_total, avg_ratio
+
+    def patch_metrics(self, patch_dates, window_days):
+        """
+        모든 패치의 전후 기간 지표를 한 번에 계산
+
+        - 패치 전: [패치일 - window_days, 패치일 - 1일]
+        - 패치 후: [패치일, 패치일 + window_days]
+
+        Parameters:
+        - patch_dates: 패치 날짜 배열
+        - window_days: 분석 기간 (일) - 정수 하나 또는 patch_dates와 같은 길이의 배열
+
+        Returns:
+        - WINDOW_COLUMNS + 'has_data'(전후 기간 모두 데이터가 있는지) 컬럼의 DataFrame
+        """
+        import pandas as pd
+        patch_dates = pd.to_datetime(pd.Series(patch_dates)).to_numpy(dtype='datetime64[ns]')
+        window = np.asarray(window_days, dtype=np.int64) * np.timedelta64(1, 'D')
+        one_day = np.timedelta64(1, 'D')
+
+        n_before, before_avg, before_ratio = self.window_means(patch_dates - window, patch_dates - one_day)
+        n_after, after_avg, after_ratio = self.window_means(patch_dates, patch_dates + window)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            positive = before_avg > 0
+            review_change = np.where(positive, (after_avg - before_avg) / before_avg * 100, 0.0)
+            engagement = np.where(positive, after_avg / before_avg, 1.0)
+
+        return pd.DataFrame({
+            'before_avg_reviews': before_avg,
+            'after_avg_reviews': after_avg,
+            'review_change_pct': review_change,
+            'before_positive_ratio': before_ratio,
+            'after_positive_ratio': after_ratio,
+            'positive_ratio_change': after_ratio - before_ratio,
+            'engagement_score': engagement,
+            'has_data': (n_before > 0) & (n_after > 0),
+        })
+
+
+@instrumented
+def compute_patch_windows(review_df, patches, window_days=7):
+    """
+    패치별 전후 리뷰 변화를 벡터화된 한 번의 계산으로 분석
+
+    Parameters:
+    - review_df: 'date', 'total_reviews', 'positive_ratio' 컬럼을 가진 히스토그램 DataFrame
+    - patches: 'patch_date', 'patch_title', 'patch_length' 컬럼을 가진 DataFrame
+    - window_days: 패치 전후 분석 기간 (일)
+
+    Returns:
+    - 전후 기간 모두 데이터가 있는 패치만 담은 DataFrame
+      (patch_date, patch_title, patch_length + WINDOW_COLUMNS)
+    """
+    import pandas as pd
+    index = PatchWindowIndex(review_df)
+    patches = patches.reset_index(drop=True)
+    metrics = index.patch_metrics(patches['patch_date'], window_days)
+
+    result = pd.concat([patches, metrics], axis=1)
+    result = result[result['has_data']].drop(columns='has_data')
+    return result.reset_index(drop=True)
+
+
+@instrumented
+def sweep_patch_windows(review_df, patches, windows=DEFAULT_SWEEP_WINDOWS):
+    """
+    여러 분석 기간에 대한 패치 영향 지표를 한 번에 계산 (윈도우 스윕)
+
+    히스토그램 정렬과 누적합은 한 번만 만들고, (패치 × 기간) 조합 전체의
+    경계를 한 번의 searchsorted로 찾음
+
+    Parameters:
+    - review_df: 'date', 'total_reviews', 'positive_ratio' 컬럼을 가진 히스토그램 DataFrame
+    - patches: 'patch_date', 'patch_title', 'patch_length' 컬럼을 가진 DataFrame
+    - windows: 분석 기간 리스트 (일)
+
+    Returns:
+    - (patch_index, window_days)별 한 행씩의 long 포맷 DataFrame
+      (전후 기간 모두 데이터가 있는 조합만 포함)
+    """
+    import pandas as pd
+    index = PatchWindowIndex(review_df)
+    patches = patches.reset_index(drop=True)
+    windows = np.asarray(list(windows), dtype=np.int64)
+
+    patch_rows = np.tile(np.arange(len(patches)), len(windows))
+    window_days = np.repeat(windows, len(patches))
+    metrics = index.patch_metrics(patches['patch_date'].to_numpy()[patch_rows], window_days)
+
+    result = pd.concat([
+        pd.DataFrame({'patch_index': patch_rows, 'window_days': window_days}),
+        patches.iloc[patch_rows].reset_index(drop=True),
+        metrics,
+    ], axis=1)
+    result = result[result['has_data']].drop(columns='has_data')
+    return result.sort_values(['patch_index', 'window_days']).reset_index(drop=True)
@@ -0,0 +1,95 @@
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+
+FINGERPRINT_SUFFIX = '.fingerprint.json'
+
+_digests = {}
+_digests_lock = threading.Lock()
+
+
+def file_digest(path):
+    """
+    파일 내용의 blake2b 해시 (hex)
+
+    같은 실행 안에서는 (경로, mtime, 크기)가 같으면 다시 읽지 않음
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _digests_lock:
+        if key in _digests:
+            return _digests[key]
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    value = digest.hexdigest()
+
+    with _digests_lock:
+        _digests[key] = value
+    return value
+
+
+def code_version(module_names):
+    """차트를 그리는 모듈들의 소스 코드 해시 (코드가 바뀌면 차트를 다시 그리기 위함)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(module_names):
+        spec = importlib.util.find_spec(name)
+        digest.update(name.encode('utf-8'))
+        if spec is not None and spec.origin and os.path.exists(spec.origin):
+            digest.update(file_digest(spec.origin).encode('ascii'))
+    return digest.hexdigest()
+
+
+def compute_fingerprint(input_paths, params, module_names):
+    """
+    차트 입력의 지문 계산 (입력 데이터 해시 + 차트 파라미터 + 코드 버전)
+
+    Parameters:
+    - input_paths: 차트가 읽는 데이터 파일 경로 리스트 (없는 파일이 있으면 None 반환)
+    - params: 차트 파라미터 딕셔너리 (JSON 직렬화 가능해야 함)
+    - module_names: 차트를 그리는 모듈 이름 리스트
+
+    Returns:
+    - 지문 딕셔너리 또는 None
+    """
+    if any(path is None or not os.path.exists(path) for path in input_paths):
+        return None
+
+    import matplotlib
+
+    return {
+        'inputs': {os.path.basename(path): file_digest(path) for path in input_paths},
+        'params': json.loads(json.dumps(params, sort_keys=True, default=str)),
+        'code': code_version(module_names),
+        'matplotlib': matplotlib.__version__,
+    }
+
+
+def fingerprint_path(output_path):
+    return output_path + FINGERPRINT_SUFFIX
+
+
+def is_up_to_date(output_path, fingerprint):
+    """출력 파일이 있고 저장된 지문이 현재 지문과 같으면 True"""
+    if fingerprint is None or not os.path.exists(output_path):
+        return False
+    try:
+        with open(fingerprint_path(output_path), 'r', encoding='utf-8') as f:
+            return json.load(f) == fingerprint
+    except (OSError, ValueError):
+        return False
+
+
+def write_fingerprint(output_path, fingerprint):
+    """출력 파일 옆에 지문 저장 (임시 파일에 쓴 뒤 교체)"""
+    if fingerprint is None:
+        return
+    path = fingerprint_path(output_path)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(fingerprint, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
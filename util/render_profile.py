@@ -0,0 +1,167 @@
+import threading
+
+from util.instrument import instrumented
+
+# 모든 차트에 공통으로 적용하는 matplotlib 설정 (한글 폰트, 음수 부호)
+STYLE = {
+    'font.family': 'Malgun Gothic',
+    'axes.unicode_minus': False,
+}
+
+# 막대 수가 이 값 이상이면 dense 레이어로 보고 벡터 출력(SVG)에서 래스터화
+DENSE_BAR_THRESHOLD = 200
+
+# 레이어 래스터화가 의미 있는 벡터 출력 형식
+VECTOR_FORMATS = ('svg',)
+
+
+class RenderProfile:
+    """
+    차트 출력 설정 묶음
+
+    - dpi: 출력 해상도
+    - format: 'png', 'svg', 'webp'
+    - bbox_inches: 'tight'이면 여백을 잘라냄 (그림을 한 번 더 그리므로 느림), None이면 그대로 저장
+    - rasterize: True이면 벡터 출력(SVG)에서 막대가 많은(dense) 레이어를 래스터화 (PNG/WebP는 원래 래스터라 무시)
+    - reuse_figures: True이면 차트 종류별로 만들어 둔 figure/axes 템플릿을 초기화해서 재사용
+    """
+
+    def __init__(self, name, dpi=300, format='png', bbox_inches='tight', rasterize=False, reuse_figures=False):
+        if format not in ('png', 'svg', 'webp'):
+            raise ValueError(f"지원하지 않는 출력 형식입니다: {format}")
+        self.name = name
+        self.dpi = dpi
+        self.format = format
+        self.bbox_inches = bbox_inches
+        self.rasterize = rasterize
+        self.reuse_figures = reuse_figures
+
+    @property
+    def extension(self):
+        return '.' + self.format
+
+    @property
+    def suffix(self):
+        """출력 파일 이름 접미사 (기본 프로필은 없음, 그 외는 '_{name}') - 프로필별 차트가 서로 덮어쓰지 않도록"""
+        return '' if self.name == DEFAULT_PROFILE else f"_{self.name}"
+
+    def file_name(self, stem):
+        """차트 파일 이름 (예: '730_CS2_analysis' -> '730_CS2_analysis_draft.png')"""
+        return f"{stem}{self.suffix}{self.extension}"
+
+    def rasterize_layer(self, n_artists):
+        """막대 n_artists개로 이루어진 레이어를 래스터화할지 여부"""
+        return self.rasterize and self.format in VECTOR_FORMATS and n_artists >= DENSE_BAR_THRESHOLD
+
+    def savefig_kwargs(self):
+        return {'dpi': self.dpi, 'format': self.format, 'bbox_inches': self.bbox_inches}
+
+    def to_dict(self):
+        return {
+            'name': self.name, 'dpi': self.dpi, 'format': self.format, 'bbox_inches': self.bbox_inches,
+            'rasterize': self.rasterize, 'reuse_figures': self.reuse_figures,
+        }
+
+
+PROFILES = {
+    # 빠른 확인용 - 저해상도, 여백 자르기 생략, 템플릿 재사용
+    'draft': RenderProfile('draft', dpi=72, format='png', bbox_inches=None, reuse_figures=True),
+    # 대시보드용 - 작은 WebP 파일
+    'web': RenderProfile('web', dpi=120, format='webp', bbox_inches='tight', reuse_figures=True),
+    # 보고서/인쇄용 - 기존 출력과 동일 (300 dpi PNG)
+    'print': RenderProfile('print', dpi=300, format='png', bbox_inches='tight', reuse_figures=False),
+    # 확대용 벡터 출력 - 막대가 많은 레이어만 래스터화하여 SVG 크기를 줄임 (dpi는 래스터화된 레이어 해상도)
+    'vector': RenderProfile('vector', dpi=150, format='svg', bbox_inches='tight', rasterize=True, reuse_figures=True),
+}
+
+DEFAULT_PROFILE = 'print'
+
+
+def get_profile(profile=None):
+    """프로필 이름, RenderProfile, to_dict() 결과 중 하나를 RenderProfile로 변환 (None이면 기본 프로필)"""
+    if profile is None:
+        return PROFILES[DEFAULT_PROFILE]
+    if isinstance(profile, RenderProfile):
+        return profile
+    if isinstance(profile, dict):
+        return RenderProfile(**profile)
+    if profile not in PROFILES:
+        raise ValueError(f"알 수 없는 렌더 프로필입니다: {profile} (가능한 값: {', '.join(PROFILES)})")
+    return PROFILES[profile]
+
+
+def apply_style():
+    """
+    차트 공통 matplotlib 설정 적용
+
+    모듈 import 시점이 아니라 차트를 그리기 직전에 호출하여, 수집만 하는 실행에서는
+    matplotlib을 불러오지 않도록 함
+    """
+    import matplotlib
+    matplotlib.rcParams.update(STYLE)
+
+
+class _FigureTemplate:
+    """한 번 만든 figure와 기본 axes를 보관하고, 다음 차트를 그리기 전에 초기화"""
+
+    def __init__(self, fig, axes):
+        self.fig = fig
+        self.axes = axes
+        self.specs = [ax.get_subplotspec() for ax in axes]
+
+    def reset(self):
+        # 그리는 도중 추가된 axes(컬러바, twinx) 제거
+        for ax in list(self.fig.axes):
+            if ax not in self.axes:
+                ax.remove()
+        # 컬러바가 줄여 놓은 영역을 원래 GridSpec 위치로 되돌림
+        for ax, spec in zip(self.axes, self.specs):
+            ax.cla()
+            ax.set_axis_on()
+            ax.set_subplotspec(spec)
+
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def new_figure(key, figsize, build, profile):
+    """
+    차트용 figure와 axes 생성
+
+    profile.reuse_figures이면 key별로 한 번만 만들고 이후에는 초기화해서 재사용
+
+    Parameters:
+    - key: 템플릿 이름 (차트 종류)
+    - figsize: figure 크기
+    - build: build(fig) -> axes 리스트 (GridSpec과 subplot 구성)
+    - profile: RenderProfile
+
+    Returns:
+    - (fig, axes 리스트)
+    """
+    apply_style()
+    if not profile.reuse_figures:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=figsize)
+        return fig, build(fig)
+
+    with _templates_lock:
+        template = _templates.get((key, tuple(figsize)))
+        if template is None:
+            # 재사용 figure는 pyplot에 등록하지 않아 plt.close()의 영향을 받지 않음
+            from matplotlib.figure import Figure
+            fig = Figure(figsize=figsize)
+            template = _templates[(key, tuple(figsize))] = _FigureTemplate(fig, build(fig))
+        else:
+            template.reset()
+    return template.fig, list(template.axes)
+
+
+@instrumented
+def save_figure(fig, output_file, profile):
+    """프로필 설정으로 저장하고, 재사용하지 않는 figure는 닫음"""
+    fig.savefig(output_file, **profile.savefig_kwargs())
+    if not profile.reuse_figures:
+        import matplotlib.pyplot as plt
+        plt.close(fig)
@@ -0,0 +1,258 @@
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from util.dataset import GameDataset, patch_safe_name, safe_name
+from util.instrument import get_recorder, instrumented
+from util.render_cache import compute_fingerprint, is_up_to_date, write_fingerprint
+from util.render_profile import get_profile
+
+CHART_KINDS = ['reviews', 'patches', 'correlation']
+
+# 차트 종류별로 그림을 그리는 모듈 (공통 그리기/저장 모듈 lod, render_profile 포함) - 소스가 바뀌면 지문이 바뀌어 다시 렌더링됨
+CHART_MODULES = {
+    'reviews': ['util.viz_reviews', 'util.dataset', 'util.lod', 'util.render_profile'],
+    'patches': ['util.viz_patches', 'util.dataset', 'util.lod', 'util.render_profile'],
+    'correlation': ['util.analyzer', 'util.patch_windows', 'util.dataset', 'util.lod', 'util.render_profile'],
+    'comparison': ['util.viz_reviews', 'util.dataset', 'util.lod', 'util.render_profile'],
+}
+
+
+def _init_worker(reset_metrics=False):
+    # 워커 프로세스는 화면 없이 파일로만 저장하므로 Agg 백엔드 사용
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    if reset_metrics:
+        # fork로 복사된 부모 프로세스의 계측 기록을 비워 중복 집계를 막음
+        get_recorder().reset()
+
+
+def _render_reviews(job, output_dir, viz_dir, dataset):
+    from util.viz_reviews import visualize_game_data
+    return visualize_game_data(job['app_id'], job['name'], output_dir, viz_dir, dataset=dataset,
+                               profile=job.get('profile'))
+
+
+def _render_patches(job, output_dir, viz_dir, dataset):
+    from util.viz_patches import visualize_patch_notes
+    return visualize_patch_notes(job['app_id'], job['name'], output_dir, viz_dir, dataset=dataset,
+                                 profile=job.get('profile'))
+
+
+def _render_correlation(job, output_dir, viz_dir, dataset):
+    from util.analyzer import analyze_patch_review_correlation
+    return analyze_patch_review_correlation(job['app_id'], job['name'], output_dir, viz_dir,
+                                            window_days=job.get('window_days', 30), dataset=dataset,
+                                            profile=job.get('profile'))
+
+
+def _render_comparison(job, output_dir, viz_dir, datasets):
+    from util.viz_reviews import create_comparison_chart
+    datasets = datasets or GameDataset.from_games(job['games'], output_dir)
+    return create_comparison_chart(job['games'], output_dir, viz_dir, datasets=datasets, profile=job.get('profile'))
+
+
+RENDERERS = {
+    'reviews': _render_reviews,
+    'patches': _render_patches,
+    'correlation': _render_correlation,
+    'comparison': _render_comparison,
+}
+
+
+def chart_output_path(job, viz_dir):
+    """작업이 만드는 차트 파일 경로 (각 시각화 함수의 파일 이름 규칙과 동일, 프로필별로 이름이 다름)"""
+    kind = job['kind']
+    profile = get_profile(job.get('profile'))
+    if kind == 'comparison':
+        return os.path.join(viz_dir, profile.file_name('all_games_comparison'))
+    if kind == 'reviews':
+        return os.path.join(viz_dir, profile.file_name(f"{job['app_id']}_{safe_name(job['name'])}_analysis"))
+    suffix = 'patch_analysis' if kind == 'patches' else 'correlation'
+    return os.path.join(viz_dir, profile.file_name(f"{job['app_id']}_{patch_safe_name(job['name'])}_{suffix}"))
+
+
+def chart_input_paths(job, output_dir):
+    """작업이 읽는 데이터 파일 경로 리스트 (없는 파일은 None)"""
+    if job['kind'] == 'comparison':
+        datasets = GameDataset.from_games(job['games'], output_dir)
+        return [dataset.store.find(dataset.histogram_stem)[0] for dataset in datasets
+                if dataset.has_histogram]
+
+    dataset = GameDataset(job['app_id'], job['name'], output_dir)
+    paths = [dataset.store.find(dataset.histogram_stem)[0]]
+    if job['kind'] in ('patches', 'correlation'):
+        paths.append(dataset.store.find(dataset.patch_stem)[0])
+    return paths
+
+
+def job_fingerprint(job, output_dir):
+    """작업의 입력 데이터 해시 + 파라미터 + 코드 버전 지문 (입력 파일이 없으면 None)"""
+    return compute_fingerprint(chart_input_paths(job, output_dir), job, CHART_MODULES[job['kind']])
+
+
+def _empty_result(job):
+    return {
+        'kind': job['kind'],
+        'app_id': job.get('app_id'),
+        'game_name': job.get('name'),
+        'ok': False,
+        'skipped': False,
+        'output': None,
+        'error': None,
+        'elapsed': 0.0,
+    }
+
+
+def _run_job(job, output_dir, viz_dir, dataset=None, collect_metrics=False):
+    """
+    렌더링 작업 하나를 실행하고 결과를 딕셔너리로 반환 (예외를 밖으로 던지지 않음)
+
+    워커 프로세스에서 실행되므로 모듈 최상위 함수여야 함.
+    collect_metrics=True이면 워커에서 기록된 함수별 계측 결과를 result['metrics']로 함께 반환
+    """
+    result = _empty_result(job)
+    start = time.perf_counter()
+    try:
+        if dataset is None and 'app_id' in job:
+            dataset = GameDataset(job['app_id'], job['name'], output_dir)
+        value = RENDERERS[job['kind']](job, output_dir, viz_dir, dataset)
+        if value is None:
+            result['error'] = '입력 데이터가 없거나 분석할 데이터가 부족합니다.'
+        else:
+            result['ok'] = True
+            result['output'] = value if isinstance(value, str) else chart_output_path(job, viz_dir)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        result['traceback'] = traceback.format_exc()
+    finally:
+        import matplotlib.pyplot as plt
+        plt.close('all')
+    result['elapsed'] = time.perf_counter() - start
+    if collect_metrics:
+        result['metrics'] = get_recorder().take_functions()
+    return result
+
+
+def build_render_jobs(games, kinds=CHART_KINDS, comparison=True, window_days=30, profile=None):
+    """
+    (게임, 차트 종류)별 렌더링 작업 목록 생성
+
+    Parameters:
+    - games: [{'app_id': ..., 'name': ...}] 형식의 게임 목록
+    - kinds: 게임별로 만들 차트 종류 ('reviews', 'patches', 'correlation')
+    - comparison: True이면 게임 비교 차트 작업도 추가
+    - window_days: 상관관계 분석의 패치 전후 분석 기간 (일)
+    - profile: 렌더 프로필 ('draft', 'web', 'print' 또는 RenderProfile, None이면 'print')
+    """
+    # 작업은 워커 프로세스로 전달되고 지문에도 들어가므로 프로필은 딕셔너리로 저장
+    profile = get_profile(profile).to_dict()
+    jobs = [
+        {'kind': kind, 'app_id': game['app_id'], 'name': game['name'], 'window_days': window_days,
+         'profile': profile}
+        for kind in kinds
+        for game in games
+    ]
+    if comparison:
+        jobs.append({'kind': 'comparison', 'games': list(games), 'profile': profile})
+    return jobs
+
+
+class RenderScheduler:
+    """
+    차트 렌더링 작업을 프로세스 풀에서 병렬 실행하는 스케줄러
+
+    matplotlib 렌더링은 GIL을 잡고 있는 CPU 작업이므로 스레드가 아닌 프로세스로 나누며,
+    각 워커는 Agg 백엔드를 사용. 작업별 성공/실패를 결과로 모아 반환함
+    """
+
+    def __init__(self, max_workers=None, output_dir='output', viz_dir='visualizations', force=False):
+        """
+        Parameters:
+        - max_workers: 워커 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스에서 순차 실행)
+        - output_dir: 수집 데이터 디렉토리
+        - viz_dir: 차트 저장 디렉토리
+        - force: True이면 입력이 바뀌지 않은 차트도 다시 렌더링
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.output_dir = output_dir
+        self.viz_dir = viz_dir
+        self.force = force
+
+    @staticmethod
+    def _shared_dataset(job, datasets):
+        if job['kind'] == 'comparison':
+            shared = [datasets.get(game['app_id']) for game in job['games']]
+            return shared if all(shared) else None
+        return datasets.get(job.get('app_id'))
+
+    @instrumented
+    def run(self, jobs, datasets=None):
+        """
+        작업 목록을 실행
+
+        Parameters:
+        - jobs: build_render_jobs()가 만든 작업 리스트
+        - datasets: {app_id: GameDataset} - 순차 실행일 때만 사용 (프로세스 간에는 전달하지 않음)
+
+        입력 데이터, 파라미터, 코드의 지문이 지난 렌더링 때와 같은 차트는 건너뜀 (skipped=True)
+
+        Returns:
+        - 작업 순서대로 정렬된 결과 딕셔너리 리스트
+          (kind, app_id, game_name, ok, skipped, output, error, elapsed)
+        """
+        os.makedirs(self.viz_dir, exist_ok=True)
+        datasets = datasets or {}
+
+        results = [None] * len(jobs)
+        fingerprints = [None] * len(jobs)
+        pending = []
+        for i, job in enumerate(jobs):
+            fingerprints[i] = job_fingerprint(job, self.output_dir)
+            output_path = chart_output_path(job, self.viz_dir)
+            if not self.force and is_up_to_date(output_path, fingerprints[i]):
+                results[i] = dict(_empty_result(job), ok=True, skipped=True, output=output_path)
+            else:
+                pending.append(i)
+
+        if self.max_workers <= 1 or len(pending) <= 1:
+            if pending:
+                _init_worker()
+            for i in pending:
+                results[i] = _run_job(jobs[i], self.output_dir, self.viz_dir,
+                                      self._shared_dataset(jobs[i], datasets))
+        else:
+            recorder = get_recorder()
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(pending)),
+                                     initializer=_init_worker, initargs=(True,)) as pool:
+                futures = {
+                    pool.submit(_run_job, jobs[i], self.output_dir, self.viz_dir, collect_metrics=True): i
+                    for i in pending
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        results[i] = future.result()
+                        recorder.merge_functions(results[i].pop('metrics', None))
+                    except Exception as e:
+                        # 워커 프로세스가 비정상 종료된 경우 등
+                        results[i] = dict(_empty_result(jobs[i]), error=f"{type(e).__name__}: {e}")
+
+        for i in pending:
+            if results[i]['ok'] and results[i]['output']:
+                write_fingerprint(results[i]['output'], fingerprints[i])
+        return results
+
+
+def render_charts(games, max_workers=None, output_dir='output', viz_dir='visualizations', kinds=CHART_KINDS,
+                  comparison=True, window_days=30, datasets=None, force=False, profile=None):
+    """
+    게임 목록의 모든 차트를 병렬 렌더링 (입력이 바뀌지 않은 차트는 건너뜀)
+
+    Returns:
+    - 작업별 결과 딕셔너리 리스트
+    """
+    jobs = build_render_jobs(games, kinds=kinds, comparison=comparison, window_days=window_days, profile=profile)
+    scheduler = RenderScheduler(max_workers=max_workers, output_dir=output_dir, viz_dir=viz_dir, force=force)
+    return scheduler.run(jobs, datasets=datasets)
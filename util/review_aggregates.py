@@ -0,0 +1,376 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from util.instrument import instrumented
+from util.review_store import ReviewStore
+
+# PeriodCounts 구간 단위 -> numpy datetime64 단위
+PERIODS = {'H': 'h', 'D': 'D', 'M': 'M'}
+
+# 리뷰 길이(글자 수) 분포 구간 경계
+LENGTH_EDGES = [1, 50, 100, 250, 500, 1000, 2000, 4000, 8000]
+
+# 청크당 기본 행 수 (리뷰 컬럼 4~5개 기준 수 MB)
+CHUNK_ROWS = 65536
+
+
+def _merge_sparse(keys, values, other_keys, other_values):
+    """(정렬된 키, 키별 값 배열) 두 쌍을 키 기준으로 합산"""
+    if len(other_keys) == 0:
+        return keys, values
+    if len(keys) == 0:
+        return other_keys, other_values
+    merged_keys, inverse = np.unique(np.concatenate([keys, other_keys]), return_inverse=True)
+    merged_values = np.zeros((len(merged_keys),) + values.shape[1:], dtype=values.dtype)
+    np.add.at(merged_values, inverse, np.concatenate([values, other_values]))
+    return merged_keys, merged_values
+
+
+def _check_mergeable(operator, other, *attributes):
+    if type(operator) is not type(other) or any(getattr(operator, name) != getattr(other, name)
+                                                for name in attributes):
+        raise ValueError(f"설정이 다른 집계는 합칠 수 없습니다: {operator!r}, {other!r}")
+
+
+class PeriodCounts:
+    """
+    구간(시간/일/월)별 전체/긍정/부정 리뷰 수
+
+    구간 수만큼의 키/카운트 배열만 유지하므로 리뷰 수와 무관하게 메모리가 일정함
+    """
+
+    columns = ['timestamp_created', 'voted_up']
+
+    def __init__(self, freq='D', utc_offset=0):
+        """
+        Parameters:
+        - freq: 'H'(시간), 'D'(일), 'M'(월)
+        - utc_offset: 구간 경계 기준 시간대 (UTC 기준 시간)
+        """
+        if freq not in PERIODS:
+            raise ValueError(f"지원하지 않는 구간 단위입니다: {freq} (가능한 값: {', '.join(PERIODS)})")
+        self.freq = freq
+        self.utc_offset = utc_offset
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros((0, 2), dtype=np.int64)  # [전체, 긍정]
+
+    def __repr__(self):
+        return f"PeriodCounts(freq={self.freq!r}, utc_offset={self.utc_offset})"
+
+    def _periods(self, timestamps):
+        seconds = timestamps + int(self.utc_offset * 3600)
+        return seconds.astype('datetime64[s]').astype(f"datetime64[{PERIODS[self.freq]}]").astype(np.int64)
+
+    def update(self, chunk):
+        periods = self._periods(chunk['timestamp_created'].to_numpy(dtype=np.int64))
+        up = chunk['voted_up'].fillna(False).to_numpy(dtype=np.bool_)
+        keys, inverse = np.unique(periods, return_inverse=True)
+        counts = np.stack([np.bincount(inverse, minlength=len(keys)),
+                           np.bincount(inverse[up], minlength=len(keys))], axis=1)
+        self.keys, self.counts = _merge_sparse(self.keys, self.counts, keys, counts)
+
+    def merge(self, other):
+        _check_mergeable(self, other, 'freq', 'utc_offset')
+        self.keys, self.counts = _merge_sparse(self.keys, self.counts, other.keys, other.counts)
+        return self
+
+    def result(self):
+        """date(구간 시작), total, positive, negative, positive_ratio DataFrame (리뷰가 있는 구간만)"""
+        total, positive = self.counts[:, 0], self.counts[:, 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(total > 0, positive / total * 100, np.nan)
+        return pd.DataFrame({
+            'date': pd.to_datetime(self.keys.astype(f"datetime64[{PERIODS[self.freq]}]")),
+            'total': total,
+            'positive': positive,
+            'negative': total - positive,
+            'positive_ratio': ratio,
+        })
+
+
+class ColumnMean:
+    """
+    숫자 컬럼의 평균/표준편차 (전체, 긍정 리뷰, 부정 리뷰)
+
+    그룹별 (개수, 평균, 편차 제곱합 M2)를 유지하고, 청크나 다른 집계와 합칠 때는 Chan의 병렬 공식으로
+    합침. 제곱합에서 평균 제곱을 빼는 방식(E[x²] - mean²)과 달리 값이 크고 분산이 작아도 정밀도를 잃지 않음
+    """
+
+    def __init__(self, column='playtime_at_review'):
+        self.column = column
+        self.columns = [column, 'voted_up']
+        self.moments = np.zeros((2, 3), dtype=np.float64)  # [부정, 긍정] x [개수, 평균, M2]
+
+    def __repr__(self):
+        return f"ColumnMean(column={self.column!r})"
+
+    @staticmethod
+    def _combine(left, right):
+        """그룹별 (개수, 평균, M2) 두 묶음을 합침 (Chan et al.)"""
+        count_a, mean_a, m2_a = left.T
+        count_b, mean_b, m2_b = right.T
+        count = count_a + count_b
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = np.where(count > 0, count_b / count, 0.0)
+        delta = mean_b - mean_a
+        mean = mean_a + delta * share
+        m2 = m2_a + m2_b + delta * delta * count_a * share
+        return np.stack([count, mean, m2], axis=1)
+
+    def update(self, chunk):
+        values = pd.to_numeric(chunk[self.column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        up = chunk['voted_up'].fillna(False).to_numpy(dtype=np.bool_)
+        valid = ~np.isnan(values)
+        values, group = values[valid], up[valid].astype(np.int64)
+
+        # 청크 안에서는 그룹 평균을 먼저 구한 뒤 평균과의 편차로 M2 계산 (두 번 훑기)
+        # 합계의 반올림 오차를 줄이기 위해 첫 값만큼 이동한 값으로 평균을 구함
+        shift = values[0] if len(values) else 0.0
+        shifted = values - shift
+        count = np.bincount(group, minlength=2).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            offset = np.where(count > 0, np.bincount(group, weights=shifted, minlength=2) / count, 0.0)
+        deviation = shifted - offset[group]
+        mean = np.where(count > 0, shift + offset, 0.0)
+        m2 = np.bincount(group, weights=deviation * deviation, minlength=2)
+        self.moments = self._combine(self.moments, np.stack([count, mean, m2], axis=1))
+
+    def merge(self, other):
+        _check_mergeable(self, other, 'column')
+        self.moments = self._combine(self.moments, other.moments)
+        return self
+
+    @staticmethod
+    def _stats(count, mean, m2):
+        if count == 0:
+            return {'count': 0, 'mean': None, 'std': None}
+        return {'count': int(count), 'mean': float(mean), 'std': math.sqrt(max(m2 / count, 0.0))}
+
+    def result(self):
+        """{'all': ..., 'positive': ..., 'negative': ...} 각각 {'count', 'mean', 'std'}"""
+        negative, positive = self.moments
+        return {
+            'all': self._stats(*self._combine(negative[None], positive[None])[0]),
+            'positive': self._stats(*positive),
+            'negative': self._stats(*negative),
+        }
+
+
+class QuantileSketch:
+    """
+    합칠 수 있는 분위수 스케치 (DDSketch 방식)
+
+    값을 상대 오차 relative_accuracy 이내의 로그 구간에 세어 두므로, 청크나 프로세스별
+    스케치를 구간별 카운트 합으로 정확히 합칠 수 있음. 저장하는 구간 수는 값의 범위(로그 스케일)에만
+    비례하고 리뷰 수와는 무관함. 절댓값이 min_value보다 작은 값은 0으로 셈
+    """
+
+    def __init__(self, column='weighted_vote_score', relative_accuracy=0.01, min_value=1e-9):
+        self.column = column
+        self.columns = [column]
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.count = 0
+        self.zero_count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.positive_keys = np.zeros(0, dtype=np.int64)
+        self.positive_counts = np.zeros(0, dtype=np.int64)
+        self.negative_keys = np.zeros(0, dtype=np.int64)
+        self.negative_counts = np.zeros(0, dtype=np.int64)
+
+    def __repr__(self):
+        return f"QuantileSketch(column={self.column!r}, relative_accuracy={self.relative_accuracy})"
+
+    def _add(self, values, keys, counts):
+        if len(values) == 0:
+            return keys, counts
+        new_keys, new_counts = np.unique(np.ceil(np.log(values) / self._log_gamma).astype(np.int64),
+                                         return_counts=True)
+        return _merge_sparse(keys, counts, new_keys, new_counts)
+
+    def update(self, chunk):
+        values = pd.to_numeric(chunk[self.column], errors='coerce').to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.zero_count += int(np.count_nonzero(np.abs(values) < self.min_value))
+        self.positive_keys, self.positive_counts = self._add(
+            values[values >= self.min_value], self.positive_keys, self.positive_counts)
+        self.negative_keys, self.negative_counts = self._add(
+            -values[values <= -self.min_value], self.negative_keys, self.negative_counts)
+
+    def merge(self, other):
+        _check_mergeable(self, other, 'column', 'relative_accuracy', 'min_value')
+        self.count += other.count
+        self.zero_count += other.zero_count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.positive_keys, self.positive_counts = _merge_sparse(
+            self.positive_keys, self.positive_counts, other.positive_keys, other.positive_counts)
+        self.negative_keys, self.negative_counts = _merge_sparse(
+            self.negative_keys, self.negative_counts, other.negative_keys, other.negative_counts)
+        return self
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        """q(0~1) 분위수 추정값 (값이 없으면 None)"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        # 작은 값부터: 음수(절댓값 큰 순), 0, 양수
+        values = np.concatenate([-self._value(self.negative_keys[::-1]), [0.0],
+                                 self._value(self.positive_keys)])
+        counts = np.concatenate([self.negative_counts[::-1], [self.zero_count], self.positive_counts])
+        index = int(np.searchsorted(np.cumsum(counts), rank, side='right'))
+        return float(np.clip(values[min(index, len(values) - 1)], self.min, self.max))
+
+    def result(self, quantiles=(0.1, 0.25, 0.5, 0.75, 0.9, 0.99)):
+        """{'count', 'min', 'max', 'quantiles': {q: 값}}"""
+        return {
+            'count': self.count,
+            'min': float(self.min) if self.count else None,
+            'max': float(self.max) if self.count else None,
+            'quantiles': {q: self.quantile(q) for q in quantiles},
+        }
+
+
+class Histogram:
+    """
+    고정 구간 경계로 나눈 숫자 컬럼 분포 (예: 리뷰 길이)
+
+    구간은 [-inf, edges[0]), [edges[0], edges[1]), ..., [edges[-1], inf)
+    """
+
+    def __init__(self, column='review_length', edges=LENGTH_EDGES):
+        self.column = column
+        self.columns = [column]
+        self.edges = list(edges)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+
+    def __repr__(self):
+        return f"Histogram(column={self.column!r}, edges={self.edges})"
+
+    def update(self, chunk):
+        values = pd.to_numeric(chunk[self.column], errors='coerce').to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.counts += np.bincount(np.searchsorted(self.edges, values, side='right'), minlength=len(self.counts))
+
+    def merge(self, other):
+        _check_mergeable(self, other, 'column', 'edges')
+        self.counts += other.counts
+        return self
+
+    def result(self):
+        """bin(구간 이름), lower, upper, count, share(%) DataFrame"""
+        lower = [-math.inf] + self.edges
+        upper = self.edges + [math.inf]
+        labels = [f"< {self.edges[0]:g}"]
+        labels += [f"{low:g}-{high:g}" for low, high in zip(self.edges[:-1], self.edges[1:])]
+        labels.append(f">= {self.edges[-1]:g}")
+        total = self.counts.sum()
+        return pd.DataFrame({
+            'bin': labels,
+            'lower': lower,
+            'upper': upper,
+            'count': self.counts,
+            'share': self.counts / total * 100 if total else np.zeros(len(self.counts)),
+        })
+
+
+def default_operators(freq='D', utc_offset=0):
+    """기본 집계 묶음 (구간별 리뷰 수, 평균 플레이타임, 유용성 점수 분위수, 리뷰 길이 분포)"""
+    return {
+        'counts': PeriodCounts(freq, utc_offset),
+        'playtime_at_review': ColumnMean('playtime_at_review'),
+        'weighted_vote_score': QuantileSketch('weighted_vote_score'),
+        'review_length': Histogram('review_length', LENGTH_EDGES),
+    }
+
+
+def _required_columns(operators):
+    return list(dict.fromkeys(column for operator in operators.values() for column in operator.columns))
+
+
+def aggregate_chunks(chunks, operators=None):
+    """
+    DataFrame 청크들을 차례로 집계 (청크는 집계 후 바로 버려지므로 메모리는 청크 하나 크기)
+
+    Parameters:
+    - chunks: 리뷰 DataFrame 청크 iterable (ReviewStore.iter_chunks(), iter_csv_chunks() 등)
+    - operators: {이름: 집계} 딕셔너리 (None이면 default_operators())
+
+    Returns:
+    - 채워진 operators 딕셔너리 (각 집계의 result()로 결과 확인)
+    """
+    operators = default_operators() if operators is None else operators
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        for operator in operators.values():
+            operator.update(chunk)
+    return operators
+
+
+def _aggregate_months(root, format, app_id, months, operators, chunk_rows):
+    """프로세스 풀 작업: 일부 월 파티션을 집계한 부분 결과 반환"""
+    store = ReviewStore(root, format=format)
+    chunks = store.iter_chunks(app_id, columns=_required_columns(operators), chunk_rows=chunk_rows, months=months)
+    return aggregate_chunks(chunks, operators)
+
+
+@instrumented
+def aggregate_store(review_store, app_id, operators=None, chunk_rows=CHUNK_ROWS, workers=1):
+    """
+    리뷰 저장소의 한 게임 리뷰 전체를 청크 단위로 집계 (전체를 한 번에 읽지 않음)
+
+    Parameters:
+    - review_store: ReviewStore
+    - app_id: Steam 게임 ID
+    - operators: {이름: 집계} 딕셔너리 (None이면 default_operators())
+    - chunk_rows: 청크당 최대 행 수
+    - workers: 2 이상이면 월 파티션을 나누어 프로세스 풀에서 집계한 뒤 부분 결과를 합침
+      (메모리 사용량은 워커 수 x 청크 크기)
+
+    Returns:
+    - 채워진 operators 딕셔너리
+    """
+    operators = default_operators() if operators is None else operators
+    columns = _required_columns(operators)
+    months = review_store.months(app_id)
+    workers = min(workers or os.cpu_count() or 1, len(months))
+
+    if workers <= 1:
+        chunks = review_store.iter_chunks(app_id, columns=columns, chunk_rows=chunk_rows)
+        return aggregate_chunks(chunks, operators)
+
+    # 빈 집계를 워커마다 복사해 채운 뒤 부분 결과를 원래 집계에 합침
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_aggregate_months, review_store.root, review_store.backend.name, app_id,
+                                   months[i::workers], operators, chunk_rows)
+                   for i in range(workers)]
+        for future in futures:
+            for name, partial in future.result().items():
+                operators[name].merge(partial)
+    return operators
+
+
+def iter_csv_chunks(path, columns=None, chunk_rows=CHUNK_ROWS):
+    """
+    리뷰 저장소 이전에 내보낸 {app_id}_{game_name}_reviews.csv 파일을 chunk_rows행씩 읽는 제너레이터
+
+    aggregate_chunks(iter_csv_chunks(path, columns=...))처럼 사용하며, 파일 전체를 읽지 않음
+    """
+    yield from pd.read_csv(path, usecols=columns, encoding='utf-8-sig', chunksize=chunk_rows)
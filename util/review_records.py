@@ -0,0 +1,170 @@
+import numpy as np
+
+# 리뷰 한 건의 컬럼과 고정 dtype (리뷰당 61바이트)
+REVIEW_FIELDS = [
+    ('recommendationid', np.int64),
+    ('voted_up', np.bool_),
+    ('votes_up', np.int32),
+    ('votes_funny', np.int32),
+    ('weighted_vote_score', np.float32),
+    ('comment_count', np.int32),
+    ('timestamp_created', np.int64),
+    ('timestamp_updated', np.int64),
+    ('review_length', np.int32),
+    ('playtime_forever', np.int32),
+    ('playtime_at_review', np.int32),
+    ('num_games_owned', np.int32),
+    ('num_reviews', np.int32),
+]
+
+REVIEW_COLUMNS = [name for name, _ in REVIEW_FIELDS]
+
+# 리뷰 크롤링 시 저장소에 한 번에 기록하는 리뷰 수
+REVIEW_FLUSH_ROWS = 50_000
+
+_AUTHOR_FIELDS = {'playtime_forever', 'playtime_at_review', 'num_games_owned', 'num_reviews'}
+
+# 값이 없을 수 있는 정수 필드 - 버퍼에는 MISSING으로 기록하고 to_frame()에서 NA로 바꿈
+# (0으로 채우면 평균/가중치가 실제 0인 값과 구분되지 않음, 음수가 될 수 없는 필드만 해당)
+NULLABLE_INT_FIELDS = {'votes_up', 'votes_funny', 'comment_count', *_AUTHOR_FIELDS}
+MISSING = -1
+
+
+def _int_or_missing(value):
+    return MISSING if value is None or value == '' else int(value)
+
+
+def _float_or_nan(value):
+    return np.nan if value is None or value == '' else float(value)
+
+
+def _field_values(reviews, name):
+    """
+    API 리뷰 항목 리스트에서 한 필드의 값을 꺼냄 (weighted_vote_score 등 문자열 숫자도 변환)
+
+    없는 값은 정수 필드는 MISSING, weighted_vote_score는 NaN, timestamp_updated는 0 (extend()에서 채움)
+    """
+    if reviews and not isinstance(reviews[0], dict):
+        return _struct_field_values(reviews, name)
+    if name == 'review_length':
+        return (len(review.get('review') or '') for review in reviews)
+    if name == 'voted_up':
+        return (bool(review.get('voted_up')) for review in reviews)
+    if name == 'weighted_vote_score':
+        return (_float_or_nan(review.get(name)) for review in reviews)
+    if name in _AUTHOR_FIELDS:
+        return (_int_or_missing((review.get('author') or {}).get(name)) for review in reviews)
+    if name in NULLABLE_INT_FIELDS:
+        return (_int_or_missing(review.get(name)) for review in reviews)
+    return (int(review.get(name) or 0) for review in reviews)
+
+
+def _struct_field_values(reviews, name):
+    """스키마 디코딩(util.json_decode.Review) 결과용 - 딕셔너리 조회 대신 속성으로 읽음"""
+    if name == 'review_length':
+        return (len(review.review or '') for review in reviews)
+    if name == 'voted_up':
+        return (bool(review.voted_up) for review in reviews)
+    if name == 'weighted_vote_score':
+        return (_float_or_nan(review.weighted_vote_score) for review in reviews)
+    if name in _AUTHOR_FIELDS:
+        return (_int_or_missing(getattr(review.author, name, None)) for review in reviews)
+    if name in NULLABLE_INT_FIELDS:
+        return (_int_or_missing(getattr(review, name)) for review in reviews)
+    return (int(getattr(review, name) or 0) for review in reviews)
+
+
+class ReviewBuffer:
+    """
+    타입이 고정된 컬럼 배열에 리뷰를 모으는 버퍼
+
+    API 리뷰 항목(딕셔너리 또는 util.json_decode의 Review)을 리뷰마다 딕셔너리로 다시 만들지 않고
+    미리 할당한 numpy 컬럼에 바로 기록하며, to_frame()은 이 배열을 복사하지 않고 DataFrame으로 감쌈.
+    컬럼별로 연속된 배열을 사용하므로 구조화 배열(행 단위)과 달리 DataFrame/Arrow 변환 시 복사가 없음
+
+    값이 없는 정수 필드는 MISSING(-1), weighted_vote_score는 NaN으로 기록하고 to_frame()에서 NA로 보이며,
+    voted_up은 False로 기록함. recommendationid 또는 timestamp_created가 없는 리뷰는 건너뜀
+    """
+
+    def __init__(self, capacity=REVIEW_FLUSH_ROWS):
+        """
+        Parameters:
+        - capacity: 처음 할당할 리뷰 수 (넘치면 두 배씩 늘림)
+        """
+        self.size = 0
+        self.columns = {name: np.empty(max(capacity, 1), dtype=dtype) for name, dtype in REVIEW_FIELDS}
+
+    @classmethod
+    def from_reviews(cls, reviews):
+        """API 리뷰 항목 리스트로 버퍼 생성"""
+        buffer = cls(capacity=len(reviews))
+        buffer.extend(reviews)
+        return buffer
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def capacity(self):
+        return len(self.columns['recommendationid'])
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
+
+    def _reserve(self, count):
+        if self.size + count <= self.capacity:
+            return
+        capacity = max(self.capacity * 2, self.size + count)
+        for name, column in self.columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+
+    def extend(self, reviews):
+        """
+        API 리뷰 항목(한 페이지) 추가
+
+        Returns:
+        - 추가된 리뷰 수
+        """
+        reviews = [review for review in reviews
+                   if review.get('recommendationid') and review.get('timestamp_created')]
+        count = len(reviews)
+        if count == 0:
+            return 0
+
+        self._reserve(count)
+        start, end = self.size, self.size + count
+        for name, column in self.columns.items():
+            column[start:end] = np.fromiter(_field_values(reviews, name), dtype=column.dtype, count=count)
+
+        # 수정되지 않은 리뷰는 timestamp_updated가 없을 수 있으므로 작성 시각으로 채움
+        updated = self.columns['timestamp_updated'][start:end]
+        missing = updated == 0
+        updated[missing] = self.columns['timestamp_created'][start:end][missing]
+
+        self.size = end
+        return count
+
+    def to_frame(self):
+        """
+        버퍼 내용을 DataFrame으로 반환 (컬럼 배열을 복사하지 않음)
+
+        값이 없을 수 있는 정수 필드는 MISSING 위치를 마스크로 하는 nullable 정수(Int32) 컬럼이 됨
+        (값 배열은 그대로 쓰고 마스크만 새로 만듦).
+        반환된 DataFrame은 버퍼 메모리를 그대로 사용하므로 clear() 후 다시 채우면 내용이 바뀜.
+        계속 보관해야 하면 .copy()를 사용
+        """
+        import pandas as pd
+        data = {}
+        for name, column in self.columns.items():
+            values = column[:self.size]
+            if name in NULLABLE_INT_FIELDS:
+                values = pd.arrays.IntegerArray(values, values == MISSING)
+            data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+    def clear(self):
+        """배열은 그대로 두고 크기만 0으로 (다음 청크에서 재사용)"""
+        self.size = 0
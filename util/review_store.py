@@ -0,0 +1,304 @@
+import os
+import shutil
+import time
+import uuid
+from datetime import date, datetime
+
+import numpy as np
+
+from util.instrument import instrumented, returned_count
+from util.storage import BACKENDS, resolve_format
+
+
+NUMERIC_COLUMNS = [
+    'recommendationid', 'votes_up', 'votes_funny', 'weighted_vote_score', 'comment_count',
+    'timestamp_created', 'timestamp_updated', 'review_length', 'playtime_forever',
+    'playtime_at_review', 'num_games_owned', 'num_reviews',
+]
+
+
+def _is_date_only(value):
+    """시각 없이 날짜만 지정한 값인지 ('2024-03-31', date 객체)"""
+    import pandas as pd
+    if isinstance(value, str):
+        return ':' not in value and pd.Timestamp(value) == pd.Timestamp(value).normalize()
+    return isinstance(value, date) and not isinstance(value, datetime)
+
+
+class ReviewStore:
+    """
+    게임별 append-only 리뷰 저장소
+
+    {root}/app_id={app_id}/month={YYYY-MM}/part-*.{확장자} 형태로
+    timestamp_created의 월 단위로 파티션을 나누어 저장
+
+    - recommendationid 기준 중복 제거 (timestamp_updated가 가장 큰 버전 유지)
+    - 새로 수집한 리뷰 중 신규/수정된 리뷰(delta)만 새 part 파일로 추가
+    - compact()로 파티션의 part 파일들을 하나로 병합
+    """
+
+    def __init__(self, root=os.path.join('output', 'reviews'), format=None):
+        """
+        Parameters:
+        - root: 저장소 루트 디렉토리
+        - format: 'auto', 'parquet', 'feather', 'csv' (None이면 기본 형식)
+        """
+        self.root = root
+        self.backend = BACKENDS[resolve_format(format)]()
+
+    def _app_dir(self, app_id):
+        return os.path.join(self.root, f"app_id={app_id}")
+
+    def _partition_dir(self, app_id, month):
+        return os.path.join(self._app_dir(app_id), f"month={month}")
+
+    def _parts(self, app_id, month):
+        partition_dir = self._partition_dir(app_id, month)
+        if not os.path.isdir(partition_dir):
+            return []
+        return sorted(
+            os.path.join(partition_dir, name) for name in os.listdir(partition_dir)
+            if name.startswith('part-') and name.endswith(self.backend.extension)
+        )
+
+    def months(self, app_id):
+        """저장된 월 파티션 목록 (오름차순)"""
+        app_dir = self._app_dir(app_id)
+        if not os.path.isdir(app_dir):
+            return []
+        return sorted(name[len('month='):] for name in os.listdir(app_dir) if name.startswith('month='))
+
+    def part_files(self, app_id):
+        """게임의 모든 part 파일 경로 (월 오름차순, 월 안에서는 기록 순서)"""
+        return [path for month in self.months(app_id) for path in self._parts(app_id, month)]
+
+    def read_part(self, path, columns=None):
+        """
+        part 파일 하나를 그대로 읽음 (다른 part와의 중복 제거 없음)
+
+        part 파일은 기록 후 바뀌지 않으므로, 이미 처리한 part를 기억해 두면
+        새로 추가된 part만 읽어 증분 처리할 수 있음 (util.sentiment_timeline 참고)
+        """
+        return self.backend.read(path, columns=columns)
+
+    def _read_parts(self, paths, columns=None):
+        import pandas as pd
+        frames = [self.backend.read(path, columns=columns) for path in paths]
+        frames = [frame for frame in frames if len(frame) > 0]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def _write_part(self, app_id, month, df):
+        partition_dir = self._partition_dir(app_id, month)
+        os.makedirs(partition_dir, exist_ok=True)
+        name = f"part-{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}{self.backend.extension}"
+        path = os.path.join(partition_dir, name)
+        # 쓰기 도중 중단되어도 불완전한 part가 읽히지 않도록 임시 파일에 쓴 뒤 이동
+        tmp_path = os.path.join(partition_dir, '.' + name)
+        self.backend.write(df, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    @staticmethod
+    def _latest(df):
+        """recommendationid별로 timestamp_updated가 가장 큰 버전만 남김"""
+        return (df.sort_values(['recommendationid', 'timestamp_updated'], kind='stable')
+                  .drop_duplicates('recommendationid', keep='last'))
+
+    @staticmethod
+    def normalize(reviews):
+        """
+        리뷰 레코드(딕셔너리 리스트 또는 DataFrame)를 타입이 고정된 DataFrame으로 변환
+
+        빈 입력은 키 컬럼만 있는 빈 DataFrame, timestamp_updated가 없거나 0이면 timestamp_created로 채움
+        """
+        import pandas as pd
+        df = pd.DataFrame(reviews).copy()
+        for column in ('recommendationid', 'timestamp_created'):
+            if column not in df.columns:
+                df[column] = pd.Series(dtype='float64')
+        for column in NUMERIC_COLUMNS:
+            if column in df.columns:
+                df[column] = pd.to_numeric(df[column], errors='coerce')
+        df = df.dropna(subset=['recommendationid', 'timestamp_created'])
+        df['recommendationid'] = df['recommendationid'].astype('int64')
+        df['timestamp_created'] = df['timestamp_created'].astype('int64')
+        if 'timestamp_updated' in df.columns:
+            updated = df['timestamp_updated'].where(df['timestamp_updated'] > 0)
+            df['timestamp_updated'] = updated.fillna(df['timestamp_created']).astype('int64')
+        else:
+            df['timestamp_updated'] = df['timestamp_created']
+        if 'voted_up' in df.columns:
+            df['voted_up'] = df['voted_up'].astype('boolean')
+        return df
+
+    @instrumented(rows=returned_count)
+    def append(self, app_id, reviews):
+        """
+        리뷰를 저장소에 추가 (신규 또는 timestamp_updated가 더 최신인 리뷰만 기록)
+
+        Returns:
+        - 실제로 기록된 리뷰 수
+        """
+        import pandas as pd
+        df = self.normalize(reviews)
+        if len(df) == 0:
+            return 0
+        df = self._latest(df)
+
+        months = pd.to_datetime(df['timestamp_created'], unit='s').dt.strftime('%Y-%m')
+        written = 0
+        for month, group in df.groupby(months):
+            stored = self._read_parts(self._parts(app_id, month),
+                                      columns=['recommendationid', 'timestamp_updated'])
+            if len(stored) > 0:
+                stored = stored.groupby('recommendationid')['timestamp_updated'].max()
+                previous = group['recommendationid'].map(stored)
+                group = group[previous.isna() | (group['timestamp_updated'] > previous)]
+            if len(group) == 0:
+                continue
+            self._write_part(app_id, month, group.reset_index(drop=True))
+            written += len(group)
+        return written
+
+    @instrumented
+    def read(self, app_id, start=None, end=None, columns=None):
+        """
+        리뷰 읽기 (기간에 해당하지 않는 월 파티션은 읽지 않음)
+
+        Parameters:
+        - start, end: timestamp_created 기준 기간 (datetime 또는 문자열, 양 끝 포함)
+          end가 '2024-03-31'처럼 날짜만 있으면 그날 하루 전체를 포함
+        - columns: 읽을 컬럼 리스트 (None이면 전체)
+
+        Returns:
+        - recommendationid별 최신 버전만 담은 DataFrame
+        """
+        import pandas as pd
+        end_value = end
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        # 날짜만 지정한 end는 자정이 아닌 그날의 끝까지 (end + 1일 미만)
+        end_before = end + pd.Timedelta(days=1) if _is_date_only(end_value) else None
+
+        months = self.months(app_id)
+        if start is not None:
+            months = [m for m in months if m >= start.strftime('%Y-%m')]
+        if end is not None:
+            months = [m for m in months if m <= end.strftime('%Y-%m')]
+
+        read_columns = None
+        if columns is not None:
+            read_columns = list(dict.fromkeys(list(columns) + ['recommendationid', 'timestamp_created', 'timestamp_updated']))
+
+        paths = [path for month in months for path in self._parts(app_id, month)]
+        df = self._read_parts(paths, columns=read_columns)
+        if len(df) == 0:
+            return df if columns is None else df.reindex(columns=columns)
+
+        df = self._latest(df)
+        created = pd.to_datetime(df['timestamp_created'], unit='s')
+        keep = pd.Series(True, index=df.index)
+        if start is not None:
+            keep &= created >= start
+        if end_before is not None:
+            keep &= created < end_before
+        elif end is not None:
+            keep &= created <= end
+        df = df[keep]
+
+        df = df.sort_values('timestamp_created').reset_index(drop=True)
+        return df if columns is None else df[list(columns)]
+
+    def newest_created(self, app_id):
+        """
+        저장된 리뷰 중 가장 최근 timestamp_created (저장된 리뷰가 없으면 None)
+
+        가장 최근 월 파티션의 timestamp_created 컬럼만 읽음
+        """
+        for month in reversed(self.months(app_id)):
+            created = self._read_parts(self._parts(app_id, month), columns=['timestamp_created'])
+            if len(created) > 0:
+                return int(created['timestamp_created'].max())
+        return None
+
+    def _latest_masks(self, paths):
+        """
+        part 파일별로 recommendationid의 최신 버전인 행을 표시한 bool 배열 리스트
+
+        같은 리뷰의 모든 버전은 같은 월 파티션에 있으므로 월 단위로 계산하면 되고,
+        (recommendationid, timestamp_updated) 두 컬럼만 읽음 (리뷰당 약 20바이트)
+        """
+        keys = [self.backend.read(path, columns=['recommendationid', 'timestamp_updated']) for path in paths]
+        sizes = [len(key) for key in keys]
+        ids = np.concatenate([key['recommendationid'].to_numpy(dtype=np.int64) for key in keys])
+        updated = np.concatenate([key['timestamp_updated'].to_numpy(dtype=np.int64) for key in keys])
+        del keys
+
+        # 같은 버전이 여러 part에 있으면 (compact 도중 중단 등) 나중 part를 유지
+        order = np.lexsort((np.arange(len(ids)), updated, ids))
+        latest = np.zeros(len(ids), dtype=np.bool_)
+        sorted_ids = ids[order]
+        latest[order[np.append(sorted_ids[1:] != sorted_ids[:-1], True)]] = True
+        return np.split(latest, np.cumsum(sizes)[:-1])
+
+    def iter_chunks(self, app_id, columns=None, chunk_rows=65536, months=None):
+        """
+        리뷰를 최대 chunk_rows행씩 나누어 읽는 제너레이터 (recommendationid별 최신 버전만)
+
+        part 파일을 배치 단위로 읽으므로 메모리 사용량은 전체 리뷰 수가 아닌 청크 크기와
+        가장 큰 월 파티션의 (recommendationid, timestamp_updated) 인덱스 크기로 제한됨
+
+        Parameters:
+        - columns: 읽을 컬럼 리스트 (None이면 전체)
+        - chunk_rows: 청크당 최대 행 수
+        - months: 읽을 월 파티션 리스트 (None이면 전체)
+
+        Yields:
+        - 리뷰 DataFrame 청크 (청크 사이의 순서는 월 오름차순, 월 안에서는 정렬되지 않음)
+        """
+        for month in months or self.months(app_id):
+            paths = self._parts(app_id, month)
+            if not paths:
+                continue
+            # part가 하나뿐이면 (compact 후) 이미 중복이 없으므로 인덱스를 읽지 않음
+            masks = self._latest_masks(paths) if len(paths) > 1 else [None]
+            for path, mask in zip(paths, masks):
+                if mask is not None and not mask.any():
+                    continue
+                offset = 0
+                for batch in self.backend.iter_batches(path, columns=columns, batch_size=chunk_rows):
+                    if mask is None:
+                        yield batch
+                        continue
+                    keep = mask[offset:offset + len(batch)]
+                    offset += len(batch)
+                    if keep.all():
+                        yield batch.reset_index(drop=True)
+                    elif keep.any():
+                        yield batch[keep].reset_index(drop=True)
+
+    @instrumented
+    def compact(self, app_id, months=None):
+        """
+        파티션별 part 파일을 중복 제거된 하나의 파일로 병합
+
+        Returns:
+        - 병합된 파티션 수
+        """
+        compacted = 0
+        for month in months or self.months(app_id):
+            parts = self._parts(app_id, month)
+            if len(parts) < 2:
+                continue
+            merged = self._latest(self._read_parts(parts)).sort_values('timestamp_created')
+            self._write_part(app_id, month, merged.reset_index(drop=True))
+            for path in parts:
+                os.remove(path)
+            compacted += 1
+        return compacted
+
+    def drop(self, app_id):
+        """게임의 저장된 리뷰 전체 삭제"""
+        shutil.rmtree(self._app_dir(app_id), ignore_errors=True)
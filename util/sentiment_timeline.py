@@ -0,0 +1,291 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from util.instrument import instrumented, returned_count
+
+# 구간 단위별 길이 (초)
+FREQUENCIES = {'D': 86400, 'H': 3600}
+
+# 타임라인 계산에 필요한 리뷰 컬럼
+TIMELINE_COLUMNS = ['recommendationid', 'timestamp_created', 'timestamp_updated', 'voted_up', 'playtime_at_review']
+
+# 저장 파일 형식이 바뀌면 올려서 이전 상태 파일을 무시
+_STATE_VERSION = 1
+
+
+def _rolling_sum(values, window):
+    """누적합으로 계산한 길이 window의 이동 합 (앞쪽 window-1개 구간은 있는 만큼만 합산)"""
+    total = np.cumsum(values)
+    total[window:] = total[window:] - total[:-window]
+    return total
+
+
+def _ratio(numerator, denominator):
+    """분모가 0인 구간은 NaN인 백분율"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / denominator * 100, np.nan)
+
+
+class SentimentTimeline:
+    """
+    리뷰 단위 긍정/부정 타임라인 (일별 또는 시간별)
+
+    리뷰 저장소의 timestamp_created(epoch 초)를 구간 번호로 바꾼 뒤 np.bincount로 구간별
+    긍정/부정 리뷰 수와 플레이타임 가중 합계를 누적함. Valve의 appreviewhistogram과 달리
+    개별 리뷰에서 바로 집계하므로 시간 단위까지 나눌 수 있음
+
+    리뷰별 (구간, 추천 여부, 가중치, timestamp_updated)를 recommendationid 정렬 배열로 함께 보관하여
+    update()에 새 리뷰 묶음이 들어오면 해당 리뷰만 더하고, 수정된 리뷰는 이전 버전을 빼고 다시 더함
+    (전체 이력을 다시 계산하지 않음, 리뷰당 29바이트)
+
+    가중치는 리뷰 작성 시점의 플레이타임(playtime_at_review, 시간 단위)
+    """
+
+    def __init__(self, freq='D', utc_offset=0):
+        """
+        Parameters:
+        - freq: 'D'(일별) 또는 'H'(시간별)
+        - utc_offset: 구간 경계 기준 시간대 (UTC 기준 시간, 예: 한국 9)
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"지원하지 않는 구간 단위입니다: {freq} (가능한 값: {', '.join(FREQUENCIES)})")
+        self.freq = freq
+        self.utc_offset = utc_offset
+        self.step = FREQUENCIES[freq]
+        self._offset = int(utc_offset * 3600)
+
+        # 구간별 누적값 (origin은 첫 구간 번호)
+        self.origin = None
+        self.positive = np.zeros(0, dtype=np.int64)
+        self.negative = np.zeros(0, dtype=np.int64)
+        self.weighted_positive = np.zeros(0, dtype=np.float64)
+        self.weight = np.zeros(0, dtype=np.float64)
+
+        # recommendationid 오름차순 리뷰 인덱스
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._bins = np.zeros(0, dtype=np.int64)
+        self._up = np.zeros(0, dtype=np.bool_)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self._updated = np.zeros(0, dtype=np.int64)
+
+        # refresh()에서 이미 반영한 리뷰 저장소 part 파일 (저장소 루트 기준 상대 경로)
+        self.applied_parts = set()
+
+    def __len__(self):
+        """반영된 리뷰 수"""
+        return len(self._ids)
+
+    @property
+    def nbytes(self):
+        arrays = [self.positive, self.negative, self.weighted_positive, self.weight,
+                  self._ids, self._bins, self._up, self._weights, self._updated]
+        return sum(array.nbytes for array in arrays)
+
+    def bin_of(self, timestamps):
+        """epoch 초 -> 구간 번호"""
+        return (np.asarray(timestamps, dtype=np.int64) + self._offset) // self.step
+
+    def _ensure_bins(self, low, high):
+        """구간 번호 [low, high]를 담을 수 있도록 누적 배열 확장"""
+        if self.origin is None:
+            self.origin = low
+        start = min(self.origin, low)
+        end = max(self.origin + len(self.positive), high + 1)
+        if start == self.origin and end == self.origin + len(self.positive):
+            return
+        before = self.origin - start
+        for name in ('positive', 'negative', 'weighted_positive', 'weight'):
+            array = getattr(self, name)
+            grown = np.zeros(end - start, dtype=array.dtype)
+            grown[before:before + len(array)] = array
+            setattr(self, name, grown)
+        self.origin = start
+
+    def _accumulate(self, bins, up, weights, sign=1):
+        if len(bins) == 0:
+            return
+        index = bins - self.origin
+        size = len(self.positive)
+        self.positive += sign * np.bincount(index[up], minlength=size)
+        self.negative += sign * np.bincount(index[~up], minlength=size)
+        self.weighted_positive += sign * np.bincount(index[up], weights=weights[up], minlength=size)
+        self.weight += sign * np.bincount(index, weights=weights, minlength=size)
+
+    @staticmethod
+    def _columns(reviews):
+        """리뷰 DataFrame에서 (id, 작성 시각, 수정 시각, 추천 여부, 가중치) 배열 추출"""
+        ids = reviews['recommendationid'].to_numpy(dtype=np.int64)
+        created = reviews['timestamp_created'].to_numpy(dtype=np.int64)
+        if 'timestamp_updated' in reviews.columns:
+            updated = reviews['timestamp_updated'].fillna(0).to_numpy(dtype=np.int64)
+            updated = np.where(updated > 0, updated, created)
+        else:
+            updated = created
+        up = reviews['voted_up'].fillna(False).to_numpy(dtype=np.bool_)
+        if 'playtime_at_review' in reviews.columns:
+            weights = (reviews['playtime_at_review'].fillna(0).to_numpy(dtype=np.float32) / 60).astype(np.float32)
+        else:
+            weights = np.zeros(len(ids), dtype=np.float32)
+        return ids, created, updated, up, weights
+
+    @instrumented(rows=returned_count)
+    def update(self, reviews):
+        """
+        새 리뷰 묶음 반영 (ReviewStore/ReviewBuffer의 리뷰 DataFrame)
+
+        이미 반영된 리뷰는 timestamp_updated가 더 최신일 때만 이전 버전을 빼고 다시 더하고,
+        같거나 오래된 버전은 무시하므로 같은 리뷰가 여러 번 들어와도 결과가 같음
+
+        Returns:
+        - 새로 반영되거나 갱신된 리뷰 수
+        """
+        if len(reviews) == 0:
+            return 0
+        ids, created, updated, up, weights = self._columns(reviews)
+
+        # 묶음 안의 중복은 최신 버전만
+        order = np.lexsort((updated, ids))
+        ids, created, updated, up, weights = (ids[order], created[order], updated[order],
+                                              up[order], weights[order])
+        last = np.append(ids[1:] != ids[:-1], True)
+        ids, created, updated, up, weights = ids[last], created[last], updated[last], up[last], weights[last]
+        bins = self.bin_of(created)
+
+        position = np.searchsorted(self._ids, ids)
+        found = position < len(self._ids)
+        found[found] = self._ids[position[found]] == ids[found]
+        changed = found.copy()
+        changed[found] = updated[found] > self._updated[position[found]]
+        fresh = ~found
+
+        apply = changed | fresh
+        if not apply.any():
+            return 0
+        self._ensure_bins(bins[apply].min(), bins[apply].max())
+
+        # 수정된 리뷰: 이전 버전을 빼고 인덱스 갱신
+        previous = position[changed]
+        self._accumulate(self._bins[previous], self._up[previous], self._weights[previous], sign=-1)
+        self._bins[previous] = bins[changed]
+        self._up[previous] = up[changed]
+        self._weights[previous] = weights[changed]
+        self._updated[previous] = updated[changed]
+
+        self._accumulate(bins[apply], up[apply], weights[apply])
+
+        # 신규 리뷰: 정렬 순서를 유지하며 인덱스에 삽입
+        if fresh.any():
+            at = position[fresh]
+            self._ids = np.insert(self._ids, at, ids[fresh])
+            self._bins = np.insert(self._bins, at, bins[fresh])
+            self._up = np.insert(self._up, at, up[fresh])
+            self._weights = np.insert(self._weights, at, weights[fresh])
+            self._updated = np.insert(self._updated, at, updated[fresh])
+        return int(apply.sum())
+
+    @instrumented(rows=returned_count)
+    def refresh(self, review_store, app_id):
+        """
+        리뷰 저장소에서 아직 반영하지 않은 part 파일만 읽어 반영
+
+        compact()로 병합된 part는 이미 반영된 리뷰가 대부분이므로 update()에서 건너뛰어짐
+
+        Returns:
+        - 새로 반영한 part 파일 수
+        """
+        parts = {os.path.relpath(path, review_store.root): path for path in review_store.part_files(app_id)}
+        new_parts = [name for name in parts if name not in self.applied_parts]
+        for name in new_parts:
+            self.update(review_store.read_part(parts[name], columns=TIMELINE_COLUMNS))
+        self.applied_parts = set(parts)
+        return len(new_parts)
+
+    def to_frame(self, window=None):
+        """
+        구간별 타임라인 DataFrame
+
+        Parameters:
+        - window: 이동 합계 구간 수 (예: 일별 7이면 7일, None이면 이동 지표 없음)
+
+        Returns:
+        - date(구간 시작, utc_offset 기준 시각), positive, negative, total, positive_ratio,
+          weighted_positive_ratio 컬럼 (리뷰가 없는 구간도 포함, 비율은 NaN)
+          window를 지정하면 rolling_positive, rolling_total, rolling_positive_ratio,
+          rolling_weighted_positive_ratio 컬럼 추가 (구간 비율의 평균이 아닌 합계의 비율)
+        """
+        size = len(self.positive)
+        bins = np.arange(size, dtype=np.int64) + (self.origin or 0)
+        total = self.positive + self.negative
+        df = pd.DataFrame({
+            'date': pd.to_datetime(bins * self.step, unit='s'),
+            'positive': self.positive,
+            'negative': self.negative,
+            'total': total,
+            'positive_ratio': _ratio(self.positive, total),
+            'weighted_positive_ratio': _ratio(self.weighted_positive, self.weight),
+        })
+        if window:
+            rolling_positive = _rolling_sum(self.positive, window)
+            rolling_total = _rolling_sum(total, window)
+            df['rolling_positive'] = rolling_positive
+            df['rolling_total'] = rolling_total
+            df['rolling_positive_ratio'] = _ratio(rolling_positive, rolling_total)
+            df['rolling_weighted_positive_ratio'] = _ratio(_rolling_sum(self.weighted_positive, window),
+                                                           _rolling_sum(self.weight, window))
+        return df
+
+    def save(self, path):
+        """상태를 .npz 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                version=_STATE_VERSION,
+                freq=self.freq,
+                utc_offset=self.utc_offset,
+                origin=self.origin if self.origin is not None else 0,
+                positive=self.positive,
+                negative=self.negative,
+                weighted_positive=self.weighted_positive,
+                weight=self.weight,
+                ids=self._ids,
+                bins=self._bins,
+                up=self._up,
+                weights=self._weights,
+                updated=self._updated,
+                applied_parts=np.array(sorted(self.applied_parts), dtype=str),
+            )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path, freq='D', utc_offset=0):
+        """
+        save()로 저장한 상태 로드
+
+        파일이 없거나 freq/utc_offset/형식 버전이 다르면 빈 타임라인 반환
+        """
+        timeline = cls(freq, utc_offset)
+        if not os.path.exists(path):
+            return timeline
+        with np.load(path) as state:
+            if (int(state['version']) != _STATE_VERSION or str(state['freq']) != freq
+                    or float(state['utc_offset']) != utc_offset):
+                return timeline
+            timeline.positive = state['positive']
+            timeline.negative = state['negative']
+            timeline.weighted_positive = state['weighted_positive']
+            timeline.weight = state['weight']
+            timeline.origin = int(state['origin']) if len(timeline.positive) > 0 else None
+            timeline._ids = state['ids']
+            timeline._bins = state['bins']
+            timeline._up = state['up']
+            timeline._weights = state['weights']
+            timeline._updated = state['updated']
+            timeline.applied_parts = set(state['applied_parts'].tolist())
+        return timeline
@@ -0,0 +1,236 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from util.http_cache import CacheMissError, ResponseCache
+from util.instrument import get_recorder
+from util.json_decode import decode
+
+
+class TokenBucket:
+    """
+    토큰 버킷 방식의 요청 속도 제한기
+
+    평균 rate개/초 속도로 토큰이 채워지고, 최대 capacity개까지 몰아서 사용할 수 있음
+    여러 스레드에서 동시에 사용해도 안전함
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, tokens=1):
+        """토큰을 사용할 수 있을 때까지 대기한 뒤 차감"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, seconds):
+        """서버가 속도 제한을 알린 경우 일정 시간 동안 토큰 발급을 멈춤"""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class SteamClient:
+    """
+    Steam API 공용 HTTP 클라이언트
+
+    - 커넥션 풀을 유지하는 requests.Session 재사용
+    - 429/5xx 및 네트워크 오류 시 지수 백오프 + 지터로 재시도
+    - Retry-After 헤더 준수
+    - 호스트별 토큰 버킷으로 요청 속도 제한 (고정 sleep 대체)
+    - 디스크 응답 캐시 (TTL, ETag/If-Modified-Since 재검증, 오프라인 모드)
+    - 요청 수(엔드포인트별), 응답 크기, 재시도, 캐시 적중을 실행 보고서(util.instrument)에 기록
+    """
+
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, rate=2.0, burst=10, max_retries=5, backoff_base=1.0,
+                 backoff_max=60.0, timeout=30, pool_size=20, cache=None, offline=False):
+        """
+        Parameters:
+        - rate: 호스트별 초당 평균 요청 수
+        - burst: 호스트별 최대 연속 요청 수
+        - max_retries: 최대 재시도 횟수
+        - backoff_base: 첫 재시도 대기 시간 (초), 재시도마다 2배씩 증가
+        - backoff_max: 재시도 대기 시간 상한 (초)
+        - timeout: 요청 타임아웃 (초)
+        - pool_size: 호스트별 커넥션 풀 크기
+        - cache: ResponseCache 인스턴스 (None이면 캐시 사용 안 함)
+        - offline: True이면 네트워크 없이 캐시에서만 응답 (만료된 항목 포함)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.cache = cache
+        self.offline = offline
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+
+    def _bucket(self, url):
+        host = urlparse(url).netloc
+        with self._buckets_lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def _retry_after(self, response):
+        """Retry-After 헤더를 초 단위로 변환 (초 또는 HTTP 날짜 형식)"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def _backoff(self, attempt):
+        """지수 백오프 + full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def get(self, url, params=None, headers=None):
+        """
+        GET 요청 실행 (속도 제한 및 재시도 포함)
+
+        재시도를 모두 소진하면 마지막 오류를 그대로 발생시킴
+        """
+        bucket = self._bucket(url)
+        recorder = get_recorder()
+
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                recorder.record_request(url, retry=attempt > 0, error=True)
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            recorder.record_request(url, response.status_code, len(response.content), retry=attempt > 0,
+                                    error=response.status_code >= 400)
+            if response.status_code not in self.RETRY_STATUS or attempt == self.max_retries:
+                response.raise_for_status()
+                return response
+
+            wait = self._retry_after(response)
+            if wait is None:
+                wait = self._backoff(attempt)
+            if response.status_code == 429:
+                # 같은 호스트로 가는 다른 요청도 함께 멈추도록 버킷에 반영 (다음 acquire에서 대기)
+                bucket.penalize(wait)
+            else:
+                time.sleep(wait)
+
+    def get_json(self, url, params=None, schema=None):
+        """
+        GET 요청 후 JSON 응답을 반환
+
+        캐시가 설정된 경우 유효한 캐시 응답을 우선 사용하고, 만료된 항목은
+        ETag/Last-Modified로 조건부 재검증함
+
+        Parameters:
+        - schema: 'reviews' 또는 'news' - msgspec이 있으면 수집기가 사용하는 필드만 디코딩
+          (util.json_decode 참고, None이면 전체 디코딩)
+        """
+        if self.cache is None:
+            if self.offline:
+                raise CacheMissError(f"오프라인 모드에서는 캐시가 필요합니다: {url}")
+            return decode(self.get(url, params=params).content, schema)
+
+        key = self.cache.make_key(url, params)
+        entry = self.cache.get(key)
+
+        if entry is not None and (self.offline or self.cache.is_fresh(entry, url)):
+            get_recorder().record_cache(url)
+            return decode(entry['body'], schema)
+        if self.offline:
+            raise CacheMissError(f"오프라인 모드: 캐시에 없는 요청입니다: {url}")
+
+        headers = {}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.get(url, params=params, headers=headers or None)
+
+        if response.status_code == 304 and entry is not None:
+            get_recorder().record_cache(url, not_modified=True)
+            self.cache.touch(key)
+            return decode(entry['body'], schema)
+
+        self.cache.put(key, url, response.content,
+                       etag=response.headers.get('ETag'),
+                       last_modified=response.headers.get('Last-Modified'))
+        return decode(response.content, schema)
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """모든 수집기가 함께 사용하는 기본 SteamClient 반환 (디스크 캐시 사용)"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = SteamClient(cache=ResponseCache())
+        return _default_client
+
+
+def configure_default_client(**kwargs):
+    """
+    기본 SteamClient를 주어진 설정으로 다시 생성
+
+    이전 기본 클라이언트는 닫지 않음 - 이미 받아 둔 수집기 등이 세션과 캐시 연결을 계속 사용할 수 있으므로,
+    더 이상 쓰는 곳이 없을 때 호출한 쪽에서 close()를 호출 (교체 전에 get_default_client()로 받아 둠)
+
+    예: configure_default_client(offline=True, cache=ResponseCache('my_cache.sqlite'))
+    """
+    global _default_client
+    kwargs.setdefault('cache', ResponseCache())
+    with _default_client_lock:
+        _default_client = SteamClient(**kwargs)
+        return _default_client
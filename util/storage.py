@@ -0,0 +1,179 @@
+import os
+from importlib.util import find_spec
+
+from util.instrument import instrumented
+
+# pyarrow는 실제로 읽고 쓸 때만 불러옴 (수집만 하는 실행의 시작 시간 단축)
+HAS_PYARROW = find_spec('pyarrow') is not None
+
+
+class CsvBackend:
+    """utf-8-sig CSV 저장 (기존 출력 형식)"""
+
+    name = 'csv'
+    extension = '.csv'
+
+    def write(self, df, path):
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+
+    def read(self, path, columns=None, parse_dates=None):
+        import pandas as pd
+        df = pd.read_csv(path, usecols=columns, encoding='utf-8-sig')
+        for column in parse_dates or []:
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column])
+        return df
+
+    def iter_batches(self, path, columns=None, batch_size=65536):
+        """batch_size행씩 나누어 읽음 (파일 전체를 메모리에 올리지 않음)"""
+        import pandas as pd
+        yield from pd.read_csv(path, usecols=columns, encoding='utf-8-sig', chunksize=batch_size)
+
+
+class ParquetBackend:
+    """압축된 Parquet 저장 - 날짜/정수 타입 유지, 컬럼 단위 로드, 메모리 매핑 읽기"""
+
+    name = 'parquet'
+    extension = '.parquet'
+
+    def __init__(self, compression='zstd'):
+        self.compression = compression
+
+    def write(self, df, path):
+        df.to_parquet(path, index=False, compression=self.compression)
+
+    def read(self, path, columns=None, parse_dates=None):
+        import pyarrow.parquet as pq
+        return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+    def iter_batches(self, path, columns=None, batch_size=65536):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+
+
+class FeatherBackend:
+    """Arrow IPC(Feather v2) 저장 - 압축 + 메모리 매핑 읽기"""
+
+    name = 'feather'
+    extension = '.feather'
+
+    def __init__(self, compression='zstd'):
+        self.compression = compression
+
+    def write(self, df, path):
+        df.reset_index(drop=True).to_feather(path, compression=self.compression)
+
+    def read(self, path, columns=None, parse_dates=None):
+        import pyarrow.feather as feather
+        return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+    def iter_batches(self, path, columns=None, batch_size=65536):
+        import pyarrow as pa
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for offset in range(0, batch.num_rows, batch_size):
+                    yield batch.slice(offset, batch_size).to_pandas()
+
+
+BACKENDS = {
+    'csv': CsvBackend,
+    'parquet': ParquetBackend,
+    'feather': FeatherBackend,
+}
+
+_default_format = 'auto'
+
+
+def set_default_format(format):
+    """TableStore의 기본 저장 형식 변경 ('auto', 'parquet', 'feather', 'csv')"""
+    global _default_format
+    if format != 'auto' and format not in BACKENDS:
+        raise ValueError(f"지원하지 않는 저장 형식입니다: {format}")
+    _default_format = format
+
+
+def resolve_format(format=None):
+    """'auto'는 pyarrow가 있으면 parquet, 없으면 csv"""
+    format = format or _default_format
+    if format == 'auto':
+        return 'parquet' if HAS_PYARROW else 'csv'
+    return format
+
+
+class TableStore:
+    """
+    게임별 테이블 저장소
+
+    파일 이름(stem)은 기존과 같은 '{app_id}_{game_name}_{종류}' 형식을 사용하고,
+    확장자만 저장 형식에 따라 달라짐. 읽을 때는 기본 형식 파일이 없으면
+    다른 형식(기존 CSV 포함)으로 저장된 파일을 찾아 읽음
+    """
+
+    def __init__(self, output_dir='output', format=None, csv_export=False):
+        """
+        Parameters:
+        - output_dir: 저장 디렉토리
+        - format: 'auto', 'parquet', 'feather', 'csv' (None이면 기본 형식)
+        - csv_export: True이면 기본 형식과 함께 CSV도 저장
+        """
+        self.output_dir = output_dir
+        self.backend = BACKENDS[resolve_format(format)]()
+        self.csv_export = csv_export and self.backend.name != 'csv'
+
+    def path(self, stem, backend=None):
+        backend = backend or self.backend
+        return os.path.join(self.output_dir, stem + backend.extension)
+
+    def find(self, stem):
+        """저장된 파일 경로와 백엔드 반환 (기본 형식 우선, 없으면 (None, None))"""
+        candidates = [self.backend] + [cls() for name, cls in BACKENDS.items() if name != self.backend.name]
+        for backend in candidates:
+            path = self.path(stem, backend)
+            if os.path.exists(path):
+                return path, backend
+        return None, None
+
+    def exists(self, stem):
+        return self.find(stem)[0] is not None
+
+    @instrumented
+    def save(self, df, stem):
+        """
+        테이블 저장 후 기본 파일 경로 반환
+
+        임시 파일에 쓴 뒤 교체하므로, 여러 프로세스/머신이 같은 출력 디렉토리를 공유해도
+        다른 단계가 쓰는 중인 파일을 읽지 않음
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = self.path(stem)
+        self._write(self.backend, df, path)
+        if self.csv_export:
+            self._write(CsvBackend(), df, self.path(stem, CsvBackend()))
+        return path
+
+    @staticmethod
+    def _write(backend, df, path):
+        directory, name = os.path.split(path)
+        tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+        backend.write(df, tmp_path)
+        os.replace(tmp_path, path)
+
+    @instrumented
+    def load(self, stem, columns=None, parse_dates=('date',)):
+        """
+        테이블 로드
+
+        Parameters:
+        - columns: 읽을 컬럼 리스트 (None이면 전체)
+        - parse_dates: CSV에서 읽을 때 datetime으로 변환할 컬럼
+        """
+        path, backend = self.find(stem)
+        if path is None:
+            raise FileNotFoundError(os.path.join(self.output_dir, stem))
+        return backend.read(path, columns=columns, parse_dates=parse_dates)
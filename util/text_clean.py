@@ -0,0 +1,210 @@
+import hashlib
+import html
+import re
+import threading
+from collections import OrderedDict
+from html.entities import html5
+from html.parser import HTMLParser
+
+from util.instrument import instrumented
+
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Steam BBCode 태그 - 블록 태그는 공백으로, 인라인 태그는 빈 문자열로 치환
+BBCODE_BLOCK_TAGS = ('h1', 'h2', 'h3', 'list', 'olist', r'\*', 'hr', 'p', 'quote', 'code',
+                     'table', 'tr', 'th', 'td', 'noparse')
+BBCODE_INLINE_TAGS = ('b', 'i', 'u', 's', 'strike', 'spoiler', 'url', 'emoticon')
+# 태그 이름은 Steam이 쓰는 소문자만 인식 ('[P] mode' 같은 본문 텍스트는 태그가 아님)
+BBCODE_MEDIA_RE = re.compile(
+    r'\[(img|previewyoutube|video)\b[^\]]*\].*?\[/\1\]', re.DOTALL
+)
+BBCODE_BLOCK_RE = re.compile(
+    r'\[/?(%s)(?:[= ][^\]]*)?\]' % '|'.join(BBCODE_BLOCK_TAGS)
+)
+BBCODE_INLINE_RE = re.compile(
+    r'\[/?(%s)(?:=[^\]]*)?\]' % '|'.join(BBCODE_INLINE_TAGS)
+)
+# 닫는 태그 없이 쓰는 태그 - 나머지 태그는 본문에 닫는 태그가 있을 때만 제거
+BBCODE_UNPAIRED_TAGS = {'*', 'hr'}
+# BBCode 본문 판별용 - 여는 태그와 닫는 태그 이름 ([*]처럼 닫는 태그가 없는 태그는 제외)
+BBCODE_TAG_RE = re.compile(
+    r'\[(/?)(%s)(?:[= ][^\]]*)?\]' % '|'.join(
+        [tag for tag in BBCODE_BLOCK_TAGS if tag != r'\*'] + list(BBCODE_INLINE_TAGS)
+        + ['img', 'previewyoutube', 'video']
+    )
+)
+HTML_TAG_RE = re.compile(r'<[a-zA-Z/!][^>]*>')
+
+
+class _TextExtractor(HTMLParser):
+    """
+    DOM 트리를 만들지 않고 토큰 단위로 텍스트만 모으는 HTML 파서
+
+    BeautifulSoup(html, 'html.parser').get_text()와 같은 규칙을 따름
+    - 주석, 선언, 처리 명령, script/style 내용은 제외
+    - CDATA 내용은 포함
+    - 알 수 없는 엔티티는 '&이름' 그대로 유지
+    """
+
+    SKIP_TAGS = {'script', 'style'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.parts = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+    def handle_entityref(self, name):
+        self.handle_data(html5.get(name + ';', '&' + name))
+
+    def handle_charref(self, name):
+        self.handle_data(html.unescape(f'&#{name};'))
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            self.handle_data(data[len('CDATA['):])
+
+    def get_text(self):
+        return ''.join(self.parts)
+
+
+def _extract_fast(text):
+    parser = _TextExtractor()
+    parser.feed(text)
+    parser.close()
+    return parser.get_text()
+
+
+def _extract_bs4(text):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(text, 'html.parser').get_text()
+
+
+PARSERS = {
+    'fast': _extract_fast,
+    'bs4': _extract_bs4,
+}
+
+
+def is_bbcode(text):
+    """
+    BBCode 본문인지 판별 - HTML 태그가 없고, 같은 이름의 여는/닫는 BBCode 태그 쌍이 있는 경우
+
+    HTML 본문이나 일반 텍스트 속 '[P] 모드', 'list[i]' 같은 대괄호 표현을 태그로 오인하지 않기 위함
+    """
+    if HTML_TAG_RE.search(text):
+        return False
+    opened, closed = set(), set()
+    for match in BBCODE_TAG_RE.finditer(text):
+        (closed if match.group(1) else opened).add(match.group(2))
+    return bool(opened & closed)
+
+
+def strip_bbcode(text):
+    """
+    Steam BBCode 태그 제거 ([img]/[previewyoutube] 등 미디어 태그는 내용까지 제거)
+
+    여는 태그는 같은 이름의 닫는 태그가 본문에 있을 때만 제거하므로 'list[i]'처럼 짝이 없는
+    대괄호 텍스트는 남음 ([*], [hr]는 항상 제거)
+    """
+    text = BBCODE_MEDIA_RE.sub(' ', text)
+    closed = {match.group(2) for match in BBCODE_TAG_RE.finditer(text) if match.group(1)}
+    closed |= BBCODE_UNPAIRED_TAGS
+
+    def replace(replacement):
+        def _replace(match):
+            return replacement if match.group(1) in closed else match.group(0)
+        return _replace
+
+    text = BBCODE_BLOCK_RE.sub(replace(' '), text)
+    return BBCODE_INLINE_RE.sub(replace(''), text)
+
+
+def _clean(text, parser):
+    # BBCode 여부는 HTML 파싱 전 원문으로 판별 (HTML 본문의 대괄호 텍스트는 유지)
+    bbcode = '[' in text and is_bbcode(text)
+    # 빠른 경로: 태그/엔티티가 없는 일반 텍스트
+    if '<' in text or '&' in text:
+        text = PARSERS[parser](text)
+    if bbcode:
+        text = strip_bbcode(text)
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+class TextCleaner:
+    """
+    HTML/BBCode 본문을 순수 텍스트로 변환 (내용 해시 기준 메모이제이션)
+
+    같은 본문은 한 번만 파싱하며, 캐시는 최대 max_entries개까지 LRU로 유지
+    """
+
+    def __init__(self, parser='fast', max_entries=10000):
+        """
+        Parameters:
+        - parser: 'fast' (스트리밍 토크나이저) 또는 'bs4' (BeautifulSoup)
+        - max_entries: 메모이제이션 캐시 크기
+        """
+        if parser not in PARSERS:
+            raise ValueError(f"지원하지 않는 파서입니다: {parser} (가능한 값: {', '.join(PARSERS)})")
+        self.parser = parser
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, text):
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def clean(self, text):
+        """본문 하나를 정리"""
+        if not text:
+            return ""
+
+        key = self._key(text)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        cleaned = _clean(text, self.parser)
+
+        with self._lock:
+            self._cache[key] = cleaned
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return cleaned
+
+    @instrumented
+    def clean_many(self, texts):
+        """피드 전체를 한 번에 정리 (배치 안의 중복 본문은 한 번만 처리)"""
+        results = {}
+        cleaned = []
+        for text in texts:
+            if text not in results:
+                results[text] = self.clean(text)
+            cleaned.append(results[text])
+        return cleaned
+
+
+_default_cleaner = TextCleaner()
+
+
+def clean_text(text):
+    """기본 TextCleaner로 본문 하나를 정리"""
+    return _default_cleaner.clean(text)
+
+
+def clean_texts(texts):
+    """기본 TextCleaner로 여러 본문을 정리"""
+    return _default_cleaner.clean_many(texts)
@@ -3,52 +3,62 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import os
 import numpy as np
-from scipy import stats
 
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+from util.catalog import load_catalog
+from util.dataset import GameDataset
+from util.instrument import instrumented
+from util.lod import draw_bars
+from util.render_profile import get_profile, new_figure, save_figure
 
-def visualize_patch_notes(game_id, game_name, output_dir='output', viz_dir='visualizations'):
-    """패치노트 분석 시각화"""
+def _build_patch_axes(fig):
+    gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
+    return [
+        fig.add_subplot(gs[0, 0]),
+        fig.add_subplot(gs[0, 1]),
+        fig.add_subplot(gs[1, :]),
+        fig.add_subplot(gs[2, 0]),
+        fig.add_subplot(gs[2, 1]),
+    ]
+
+
+@instrumented
+def visualize_patch_notes(game_id, game_name, output_dir='output', viz_dir='visualizations', dataset=None,
+                          profile=None):
+    """
+    패치노트 분석 시각화
+    
+    Parameters:
+    - dataset: 미리 만든 GameDataset (None이면 output_dir에서 로드)
+    - profile: 렌더 프로필 ('draft', 'web', 'print' 또는 RenderProfile, None이면 'print')
+    """
     
     os.makedirs(viz_dir, exist_ok=True)
+    profile = get_profile(profile)
     
     game_name_safe = game_name.replace(':', '').replace('/', '-')
-    patch_file = os.path.join(output_dir, f"{game_id}_{game_name_safe}_patch_notes.csv")
-    histogram_file = os.path.join(output_dir, f"{game_id}_{game_name_safe}_daily_histogram.csv")
+    dataset = dataset or GameDataset(game_id, game_name, output_dir)
     
-    if not os.path.exists(patch_file):
+    if not dataset.has_patches:
         print(f"❌ {game_name}: 패치노트 파일을 찾을 수 없습니다.")
         return
     
-    if not os.path.exists(histogram_file):
+    if not dataset.has_histogram:
         print(f"❌ {game_name}: 히스토그램 파일을 찾을 수 없습니다.")
         return
     
-    # 데이터 로드
-    patch_df = pd.read_csv(patch_file)
-    review_df = pd.read_csv(histogram_file)
-    
-    patch_df['date'] = pd.to_datetime(patch_df['date'])
-    review_df['date'] = pd.to_datetime(review_df['date'])
-    review_df = review_df.sort_values('date')
-    
-    # 리뷰 데이터 계산
-    review_df['total_reviews'] = review_df['recommendations_up'] + review_df['recommendations_down']
-    review_df['positive_ratio'] = (review_df['recommendations_up'] / review_df['total_reviews'] * 100).fillna(0)
+    patch_df = dataset.patches
+    review_df = dataset.histogram
     
     print(f"\n{game_name} 시각화 생성 중...")
     print(f"  패치노트: {len(patch_df)}개")
     print(f"  리뷰 데이터: {len(review_df)}개월")
     
     # 1. 패치노트 길이 분포 및 시간에 따른 변화
-    fig = plt.figure(figsize=(16, 12))
-    gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
+    fig, (ax1, ax2, ax3, ax4, ax5) = new_figure('patches', (16, 12), _build_patch_axes, profile)
     
     fig.suptitle(f'{game_name} - 패치노트 글자 수와 유저 반응 분석', fontsize=16, fontweight='bold', y=0.98)
     
     # 1-1. 패치노트 길이 분포
-    ax1 = fig.add_subplot(gs[0, 0])
     ax1.hist(patch_df['contents_length'], bins=30, color='#5B9BD5', alpha=0.7, edgecolor='black')
     ax1.set_title('패치노트 길이 분포', fontsize=12, fontweight='bold')
     ax1.set_xlabel('글자 수', fontsize=10)
@@ -62,7 +72,6 @@ def visualize_patch_notes(game_id, game_name, output_dir='output', viz_dir='visu
     ax1.legend()
     
     # 1-2. 시간에 따른 패치노트 길이 변화
-    ax2 = fig.add_subplot(gs[0, 1])
     patch_sorted = patch_df.sort_values('date')
     ax2.scatter(patch_sorted['date'], patch_sorted['contents_length'], 
                 alpha=0.6, s=50, color='#5B9BD5', edgecolor='black', linewidth=0.5)
@@ -82,12 +91,11 @@ def visualize_patch_notes(game_id, game_name, output_dir='output', viz_dir='visu
     plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
     
     # 2. 패치노트와 리뷰 타임라인
-    ax3 = fig.add_subplot(gs[1, :])
-    
     # 리뷰 수를 배경으로
     ax3_bg = ax3.twinx()
-    ax3_bg.bar(review_df['date'], review_df['total_reviews'], 
-               color='#E8E8E8', alpha=0.5, width=20, label='월별 총 리뷰 수')
+    draw_bars(ax3_bg, review_df['date'], review_df['total_reviews'], profile.dpi,
+              color='#E8E8E8', alpha=0.5, width=20, label='월별 총 리뷰 수',
+              rasterized=profile.rasterize_layer(len(review_df)))
     ax3_bg.set_ylabel('총 리뷰 수', fontsize=10, color='gray')
     ax3_bg.tick_params(axis='y', labelcolor='gray')
     
@@ -121,19 +129,18 @@ def visualize_patch_notes(game_id, game_name, output_dir='output', viz_dir='visu
     plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45, ha='right')
     
     # 컬러바
-    cbar = plt.colorbar(scatter, ax=ax3, orientation='horizontal', pad=0.1, aspect=30)
+    cbar = fig.colorbar(scatter, ax=ax3, orientation='horizontal', pad=0.1, aspect=30)
     cbar.set_label('패치노트 글자 수', fontsize=9)
     
     # 3. 패치노트 길이별 평균 리뷰 반응
     # 패치노트를 길이 구간으로 분류
-    patch_df['length_category'] = pd.cut(patch_df['contents_length'], 
-                                         bins=[0, 500, 1000, 2000, 5000, float('inf')],
-                                         labels=['매우 짧음\n(~500자)', '짧음\n(500-1000자)', 
-                                                '보통\n(1000-2000자)', '김\n(2000-5000자)', 
-                                                '매우 김\n(5000자+)'])
-    
-    ax4 = fig.add_subplot(gs[2, 0])
-    category_counts = patch_df['length_category'].value_counts().sort_index()
+    length_category = pd.cut(patch_df['contents_length'], 
+                             bins=[0, 500, 1000, 2000, 5000, float('inf')],
+                             labels=['매우 짧음\n(~500자)', '짧음\n(500-1000자)', 
+                                    '보통\n(1000-2000자)', '김\n(2000-5000자)', 
+                                    '매우 김\n(5000자+)'])
+    
+    category_counts = length_category.value_counts().sort_index()
     colors_bar = ['#FFE5E5', '#FFB3B3', '#FF8080', '#FF4D4D', '#CC0000']
     ax4.bar(range(len(category_counts)), category_counts.values, 
             color=colors_bar[:len(category_counts)], alpha=0.8, edgecolor='black')
@@ -148,7 +155,6 @@ def visualize_patch_notes(game_id, game_name, output_dir='output', viz_dir='visu
         ax4.text(i, v, str(v), ha='center', va='bottom', fontweight='bold')
     
     # 4. 주요 통계
-    ax5 = fig.add_subplot(gs[2, 1])
     ax5.axis('off')
     
     stats_text = f"""
@@ -173,23 +179,19 @@ def visualize_patch_notes(game_id, game_name, output_dir='output', viz_dir='visu
              fontsize=11, verticalalignment='top',
              bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    output_file = os.path.join(viz_dir, f"{game_id}_{game_name_safe}_patch_analysis.png")
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    output_file = os.path.join(viz_dir, profile.file_name(f"{game_id}_{game_name_safe}_patch_analysis"))
+    save_figure(fig, output_file, profile)
     print(f"✓ {game_name}: {output_file}")
-    plt.close()
+    
+    return output_file
 
 
 def main():
     """메인 실행 함수"""
     
-    games = [
-        {'app_id': 1049590, 'name': 'Eternal Return'},
-        {'app_id': 1973530, 'name': 'Limbus Company'},
-        {'app_id': 730, 'name': 'Counter-Strike 2'},
-        {'app_id': 440, 'name': 'Team Fortress 2'},
-    ]
+    games = load_catalog()
     
     print("=" * 80)
     print("패치노트 분석 시각화 시작")
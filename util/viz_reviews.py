@@ -1,47 +1,57 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from pathlib import Path
 import os
 
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+from util.catalog import load_catalog
+from util.dataset import GameDataset
+from util.instrument import instrumented
+from util.lod import draw_bars, draw_line
+from util.render_profile import get_profile, new_figure, save_figure
 
-def visualize_game_data(game_id, game_name, output_dir='output', viz_dir='visualizations'):
+def _build_review_axes(fig):
+    # 3개 서브플롯: 리뷰 수, 비율, 거래량
+    gs = fig.add_gridspec(3, 1, height_ratios=[2.5, 1.5, 1], hspace=0.3)
+    ax1 = fig.add_subplot(gs[0])
+    ax2 = fig.add_subplot(gs[1], sharex=ax1)
+    ax3 = fig.add_subplot(gs[2], sharex=ax1)
+    return [ax1, ax2, ax3]
+
+
+@instrumented
+def visualize_game_data(game_id, game_name, output_dir='output', viz_dir='visualizations', dataset=None,
+                        profile=None):
     """
     게임의 히스토그램 데이터를 시각화
+    
+    Parameters:
+    - dataset: 미리 만든 GameDataset (None이면 output_dir에서 로드)
+    - profile: 렌더 프로필 ('draft', 'web', 'print' 또는 RenderProfile, None이면 'print')
     """
     os.makedirs(viz_dir, exist_ok=True)
+    profile = get_profile(profile)
     
     game_name_safe = game_name.replace('/', '_').replace('\\', '_').replace(':', '_')
-    histogram_file = os.path.join(output_dir, f"{game_id}_{game_name_safe}_daily_histogram.csv")
+    dataset = dataset or GameDataset(game_id, game_name, output_dir)
     
-    if not os.path.exists(histogram_file):
+    if not dataset.has_histogram:
         print(f"❌ {game_name}: 히스토그램 파일을 찾을 수 없습니다.")
         return
     
-    df = pd.read_csv(histogram_file)
-    df['date'] = pd.to_datetime(df['date'])
-    df = df.sort_values('date')
+    df = dataset.histogram
     
-    # 3개 서브플롯: 리뷰 수, 비율, 거래량
-    fig = plt.figure(figsize=(16, 11))
-    gs = fig.add_gridspec(3, 1, height_ratios=[2.5, 1.5, 1], hspace=0.3)
+    fig, (ax1, ax2, ax3) = new_figure('reviews', (16, 11), _build_review_axes, profile)
     
     fig.suptitle(f'{game_name} - Steam 리뷰 분석', fontsize=16, fontweight='bold', y=0.98)
     
-    df['total_reviews'] = df['recommendations_up'] + df['recommendations_down']
-    df['positive_ratio'] = (df['recommendations_up'] / df['total_reviews'] * 100).fillna(0)
-    df['negative_ratio'] = (df['recommendations_down'] / df['total_reviews'] * 100).fillna(0)
-    
     bar_width = 20
+    rasterized = profile.rasterize_layer(len(df))
     
+    # 막대가 axes 픽셀 폭보다 많으면(일 단위 장기 데이터 등) 구간별 최고점 envelope 하나로 그림
     # 1. 비율 차트 (상단)
-    ax1 = fig.add_subplot(gs[0])
-    ax1.bar(df['date'], df['positive_ratio'], width=bar_width, 
-            label='긍정 비율', color='#5B9BD5', alpha=0.85, edgecolor='none')
-    ax1.bar(df['date'], -df['negative_ratio'], width=bar_width, 
-            label='부정 비율', color='#ED7D31', alpha=0.85, edgecolor='none')
+    draw_bars(ax1, df['date'], df['positive_ratio'], profile.dpi, width=bar_width, 
+              label='긍정 비율', color='#5B9BD5', alpha=0.85, edgecolor='none', rasterized=rasterized)
+    draw_bars(ax1, df['date'], -df['negative_ratio'], profile.dpi, width=bar_width, 
+              label='부정 비율', color='#ED7D31', alpha=0.85, edgecolor='none', rasterized=rasterized)
     
     ax1.axhline(y=0, color='black', linewidth=1.5, zorder=3)
     ax1.set_title('월별 긍정 리뷰 비율 추이', fontsize=12, fontweight='bold', pad=15)
@@ -55,11 +65,10 @@ def visualize_game_data(game_id, game_name, output_dir='output', viz_dir='visual
     ax1.set_xticklabels([])
     
     # 2. 리뷰 수 차트 (중간)
-    ax2 = fig.add_subplot(gs[1], sharex=ax1)
-    ax2.bar(df['date'], df['recommendations_up'], width=bar_width, 
-            label='긍정 리뷰', color='#5B9BD5', alpha=0.85, edgecolor='none')
-    ax2.bar(df['date'], -df['recommendations_down'], width=bar_width, 
-            label='부정 리뷰', color='#ED7D31', alpha=0.85, edgecolor='none')
+    draw_bars(ax2, df['date'], df['recommendations_up'], profile.dpi, width=bar_width, 
+              label='긍정 리뷰', color='#5B9BD5', alpha=0.85, edgecolor='none', rasterized=rasterized)
+    draw_bars(ax2, df['date'], -df['recommendations_down'], profile.dpi, width=bar_width, 
+              label='부정 리뷰', color='#ED7D31', alpha=0.85, edgecolor='none', rasterized=rasterized)
     
     ax2.axhline(y=0, color='black', linewidth=1.5, zorder=3)
     ax2.set_title('월별 긍정/부정 리뷰 수 추이 (새로운 스타일)', fontsize=12, fontweight='bold', pad=15)
@@ -75,8 +84,8 @@ def visualize_game_data(game_id, game_name, output_dir='output', viz_dir='visual
     ax2.set_xticklabels([])
     
     # 3. 거래량 스타일 차트: 총 리뷰 수
-    ax3 = fig.add_subplot(gs[2], sharex=ax1)
-    ax3.bar(df['date'], df['total_reviews'], color='#9b59b6', alpha=0.6, width=20, edgecolor='none')
+    draw_bars(ax3, df['date'], df['total_reviews'], profile.dpi, color='#9b59b6', alpha=0.6, width=20,
+              edgecolor='none', rasterized=rasterized)
     ax3.set_title('월별 총 리뷰 수', fontsize=10, fontweight='bold', pad=10)
     ax3.set_ylabel('총 리뷰 수', fontsize=9)
     ax3.set_xlabel('날짜', fontsize=10)
@@ -97,12 +106,11 @@ def visualize_game_data(game_id, game_name, output_dir='output', viz_dir='visual
     plt.setp(ax3.xaxis.get_majorticklabels(), rotation=60, ha='right', fontsize=9)
     ax3.tick_params(axis='y', labelsize=8)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    output_file = os.path.join(viz_dir, f"{game_id}_{game_name_safe}_analysis.png")
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    output_file = os.path.join(viz_dir, profile.file_name(f"{game_id}_{game_name_safe}_analysis"))
+    save_figure(fig, output_file, profile)
     print(f"✓ {game_name}: {output_file}")
-    plt.close()
     
     # 통계 요약
     print(f"\n  📊 {game_name} 통계 요약:")
@@ -113,35 +121,34 @@ def visualize_game_data(game_id, game_name, output_dir='output', viz_dir='visual
     print(f"     - 최고 리뷰 수 월: {df.loc[df['total_reviews'].idxmax(), 'date'].strftime('%Y-%m')} ({df['total_reviews'].max():,}개)")
     print(f"     - 최저 긍정 비율 월: {df.loc[df['positive_ratio'].idxmin(), 'date'].strftime('%Y-%m')} ({df['positive_ratio'].min():.1f}%)")
     print()
+    
+    return output_file
 
 
-def create_comparison_chart(output_dir='output', viz_dir='visualizations'):
+@instrumented
+def create_comparison_chart(games=None, output_dir='output', viz_dir='visualizations', datasets=None, profile=None):
     """
-    모든 게임의 긍정 비율을 비교하는 차트 생성
+    게임들의 긍정 비율을 비교하는 차트 생성
+    
+    Parameters:
+    - games: [{'app_id': ..., 'name': ...}] 형식의 게임 목록 (None이면 게임 카탈로그 전체)
+    - datasets: 비교할 GameDataset 리스트 (None이면 games를 output_dir에서 로드)
+    - profile: 렌더 프로필 ('draft', 'web', 'print' 또는 RenderProfile, None이면 'print')
     """
-    games = [
-        (1049590, "Eternal Return"),
-        (1973530, "Limbus Company"),
-        (730, "Counter-Strike 2"),
-        (440, "Team Fortress 2"),
-    ]
+    profile = get_profile(profile)
+    if datasets is None:
+        datasets = GameDataset.from_games(load_catalog() if games is None else games, output_dir)
     
-    fig, ax = plt.subplots(figsize=(14, 8))
+    fig, (ax,) = new_figure('comparison', (14, 8), lambda fig: [fig.add_subplot()], profile)
     
+    # 앞의 게임은 고정 색상, 나머지는 matplotlib 기본 색상 순환
     colors = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12']
     
-    for (game_id, game_name), color in zip(games, colors):
-        game_name_safe = game_name.replace('/', '_').replace('\\', '_').replace(':', '_')
-        histogram_file = os.path.join(output_dir, f"{game_id}_{game_name_safe}_daily_histogram.csv")
-        
-        if os.path.exists(histogram_file):
-            df = pd.read_csv(histogram_file)
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.sort_values('date')
-            df['total_reviews'] = df['recommendations_up'] + df['recommendations_down']
-            df['positive_ratio'] = (df['recommendations_up'] / df['total_reviews'] * 100).fillna(0)
-            
-            ax.plot(df['date'], df['positive_ratio'], label=game_name, linewidth=2, color=color)
+    for i, dataset in enumerate(datasets):
+        if dataset.has_histogram:
+            df = dataset.histogram
+            draw_line(ax, df['date'], df['positive_ratio'], profile.dpi,
+                      label=dataset.game_name, linewidth=2, color=colors[i] if i < len(colors) else None)
     
     ax.axhline(y=50, color='gray', linestyle='--', alpha=0.5, label='50% 기준선')
     ax.set_title('게임별 긍정 리뷰 비율 비교', fontsize=14, fontweight='bold', pad=15)
@@ -154,33 +161,29 @@ def create_comparison_chart(output_dir='output', viz_dir='visualizations'):
     ax.xaxis.set_major_locator(mdates.YearLocator())
     plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    output_file = os.path.join(viz_dir, "all_games_comparison.png")
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    output_file = os.path.join(viz_dir, profile.file_name('all_games_comparison'))
+    save_figure(fig, output_file, profile)
     print(f"✓ 게임 비교 차트: {output_file}")
-    plt.close()
+    
+    return output_file
 
 
 def main():
-    games = [
-        (1049590, "Eternal Return"),
-        (1973530, "Limbus Company"),
-        (730, "Counter-Strike 2"),
-        (440, "Team Fortress 2"),
-    ]
+    games = load_catalog()
     
     print("\n" + "="*80)
     print("Steam 게임 데이터 시각화 시작")
     print("="*80 + "\n")
     
-    for game_id, game_name in games:
-        visualize_game_data(game_id, game_name)
+    for game in games:
+        visualize_game_data(game['app_id'], game['name'])
     
     print("="*80)
     print("게임 비교 차트 생성")
     print("="*80 + "\n")
-    create_comparison_chart()
+    create_comparison_chart(games)
     
     print("\n" + "="*80)
     print("모든 시각화 완료!")